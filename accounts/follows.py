@@ -0,0 +1,39 @@
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+
+from .models import CustomUser, Follow
+
+
+def follow(follower: CustomUser, following: CustomUser) -> bool:
+    """
+    Make `follower` follow `following`. Returns `False` if already following.
+    Counters on both users are updated in the same transaction,
+    see `accounts.signals.follow_created`.
+    """
+    try:
+        with transaction.atomic():
+            Follow.objects.create(follower=follower, following=following)
+    except IntegrityError:
+        return False
+    return True
+
+
+def unfollow(follower: CustomUser, following: CustomUser) -> bool:
+    """Returns `False` if `follower` wasn't following."""
+    with transaction.atomic():
+        deleted, _ = Follow.objects.filter(follower=follower, following=following).delete()
+    return bool(deleted)
+
+
+def is_following(viewer: CustomUser, user: CustomUser) -> bool:
+    return Follow.objects.filter(follower=viewer, following=user).exists()
+
+
+def following_among(viewer: CustomUser, user_ids: Iterable[int]) -> set[int]:
+    """Return ids of those given users, who are followed by `viewer`, in one query."""
+    return set(
+        Follow.objects
+        .filter(follower=viewer, following_id__in=list(user_ids))
+        .values_list('following_id', flat=True)
+    )
@@ -0,0 +1,57 @@
+# Generated by Django 4.2 on 2026-10-17 12:03
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_follows(apps, schema_editor):
+    Follow = apps.get_model('accounts', 'Follow')
+    keep = (
+        Follow.objects.values('follower', 'following')
+        .annotate(keep_id=Min('id'))
+        .values_list('keep_id', flat=True)
+    )
+    Follow.objects.exclude(id__in=list(keep)).delete()
+
+
+def count_follows(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    Follow = apps.get_model('accounts', 'Follow')
+
+    def count(field):
+        return Coalesce(Subquery(
+            Follow.objects.filter(**{field: OuterRef('pk')})
+            .values(field).annotate(total=Count('id')).values('total')
+        ), 0)
+
+    CustomUser.objects.update(
+        followers_count=count('following'),
+        following_count=count('follower'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_follow'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_follows, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='customuser',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_follows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.UniqueConstraint(fields=('follower', 'following'), name='unique_follow'),
+        ),
+    ]
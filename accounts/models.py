@@ -31,6 +31,9 @@ class CustomUser(AbstractUser):
     )
     is_admin = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
+    # Denormalized `Follow` counts, kept in sync by `accounts.signals`.
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
     
     objects = CustomUserManager()
 
@@ -84,5 +87,10 @@ class Follow(models.Model):
 
     objects = models.Manager()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['follower', 'following'], name='unique_follow'),
+        ]
+
     def __str__(self):
         return f'{self.follower} is following {self.following}'
\ No newline at end of file
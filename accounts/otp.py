@@ -4,32 +4,28 @@ from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
-from smtplib import SMTPException
 from .models import CustomUser
 
 import secrets
-import logging
 
 
-def send_account_otp(email: str, user: CustomUser, subject: str) -> int | None:
+def generate_otp() -> str:
+    """Generate 4-digit one-time code."""
+    return str(secrets.choice(range(1000, 10000)))
+
+
+def send_account_otp(email: str, user: CustomUser, subject: str, otp: str) -> None:
     """basic method, used to send an email with 4-digit one-time code."""
 
-    # Generate code, message, configure the sender and recipient.
-    otp = secrets.choice(range(1000, 10000))
+    # Make message, configure the sender and recipient.
     message = f"Hi {user.username},\n\nYour account one-time-password is {otp}.\
                 \n This one-time code will expire in the next 10 minutes.\
                 \n Kindly supply it to move forward in the pipeline.\n\n\nCheers"
     email_from = settings.EMAIL_HOST_USER
     recipient_list = [email]
 
-    # Create thread-safe conditions, check for exceptions.
-    try:
-        send_mail(subject, message, email_from, recipient_list)
-    except SMTPException as e:
-        logging.info("There was some error in sending a message. %s", e)
-        return
-
-    return otp
+    # SMTP errors are raised, so the job queue retries sending.
+    send_mail(subject, message, email_from, recipient_list)
 
 
 def send_verification_token(email: str, user: CustomUser, subject: str) -> None:
@@ -49,10 +45,5 @@ def send_verification_token(email: str, user: CustomUser, subject: str) -> None:
             )
     recipient_list = [email]
 
-    # Create thread-safe conditions, check for exceptions.
-    try:
-        send_mail(subject, message, settings.EMAIL_HOST_USER, recipient_list)
-    except SMTPException as e:
-        logging.info(e)
-
-    return None
\ No newline at end of file
+    # SMTP errors are raised, so the job queue retries sending.
+    send_mail(subject, message, settings.EMAIL_HOST_USER, recipient_list)
\ No newline at end of file
@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import CustomUser, Profile, ForgotPassword
-from .thread import SendForgotPasswordEmail, SendVerificationToken
+from jobs.queue import enqueue
+from .models import CustomUser, Profile, ForgotPassword, Follow
+from .otp import generate_otp
 
 
 @receiver(post_save, sender=CustomUser)
@@ -23,32 +25,39 @@ def create_profile(sender, instance: CustomUser, created: bool, **kwargs) -> Non
 
 @receiver(post_save, sender=CustomUser)
 def send_confirmation_email(sender, instance: CustomUser, created: bool, **kwargs) -> None:
-    """Send confirmation link to an email adress, provided by user."""
-    try:
-        if created:
-            # Create and join new thread.
-            new_thread = SendVerificationToken(instance.email, instance)
-            new_thread.start()
-            new_thread.join()
+    """Queue confirmation link to an email adress, provided by user."""
+    if created:
+        enqueue('accounts.send_verification_token', user_pk=instance.pk)
+
 
-    except SystemError as e:
-        print(e)
+@receiver(pre_save, sender=ForgotPassword)
+def generate_email_otp(sender, instance: ForgotPassword, **kwargs) -> None:
+    """Generate a 4-digit code before the record is written, so it's 
+    stored together with the record and known before sending.
+    """
+    if instance._state.adding and not instance.forget_password_otp:
+        instance.forget_password_otp = generate_otp()
 
 
 @receiver(post_save, sender=ForgotPassword)
-def send_email_otp(sender, instance: ForgotPassword, created: bool, **kwagrs) -> ForgotPassword:
-    """Send a 4-digit code to reset previous password."""
-    try:
-        if created:
-            # Create new thread, start and join it.
-            new_thread = SendForgotPasswordEmail(email=instance.user.email, user=instance.user)
-            new_thread.start()
-            new_thread.join()
-
-            # Update user otp, write it to database.
-            instance.forget_password_otp = new_thread.get_otp()
-            instance.save()
-            return instance
-        
-    except SystemError as e:
-        print(e)
\ No newline at end of file
+def send_email_otp(sender, instance: ForgotPassword, created: bool, **kwagrs) -> None:
+    """Queue a 4-digit code to reset previous password."""
+    if created:
+        enqueue('accounts.send_forgot_password_otp', forgot_password_pk=instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance: Follow, created: bool, **kwargs) -> None:
+    """Increment denormalized follow counters of both users."""
+    if created:
+        CustomUser.objects.filter(pk=instance.follower_id).update(following_count=F('following_count') + 1)
+        CustomUser.objects.filter(pk=instance.following_id).update(followers_count=F('followers_count') + 1)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance: Follow, **kwargs) -> None:
+    """Decrement counters. Also sent for follows removed by cascade, 
+    when one of the users is deleted.
+    """
+    CustomUser.objects.filter(pk=instance.follower_id, following_count__gt=0).update(following_count=F('following_count') - 1)
+    CustomUser.objects.filter(pk=instance.following_id, followers_count__gt=0).update(followers_count=F('followers_count') - 1)
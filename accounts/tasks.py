@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+
+from jobs.queue import task
+from .models import ForgotPassword
+from .otp import send_account_otp, send_verification_token
+
+
+User = get_user_model()
+
+
+@task('accounts.send_verification_token')
+def send_verification_email(user_pk: int) -> None:
+    """Send account activation link to a registered user."""
+    user = User.objects.filter(pk=user_pk).first()
+    if user is None:
+        return
+
+    subject = "@noreply: Verify your Pinterest account."
+    send_verification_token(user.email, user, subject)
+
+
+@task('accounts.send_forgot_password_otp')
+def send_forgot_password_otp(forgot_password_pk: int) -> None:
+    """Send already generated one-time code to reset the password."""
+    code = ForgotPassword.objects.select_related('user').filter(pk=forgot_password_pk).first()
+    if code is None:
+        return
+
+    subject = "@noreply: Your one-time code to reset your password."
+    send_account_otp(code.user.email, code.user, subject, code.forget_password_otp)
@@ -24,8 +24,8 @@ from .forms import (CustomUserCreationForm,
                     UserLoginForm, 
                     CustomPasswordResetForm,
                     EditProfileForm)
+from .follows import follow, unfollow, is_following
 from .models import Profile, ForgotPassword
-from .models import Follow as FollowModel   # to not be confused with Follow view
 from boards.forms import CreateBoardForm
 
 
@@ -124,7 +124,7 @@ class ProfileView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         user = self.get_object().user
 
-        context['is_following'] = self.request.user.followers.filter(following=user).first()
+        context['is_following'] = is_following(self.request.user, user)
         context['create_board_form'] = CreateBoardForm()
         context['boards'] = user.board.all()
 
@@ -176,14 +176,9 @@ class Follow(LoginRequiredMixin, View):
             return redirect(request.META.get('HTTP_REFERER'))
         
         # Check if user already follows.
-        check_follow = FollowModel.objects.filter(following=user, follower=request.user)
-        
-        if check_follow.exists():
+        if not follow(request.user, user):
             messages.error(request, 'You already follow %s' % user.username)
-            return redirect(request.META.get('HTTP_REFERER'))
-        
-        follow = FollowModel.objects.create(following=user, follower=request.user)
-        follow.save()
+
         return redirect(request.META.get('HTTP_REFERER'))
     
 class Unfollow(LoginRequiredMixin, View):
@@ -196,7 +191,7 @@ class Unfollow(LoginRequiredMixin, View):
         except (ObjectDoesNotExist, MultipleObjectsReturned):
             raise Http404
         
-        FollowModel.objects.filter(following=user, follower=request.user).delete()
+        unfollow(request.user, user)
         return redirect(request.META.get('HTTP_REFERER'))
 
 
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApiauthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apiauth'
+
+    def ready(self) -> None:
+        from . import signals
+        return super().ready()
@@ -1,12 +1,77 @@
-from rest_framework.authentication import TokenAuthentication
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
 from rest_framework.authtoken.models import Token
 from rest_framework.exceptions import AuthenticationFailed
 
 from datetime import timedelta, time
+from typing import Iterable
+from django.core.cache import caches
 from django.utils import timezone
 from django.conf import settings
 
 
+# Tokens are cached in two tiers: per-process memory for a few seconds,
+# then the shared cache, which is invalidated by `apiauth.signals`.
+TOKEN_CACHE_TTL = getattr(settings, 'TOKEN_CACHE_TTL', 60)
+TOKEN_LOCAL_CACHE_TTL = getattr(settings, 'TOKEN_LOCAL_CACHE_TTL', 5)
+
+
+def token_cache_key(key: str) -> str:
+    return f"auth_token:{key}"
+
+
+def get_token(key: str) -> Token | None:
+    """
+    Return token with its user loaded, looking through the local
+    and the shared cache before querying the database.
+    """
+    cache_key = token_cache_key(key)
+    local_cache, shared_cache = caches['local'], caches['default']
+
+    token = local_cache.get(cache_key)
+    if token is None:
+        token = shared_cache.get(cache_key)
+
+        if token is None:
+            token = Token.objects.select_related('user').filter(key=key).first()
+            if token is None:
+                return None
+            shared_cache.set(cache_key, token, TOKEN_CACHE_TTL)
+
+        local_cache.set(cache_key, token, TOKEN_LOCAL_CACHE_TTL)
+
+    return token
+
+
+async def aget_token(key: str) -> Token | None:
+    """Async version of `get_token`."""
+    cache_key = token_cache_key(key)
+    local_cache, shared_cache = caches['local'], caches['default']
+
+    token = await local_cache.aget(cache_key)
+    if token is None:
+        token = await shared_cache.aget(cache_key)
+
+        if token is None:
+            token = await Token.objects.select_related('user').filter(key=key).afirst()
+            if token is None:
+                return None
+            await shared_cache.aset(cache_key, token, TOKEN_CACHE_TTL)
+
+        await local_cache.aset(cache_key, token, TOKEN_LOCAL_CACHE_TTL)
+
+    return token
+
+
+def invalidate_tokens(keys: Iterable[str]) -> None:
+    """Drop cached tokens, so the next request reads them from the database."""
+    cache_keys = [token_cache_key(key) for key in keys]
+    if cache_keys:
+        caches['local'].delete_many(cache_keys)
+        caches['default'].delete_many(cache_keys)
+
+
 def expires_in(token: Token) -> time:
     """
     Return time before token expires.
@@ -40,12 +105,14 @@ def token_expire_handler(token: Token) -> tuple[bool, Token]:
 class ExpiringTokenAuthentication(TokenAuthentication):
     """
     If token is expired then it will be removed
-    and new one with different key will be created
+    and new one with different key will be created.
+
+    Token and its user are taken from cache, expiry is checked
+    against the cached `created` timestamp.
     """
     def authenticate_credentials(self, key):
-        try:
-            token = Token.objects.get(key = key)
-        except Token.DoesNotExist:
+        token = get_token(key)
+        if token is None:
             raise AuthenticationFailed("Invalid Token")
         
         if not token.user.is_active:
@@ -55,4 +122,35 @@ class ExpiringTokenAuthentication(TokenAuthentication):
         if is_expired:
             raise AuthenticationFailed("The Token is expired")
         
-        return (token.user, token)
\ No newline at end of file
+        return (token.user, token)
+
+
+async def aauthenticate(request: HttpRequest):
+    """
+    User of the `Authorization: Token <key>` header for async views, which
+    DRF can't serve, checked like `ExpiringTokenAuthentication` does.
+    Returns `None` without the header, raises `AuthenticationFailed`.
+    """
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != b'token':
+        return None
+    if len(auth) != 2:
+        raise AuthenticationFailed("Invalid token header.")
+
+    try:
+        key = auth[1].decode()
+    except UnicodeError:
+        raise AuthenticationFailed("Invalid token header.")
+
+    token = await aget_token(key)
+    if token is None:
+        raise AuthenticationFailed("Invalid Token")
+
+    if not token.user.is_active:
+        raise AuthenticationFailed("User is not active")
+
+    is_expired, token = await sync_to_async(token_expire_handler)(token)
+    if is_expired:
+        raise AuthenticationFailed("The Token is expired")
+
+    return token.user
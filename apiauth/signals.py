@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_tokens
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def token_changed(sender, instance: Token, **kwargs) -> None:
+    """Token was rotated or removed."""
+    invalidate_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance: User, update_fields: frozenset | None = None, **kwargs) -> None:
+    """Cached tokens hold a copy of the user, which could be deactivated 
+    or have its password changed.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+
+    invalidate_tokens(Token.objects.filter(user=instance).values_list('key', flat=True))
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from . import models
+
+
+@admin.register(models.MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'ref_count', 'updated_at']
+    search_fields = ['digest']
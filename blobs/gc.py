@@ -0,0 +1,70 @@
+import os
+from datetime import timedelta
+from typing import Iterator
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import MediaBlob
+from .storage import BLOB_PREFIX, blob_storage
+
+
+# Seconds an unreferenced blob is kept: uploads store the file before
+# the row referencing it is committed.
+BLOB_GC_GRACE = getattr(settings, 'BLOB_GC_GRACE', 24 * 60 * 60)
+
+
+def is_stale(name: str, grace: int) -> bool:
+    """File wasn't written or reused by an upload within the grace period."""
+    try:
+        mtime = os.path.getmtime(blob_storage.path(name))
+    except FileNotFoundError:
+        return True
+    return mtime < timezone.now().timestamp() - grace
+
+
+def iter_stored_blobs() -> Iterator[str]:
+    """Names of blob files on disk, without renditions and temporary files."""
+    root = blob_storage.path(BLOB_PREFIX)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.endswith('_renditions') and d != 'tmp']
+        for filename in filenames:
+            yield os.path.relpath(os.path.join(dirpath, filename), blob_storage.location).replace(os.sep, '/')
+
+
+def collect_unreferenced(grace: int = BLOB_GC_GRACE, dry_run: bool = False) -> list[str]:
+    """
+    Delete blobs nobody referenced for `grace` seconds, files of uploads
+    which never got a row, and abandoned temporary files. Returns the
+    names removed (or which would be, with `dry_run`).
+    """
+    removed = []
+    cutoff = timezone.now() - timedelta(seconds=grace)
+
+    for blob in MediaBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff).only('pk', 'name'):
+        if dry_run:
+            removed.append(blob.name)
+            continue
+        # Conditional delete: the blob may have been referenced again meanwhile.
+        deleted, _ = MediaBlob.objects.filter(pk=blob.pk, ref_count__lte=0).delete()
+        if deleted and is_stale(blob.name, grace):
+            blob_storage.delete_blob(blob.name)
+            removed.append(blob.name)
+
+    names = list(iter_stored_blobs())
+    registered = set()
+    for i in range(0, len(names), 1000):
+        registered.update(MediaBlob.objects.filter(name__in=names[i:i + 1000]).values_list('name', flat=True))
+    for name in names:
+        if name not in registered and name not in removed and is_stale(name, grace):
+            if not dry_run:
+                blob_storage.delete_blob(name)
+            removed.append(name)
+
+    tmp_dir = blob_storage.path(f"{BLOB_PREFIX}/tmp")
+    if os.path.isdir(tmp_dir) and not dry_run:
+        for entry in os.scandir(tmp_dir):
+            if entry.stat().st_mtime < cutoff.timestamp():
+                os.remove(entry.path)
+
+    return removed
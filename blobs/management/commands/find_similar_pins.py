@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from blobs import phash
+from blobs.models import MediaBlob
+from pins.models import Pin
+
+
+class Command(BaseCommand):
+    help = (
+        "List pins whose image is a near-duplicate of the given pin's, "
+        "by perceptual hash. Missing hashes are computed first."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('pin', type=int, help="Pin id.")
+        parser.add_argument('--distance', type=int, default=phash.BLOB_PHASH_DISTANCE,
+                            help="Maximum number of differing hash bits.")
+        parser.add_argument('--index', action='store_true',
+                            help="Hash every image blob that has no hash yet.")
+
+    def handle(self, *args, **options) -> None:
+        if options['index']:
+            for blob in MediaBlob.objects.filter(phash__isnull=True).iterator():
+                phash.update_phash(blob)
+
+        pin = Pin.objects.filter(pk=options['pin']).first()
+        if pin is None:
+            raise CommandError(f"Pin {options['pin']} doesn't exist.")
+        blob = MediaBlob.objects.filter(name=pin.file.name).first()
+        if blob is None:
+            raise CommandError("Pin's file isn't stored as a blob.")
+        if blob.phash is None:
+            phash.update_phash(blob)
+
+        similar = phash.find_similar(blob, options['distance'])
+        names = [blob.name, *(other.name for other in similar)]
+        for other in Pin.objects.filter(file__in=names).exclude(pk=pin.pk).only('pk', 'title', 'file'):
+            self.stdout.write(f"{other.pk}\t{other.title}\t{other.file.name}")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from blobs.gc import BLOB_GC_GRACE, collect_unreferenced
+from blobs.references import recount_references
+
+
+class Command(BaseCommand):
+    help = "Delete stored blobs no pin or board cover references any more."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--grace', type=int, default=BLOB_GC_GRACE,
+                            help="Seconds an unreferenced blob is kept.")
+        parser.add_argument('--recount', action='store_true',
+                            help="Recompute reference counts from pins and boards first.")
+        parser.add_argument('--dry-run', action='store_true', help="Only list blobs to delete.")
+
+    def handle(self, *args, **options) -> None:
+        if options['recount']:
+            changed = recount_references()
+            self.stdout.write(f"Fixed reference counts of {changed} blobs.")
+
+        removed = collect_unreferenced(options['grace'], options['dry_run'])
+        for name in removed:
+            self.stdout.write(name)
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(removed)} blobs."))
@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-17 12:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('digest', models.CharField(max_length=64)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('phash', models.BigIntegerField(blank=True, null=True)),
+                ('phash_band_0', models.IntegerField(blank=True, db_index=True, null=True)),
+                ('phash_band_1', models.IntegerField(blank=True, db_index=True, null=True)),
+                ('phash_band_2', models.IntegerField(blank=True, db_index=True, null=True)),
+                ('phash_band_3', models.IntegerField(blank=True, db_index=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='mediablob',
+            index=models.Index(fields=['ref_count', 'updated_at'], name='blob_gc_idx'),
+        ),
+    ]
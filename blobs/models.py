@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    File stored once under the digest of its content, see `blobs.storage`.
+    `ref_count` is the number of pins and board covers using it, kept by
+    signals; unreferenced blobs are removed by `gc_blobs`.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Optional 64-bit difference hash of images, split into 16-bit bands
+    # which are looked up exactly to find near-duplicates, see `blobs.phash`.
+    phash = models.BigIntegerField(null=True, blank=True)
+    phash_band_0 = models.IntegerField(null=True, blank=True, db_index=True)
+    phash_band_1 = models.IntegerField(null=True, blank=True, db_index=True)
+    phash_band_2 = models.IntegerField(null=True, blank=True, db_index=True)
+    phash_band_3 = models.IntegerField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Used by `gc_blobs` to find unreferenced blobs.
+            models.Index(fields=['ref_count', 'updated_at'], name='blob_gc_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.ref_count} refs)'
@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.db.models import Q
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import MediaBlob
+from .storage import blob_storage
+
+
+# Compute perceptual hashes of new image blobs for near-duplicate lookups.
+BLOB_PHASH = getattr(settings, 'BLOB_PHASH', False)
+# Hashes at most this many bits apart are considered near-duplicates.
+BLOB_PHASH_DISTANCE = getattr(settings, 'BLOB_PHASH_DISTANCE', 3)
+
+HASH_SIZE = 8
+BANDS = 4
+BAND_BITS = 64 // BANDS
+
+
+def to_signed(value: int) -> int:
+    """Unsigned 64-bit hash as PostgreSQL's signed `bigint`."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value: int) -> int:
+    return value & ((1 << 64) - 1)
+
+
+def compute_dhash(image: Image.Image) -> int:
+    """
+    Difference hash: each bit says whether a pixel of a 9x8 grayscale
+    thumbnail is brighter than its right neighbour. Survives resizing
+    and recompression, unlike the content digest.
+    """
+    small = ImageOps.exif_transpose(image).convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            value = value << 1 | (left > pixels[row * (HASH_SIZE + 1) + col + 1])
+    return value
+
+
+def get_bands(value: int) -> list[int]:
+    return [(value >> (BAND_BITS * i)) & ((1 << BAND_BITS) - 1) for i in range(BANDS)]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(to_unsigned(a) ^ to_unsigned(b)).count('1')
+
+
+def update_phash(blob: MediaBlob) -> None:
+    """Hash the blob if it's an image, other files are left without one."""
+    try:
+        with blob_storage.open(blob.name, 'rb') as file, Image.open(file) as image:
+            value = compute_dhash(image)
+    except (OSError, UnidentifiedImageError):
+        return
+
+    blob.phash = to_signed(value)
+    for i, band in enumerate(get_bands(value)):
+        setattr(blob, f'phash_band_{i}', band)
+    blob.save(update_fields=['phash', *(f'phash_band_{i}' for i in range(BANDS))])
+
+
+def find_similar(blob: MediaBlob, max_distance: int = BLOB_PHASH_DISTANCE) -> list[MediaBlob]:
+    """
+    Other blobs whose hash is at most `max_distance` bits away. Hashes that
+    close share at least one band exactly (for distances below `BANDS`), so
+    only blobs matching a band by index are compared.
+    """
+    if blob.phash is None:
+        return []
+
+    value = to_unsigned(blob.phash)
+    match = Q()
+    for i, band in enumerate(get_bands(value)):
+        match |= Q(**{f'phash_band_{i}': band})
+
+    candidates = MediaBlob.objects.filter(match).exclude(pk=blob.pk).only('pk', 'name', 'phash')
+    return [other for other in candidates if hamming_distance(value, other.phash) <= max_distance]
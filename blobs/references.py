@@ -0,0 +1,74 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from boards.models import Board
+from jobs.queue import enqueue
+from pins.models import Pin
+from . import phash
+from .models import MediaBlob
+from .storage import blob_storage, get_digest, is_blob
+
+
+# File fields stored in blobs, as (model, field name).
+BLOB_FIELDS = [(Pin, 'file'), (Board, 'cover')]
+
+
+def change_references(name: str, delta: int) -> None:
+    """
+    Add `delta` to the reference count of a blob, registering blobs which
+    weren't referenced before. Names of files outside blobs are ignored.
+    """
+    if not is_blob(name):
+        return
+
+    updated = MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + delta,
+                                                          updated_at=timezone.now())
+    if updated or delta < 0:
+        return
+
+    try:
+        with transaction.atomic():
+            blob = MediaBlob.objects.create(name=name, digest=get_digest(name),
+                                            size=blob_storage.size(name), ref_count=delta)
+    except IntegrityError:
+        # Registered by a concurrent upload of the same content.
+        change_references(name, delta)
+        return
+
+    if phash.BLOB_PHASH:
+        enqueue('blobs.update_phash', blob_pk=blob.pk)
+
+
+def count_references() -> Counter:
+    """Number of rows referencing each blob, read from the referencing tables."""
+    counts = Counter()
+    for model, field in BLOB_FIELDS:
+        rows = (model.objects.filter(**{f'{field}__startswith': 'blobs/'})
+                .values(field).annotate(refs=Count('pk')).values_list(field, 'refs'))
+        counts.update(dict(rows))
+    return counts
+
+
+def recount_references() -> int:
+    """
+    Fix reference counts drifted by writes which skip signals (`update()`,
+    raw SQL). Returns the number of blobs whose count changed.
+    """
+    counts = count_references()
+    changed = 0
+
+    for blob in MediaBlob.objects.only('pk', 'name', 'ref_count').iterator():
+        refs = counts.pop(blob.name, 0)
+        if blob.ref_count != refs:
+            MediaBlob.objects.filter(pk=blob.pk).update(ref_count=refs, updated_at=timezone.now())
+            changed += 1
+
+    # Referenced files nobody registered.
+    for name, refs in counts.items():
+        if blob_storage.exists(name):
+            change_references(name, refs)
+            changed += 1
+    return changed
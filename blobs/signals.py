@@ -0,0 +1,60 @@
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from boards.models import Board
+from pins.ingest import pins_created
+from pins.models import Pin
+
+from .references import BLOB_FIELDS, change_references
+
+
+def get_names(instance, fields: list[str]) -> dict[str, str]:
+    return {field: getattr(instance, field).name or '' for field in fields}
+
+
+@receiver(pre_save, sender=Pin)
+@receiver(pre_save, sender=Board)
+def stash_stored_names(sender, instance, update_fields=None, **kwargs) -> None:
+    """Remember files the row points to before the save replaces them."""
+    fields = [field for model, field in BLOB_FIELDS if model is sender
+              and (update_fields is None or field in update_fields)]
+    instance._stored_blob_names = {}
+    if fields and instance.pk is not None and not instance._state.adding:
+        instance._stored_blob_names = (
+            sender._default_manager.filter(pk=instance.pk).values(*fields).first() or {}
+        )
+
+
+@receiver(post_save, sender=Pin)
+@receiver(post_save, sender=Board)
+def count_saved_references(sender, instance, created, raw=False, update_fields=None, **kwargs) -> None:
+    if raw:
+        return
+    stored = getattr(instance, '_stored_blob_names', {})
+    fields = [field for model, field in BLOB_FIELDS if model is sender
+              and (created or update_fields is None or field in update_fields)]
+
+    for field, name in get_names(instance, fields).items():
+        old_name = None if created else stored.get(field)
+        if name == old_name:
+            continue
+        change_references(name, 1)
+        if old_name:
+            change_references(old_name, -1)
+
+
+@receiver(post_delete, sender=Pin)
+@receiver(post_delete, sender=Board)
+def count_deleted_references(sender, instance, **kwargs) -> None:
+    fields = [field for model, field in BLOB_FIELDS if model is sender]
+    for name in get_names(instance, fields).values():
+        change_references(name, -1)
+
+
+@receiver(pins_created, sender=Pin)
+def count_created_references(sender, pins: list[Pin], **kwargs) -> None:
+    """Pins of a batch sharing a file add their references at once."""
+    for name, count in Counter(pin.file.name for pin in pins).items():
+        change_references(name, count)
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+
+# Blobs live under `blobs/<d[:2]>/<d[2:4]>/<digest><ext>` of the media root.
+BLOB_PREFIX = 'blobs'
+BLOB_CHUNK_SIZE = 64 * 1024
+
+
+def get_blob_name(digest: str, ext: str) -> str:
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def is_blob(name: str | None) -> bool:
+    """Files uploaded before blobs were introduced keep their old names."""
+    return bool(name) and name.startswith(f"{BLOB_PREFIX}/")
+
+
+def get_digest(name: str) -> str:
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+class BlobStorage(FileSystemStorage):
+    """
+    Content-addressed storage: a file is named by the SHA-256 of its content,
+    so the same upload is stored once however many pins use it. Content is
+    hashed while it's copied to a temporary file chunk by chunk, never read
+    into memory whole. Upload name is only used for its extension.
+
+    Deleting a blob through the storage does nothing, other pins may use it.
+    References are counted by `blobs.signals`, unused blobs are removed by
+    the `gc_blobs` command.
+    """
+
+    def get_available_name(self, name: str, max_length: int | None = None) -> str:
+        # Final name is chosen from the content in `_save`.
+        return name
+
+    def _save(self, name: str, content) -> str:
+        ext = os.path.splitext(name)[1].lower()
+        # Temporary file is on the same filesystem, so it's moved, not copied.
+        tmp_dir = self.path(f"{BLOB_PREFIX}/tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks(BLOB_CHUNK_SIZE):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+
+            name = get_blob_name(digest.hexdigest(), ext)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+                # Fresh mtime keeps `gc_blobs` from collecting a blob being reused.
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return name
+
+    def delete(self, name: str) -> None:
+        if not is_blob(name):
+            super().delete(name)
+
+    def delete_blob(self, name: str) -> None:
+        """Remove a blob and its renditions, for `gc_blobs` only."""
+        super().delete(name)
+        renditions = os.path.splitext(self.path(name))[0] + '_renditions'
+        if os.path.isdir(renditions):
+            for entry in os.scandir(renditions):
+                os.remove(entry.path)
+            os.rmdir(renditions)
+
+
+blob_storage = BlobStorage()
+
+
+def get_blob_storage() -> BlobStorage:
+    """Callable for `storage=` of file fields, keeps migrations free of instances."""
+    return blob_storage
@@ -0,0 +1,10 @@
+from jobs.queue import task
+from . import phash
+from .models import MediaBlob
+
+
+@task('blobs.update_phash')
+def update_phash(blob_pk: int) -> None:
+    blob = MediaBlob.objects.filter(pk=blob_pk).first()
+    if blob is not None:
+        phash.update_phash(blob)
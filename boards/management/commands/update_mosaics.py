@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from boards.models import Board
+from boards.mosaic import update_mosaic
+
+
+class Command(BaseCommand):
+    help = (
+        "Build mosaic previews of existing boards. Later changes of board pins "
+        "rebuild them in background jobs."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Check boards which have a mosaic already, e.g. after a change of `MOSAIC_SIZE`.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        boards = Board.objects.all()
+        if not options['all']:
+            boards = boards.filter(mosaic='')
+
+        count = 0
+        for board_pk in boards.order_by('pk').values_list('pk', flat=True).iterator():
+            update_mosaic(board_pk)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{count} boards processed."))
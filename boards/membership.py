@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, QuerySet
+
+from pins.models import Pin
+from .models import Board
+
+
+# Most pins accepted by one bulk request.
+BULK_MEMBERSHIP_LIMIT = getattr(settings, 'BULK_MEMBERSHIP_LIMIT', 500)
+ACTIONS = ('add', 'remove', 'move')
+
+Membership = Board.pins.through
+
+
+def bulk_update_membership(action: str, pin_pks: list[int], board: Board,
+                           source: Board | None = None, pins: QuerySet | None = None) -> list[dict]:
+    """
+    Add pins to `board`, remove them from it, or move them there from `source`.
+
+    Membership of every pin is looked up with one query, then the through
+    table is written once per board with `add()`/`remove()`. These send
+    a single `m2m_changed` for all the pins, so caches are invalidated once.
+    Only `pins` are changed, the rest are reported as not found.
+    Returns a result per pin, in the given order.
+    """
+    pin_pks = list(dict.fromkeys(pin_pks))
+    pins = (Pin.objects.all() if pins is None else pins).filter(pk__in=pin_pks).annotate(
+        in_board=Exists(Membership.objects.filter(board_id=board.pk, pin_id=OuterRef('pk'))),
+    )
+    if source is not None:
+        pins = pins.annotate(
+            in_source=Exists(Membership.objects.filter(board_id=source.pk, pin_id=OuterRef('pk'))),
+        )
+    found = {pin['pk']: pin for pin in pins.values('pk', 'in_board', *(['in_source'] if source else []))}
+
+    statuses = {}
+    for pk in pin_pks:
+        pin = found.get(pk)
+        if pin is None:
+            statuses[pk] = 'not_found'
+        elif action == 'add':
+            statuses[pk] = 'already_in_board' if pin['in_board'] else 'added'
+        elif action == 'remove':
+            statuses[pk] = 'removed' if pin['in_board'] else 'not_in_board'
+        else:
+            statuses[pk] = 'moved' if pin['in_source'] else 'not_in_board'
+
+    with transaction.atomic():
+        if action == 'add':
+            board.pins.add(*[pk for pk, status in statuses.items() if status == 'added'])
+        elif action == 'remove':
+            board.pins.remove(*[pk for pk, status in statuses.items() if status == 'removed'])
+        else:
+            moved = [pk for pk, status in statuses.items() if status == 'moved']
+            source.pins.remove(*moved)
+            board.pins.add(*[pk for pk in moved if not found[pk]['in_board']])
+
+    return [{'pin': pk, 'status': status} for pk, status in statuses.items()]
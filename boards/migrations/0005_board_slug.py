@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-17 12:40
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    Board = apps.get_model('boards', 'Board')
+
+    taken = set()
+    for board in Board.objects.order_by('user_id', 'pk').only('pk', 'user_id', 'title').iterator():
+        base = slugify(board.title, allow_unicode=True)[:240] or 'board'
+        slug, number = base, 1
+        while (board.user_id, slug) in taken:
+            number += 1
+            slug = f"{base}-{number}"
+
+        taken.add((board.user_id, slug))
+        Board.objects.filter(pk=board.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0004_board_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='slug',
+            field=models.SlugField(allow_unicode=True, default='', editable=False, max_length=250),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='board',
+            name='title',
+            field=models.CharField(max_length=250),
+        ),
+        migrations.AddConstraint(
+            model_name='board',
+            constraint=models.UniqueConstraint(fields=('user', 'slug'), name='unique_board_slug'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0005_board_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='mosaic',
+            field=models.ImageField(blank=True, editable=False, upload_to='boards/mosaics'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-17 12:33
+
+import blobs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0006_board_mosaic'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='board',
+            name='cover',
+            field=models.ImageField(default='boards/default.png', storage=blobs.storage.get_blob_storage, upload_to='boards'),
+        ),
+    ]
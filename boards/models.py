@@ -1,15 +1,79 @@
+import logging
+
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
+from django.urls import reverse
+from django.utils.text import slugify
+from PIL import UnidentifiedImageError
+
+from blobs.storage import get_blob_storage
+from core.renditions import generate_renditions
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 class Board(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='board')
-    title = models.CharField(max_length=250, unique=True)
+    title = models.CharField(max_length=250)
+    # Unique among user's boards, filled from the title, see `make_slug`.
+    slug = models.SlugField(max_length=250, allow_unicode=True, editable=False)
     pins = models.ManyToManyField('pins.Pin', related_name='pins', blank=True)
-    cover = models.ImageField(upload_to='boards', default='boards/default.png')
+    cover = models.ImageField(upload_to='boards', default='boards/default.png', storage=get_blob_storage)
     is_private = models.BooleanField(default=False)
     description = models.CharField(max_length=250, blank=True)
+    # Resized copies of the cover, see `core.renditions`.
+    cover_renditions = models.JSONField(default=dict, blank=True)
+    # Tiles of the first pins, shown instead of the default cover, see `boards.mosaic`.
+    mosaic = models.ImageField(upload_to='boards/mosaics', blank=True, editable=False)
+    # Kept up to date on save, see `search.index`.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        constraints = [
+            # Also the index boards are looked up by in `board_detail`.
+            models.UniqueConstraint(fields=['user', 'slug'], name='unique_board_slug'),
+        ]
 
     def __str__(self):
         return self.title
+
+    @property
+    def has_custom_cover(self) -> bool:
+        return bool(self.cover) and self.cover.name != self._meta.get_field('cover').get_default()
+
+    def get_absolute_url(self) -> str:
+        return reverse('board_detail', args=[self.user.username, self.slug])
+
+    def save(self, *args, **kwargs) -> None:
+        if not self.slug:
+            self.slug = make_slug(self.title, Board.objects.filter(user_id=self.user_id).exclude(pk=self.pk))
+
+        is_new_cover = self.cover and not self.cover._committed
+        super().save(*args, **kwargs)
+
+        if is_new_cover:
+            self.update_cover_renditions()
+
+    def update_cover_renditions(self) -> None:
+        """Generate resized copies of the uploaded cover."""
+        try:
+            self.cover_renditions = generate_renditions(self.cover)
+        except (OSError, UnidentifiedImageError) as e:
+            # Looks like an image but doesn't decode, the original is shown as is.
+            logger.warning("Can't make renditions of board %s cover: %s", self.pk, e)
+            return
+        Board.objects.filter(pk=self.pk).update(cover_renditions=self.cover_renditions)
+
+
+def make_slug(title: str, others: models.QuerySet) -> str:
+    """Slug of `title`, numbered if one of `others` has it already."""
+    base = slugify(title, allow_unicode=True)[:240] or 'board'
+    taken = set(others.filter(slug__startswith=base).values_list('slug', flat=True))
+
+    slug, number = base, 1
+    while slug in taken:
+        number += 1
+        slug = f"{base}-{number}"
+    return slug
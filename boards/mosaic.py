@@ -0,0 +1,109 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from core.renditions import RENDITION_QUALITY
+from pins.models import Pin
+from .models import Board
+
+
+MOSAIC_SIZE = getattr(settings, 'MOSAIC_SIZE', 472)
+MOSAIC_BACKGROUND = (239, 239, 239)
+# Bump when the look of mosaics changes, so cached files are rebuilt.
+MOSAIC_VERSION = 1
+
+Membership = Board.pins.through
+
+
+def get_layout(count: int, size: int = MOSAIC_SIZE) -> list[tuple[int, int, int, int]]:
+    """
+    Boxes `(left, top, width, height)` of tiles: 2x2 grid for four pins,
+    one large tile and two small ones for three, halves or one tile below.
+    """
+    half = size // 2
+    if count >= 4:
+        return [(0, 0, half, half), (half, 0, size - half, half),
+                (0, half, half, size - half), (half, half, size - half, size - half)]
+    if count == 3:
+        return [(0, 0, half, size), (half, 0, size - half, half), (half, half, size - half, size - half)]
+    if count == 2:
+        return [(0, 0, half, size), (half, 0, size - half, size)]
+    return [(0, 0, size, size)][:count]
+
+
+def get_mosaic_pins(board: Board) -> list[Pin]:
+    """
+    First image pins saved into the board, as many as fit into a mosaic.
+    Other users' pins are skipped once they become private.
+    """
+    pin_pks = list(
+        Membership.objects.filter(board_id=board.pk, pin__media_kind='image')
+        .filter(Q(pin__is_public=True) | Q(pin__user_id=board.user_id))
+        .order_by('pk').values_list('pin_id', flat=True)[:len(get_layout(4))]
+    )
+    pins = Pin.objects.only('pk', 'file', 'renditions').in_bulk(pin_pks)
+    return [pins[pk] for pk in pin_pks if pk in pins]
+
+
+def get_mosaic_name(pins: list[Pin]) -> str:
+    """Content address: the same pins make the same file, shared between boards."""
+    key = f"{MOSAIC_VERSION}:{MOSAIC_SIZE}:" + ','.join(str(pin.pk) for pin in pins)
+    return f"boards/mosaics/{hashlib.sha1(key.encode()).hexdigest()}.jpg"
+
+
+def open_thumbnail(pin: Pin) -> Image.Image:
+    """Smallest JPEG rendition of a pin, or its original file."""
+    renditions = pin.renditions.get('jpeg') or []
+    name = renditions[0][1] if renditions else pin.file.name
+
+    with default_storage.open(name, 'rb') as file:
+        with Image.open(file) as image:
+            return ImageOps.exif_transpose(image).convert('RGB')
+
+
+def render_mosaic(pins: list[Pin], size: int = MOSAIC_SIZE) -> bytes:
+    """JPEG with thumbnails of `pins` cropped into tiles of the layout."""
+    mosaic = Image.new('RGB', (size, size), MOSAIC_BACKGROUND)
+
+    for pin, (left, top, width, height) in zip(pins, get_layout(len(pins), size)):
+        try:
+            thumbnail = open_thumbnail(pin)
+        except (OSError, UnidentifiedImageError):
+            # Tile stays blank, the rest of the mosaic is still useful.
+            continue
+        mosaic.paste(ImageOps.fit(thumbnail, (width, height), Image.LANCZOS), (left, top))
+
+    buffer = BytesIO()
+    mosaic.save(buffer, 'JPEG', quality=RENDITION_QUALITY)
+    return buffer.getvalue()
+
+
+def update_mosaic(board_pk: int) -> None:
+    """
+    Point board's `mosaic` to a mosaic of its current pins, rendering it
+    only if no board with the same pins has it already. File left unused
+    by the change is removed.
+    """
+    board = Board.objects.filter(pk=board_pk).first()
+    if board is None:
+        return
+
+    pins = get_mosaic_pins(board)
+    name = get_mosaic_name(pins) if pins else ''
+    old_name = board.mosaic.name
+
+    if name == old_name:
+        return
+    if name and not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(render_mosaic(pins)))
+
+    board.mosaic = name
+    board.save(update_fields=['mosaic'])
+
+    if old_name and not Board.objects.filter(mosaic=old_name).exists():
+        default_storage.delete(old_name)
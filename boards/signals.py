@@ -0,0 +1,41 @@
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+
+from jobs.queue import enqueue
+from pins.models import Pin
+from pins.visibility import visibility_changed
+from .models import Board
+
+Membership = Board.pins.through
+
+
+def schedule_mosaics(board_pks) -> None:
+    for board_pk in set(board_pks):
+        enqueue('boards.update_mosaic', board_pk=board_pk)
+
+
+@receiver(m2m_changed, sender=Membership)
+def board_membership_changed(sender, instance: Board | Pin, action: str,
+                             reverse: bool, pk_set: set | None, **kwargs) -> None:
+    """Rebuild mosaics of boards whose pins changed, out of the request."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        schedule_mosaics([instance.pk])
+    elif action == 'pre_clear':
+        schedule_mosaics(Membership.objects.filter(pin_id=instance.pk).values_list('board_id', flat=True))
+    else:
+        schedule_mosaics(pk_set)
+
+
+@receiver(pre_delete, sender=Pin)
+def pin_deleted(sender, instance: Pin, **kwargs) -> None:
+    """Membership rows are removed by cascade, which doesn't send `m2m_changed`."""
+    schedule_mosaics(Membership.objects.filter(pin_id=instance.pk).values_list('board_id', flat=True))
+
+
+@receiver(visibility_changed, sender=Pin)
+def pin_visibility_changed(sender, pin_pks: list[int], **kwargs) -> None:
+    """Mosaics of other users' boards mustn't show pins which became private."""
+    schedule_mosaics(Membership.objects.filter(pin_id__in=pin_pks).values_list('board_id', flat=True))
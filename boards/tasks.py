@@ -0,0 +1,7 @@
+from jobs.queue import task
+from . import mosaic
+
+
+@task('boards.update_mosaic')
+def update_mosaic(board_pk: int) -> None:
+    mosaic.update_mosaic(board_pk)
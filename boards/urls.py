@@ -3,8 +3,9 @@ from . import views
 
 urlpatterns = [
     path("create", views.CreateBoardView.as_view(), name="create_board"),
-    path("edit/<str:name>", views.EditBoardView.as_view(), name="edit_board"),
-    path("<str:board_name>", views.DetailBoardView.as_view(), name="board_detail"),
+    path("edit/<int:pk>", views.EditBoardView.as_view(), name="edit_board"),
     path("save_to_board/<int:pk>", views.SaveToBoard.as_view(), name="save_to_board"),
-    path("remove_from_board/<int:pin_pk>/<str:board_name>", views.RemoveFromBoard.as_view(), name="remove_from_board"),
+    path("remove_from_board/<int:pin_pk>/<int:board_pk>", views.RemoveFromBoard.as_view(), name="remove_from_board"),
+    # Own prefix, usernames like "edit" would clash with the routes above.
+    path("u/<str:username>/<str:slug>", views.DetailBoardView.as_view(), name="board_detail"),
 ]
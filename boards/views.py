@@ -1,12 +1,14 @@
+from functools import cached_property
 from typing import Any
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.http import Http404, HttpResponse, HttpRequest
-from django.shortcuts import redirect
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy, reverse
 from django.views.generic import UpdateView, CreateView, DetailView, FormView, View
 
 from pins.forms import SaveToBoard
 from pins.models import Pin
+from pins.visibility import get_visible_pins
 from .forms import CreateBoardForm, EditBoardForm
 from .models import Board
 
@@ -37,11 +39,13 @@ class EditBoardView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         user = self.request.user
         return reverse("profile", kwargs={"user__username":user.username})
 
+    @cached_property
+    def board(self) -> Board:
+        return get_object_or_404(self.model, pk=self.kwargs['pk'])
+
     def get_object(self, queryset=None) -> Board:
-        try:
-            return self.model.objects.get(title=self.kwargs['name'])
-        except self.model.DoesNotExist:
-            raise Http404
+        """Board is looked up once per request, `test_func` and `get_initial` reuse it."""
+        return self.board
 
     def get_initial(self) -> dict[str, Any]:
         initial = super().get_initial()
@@ -56,22 +60,45 @@ class EditBoardView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
 
         initial.update(new_initial)
         return initial
+
+    def form_valid(self, form: EditBoardForm) -> HttpResponse:
+        # Renamed board gets a slug of the new title.
+        if 'title' in form.changed_data:
+            form.instance.slug = ''
+        return super().form_valid(form)
     
     def test_func(self) -> bool:
         """Method from `UserPassesTestMixin`. Tests if user, 
         that made request is object's owner.
         """
         obj = self.get_object()
-        return obj.user == self.request.user
+        return obj.user_id == self.request.user.pk
     
 class DetailBoardView(LoginRequiredMixin, DetailView):
     model = Board
     template_name = "detail_board.html"
-    slug_field = "title"
-    slug_url_kwarg = "board_name"
     login_url = reverse_lazy("login")
     redirect_field_name = "next"
 
+    def get_object(self, queryset=None) -> Board:
+        """
+        Board by owner's username and slug, one lookup in `unique_board_slug`.
+        Private boards are shown to their owners only.
+        """
+        board = get_object_or_404(
+            self.model.objects.select_related('user'),
+            user__username=self.kwargs['username'], slug=self.kwargs['slug'],
+        )
+        if board.is_private and board.user_id != self.request.user.pk:
+            raise Http404
+        return board
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        """Pins of the board, except other users' pins which became private."""
+        context = super().get_context_data(**kwargs)
+        context['pins'] = get_visible_pins(self.request.user).filter(pins=self.object).order_by('pk')
+        return context
+
 
 class SaveToBoard(LoginRequiredMixin, FormView):
     form_class = SaveToBoard
@@ -89,7 +116,8 @@ class SaveToBoard(LoginRequiredMixin, FormView):
         return kwargs
     
     def form_valid(self, form: SaveToBoard) -> HttpResponse:
-        pin = Pin.objects.get(pk=self.kwargs['pk'])
+        # Other users' private pins can't be saved.
+        pin = get_object_or_404(get_visible_pins(self.request.user), pk=self.kwargs['pk'])
         instance = form.save(commit=False)
         instance.user = pin.user
         instance.save
@@ -103,24 +131,18 @@ class RemoveFromBoard(LoginRequiredMixin, UserPassesTestMixin, View):
 
     def get_success_url(self) -> str:
         return self.request.META.get("HTTP_REFERER")
+
+    @cached_property
+    def board(self) -> Board:
+        return get_object_or_404(Board, pk=self.kwargs['board_pk'])
      
     def test_func(self) -> bool:
         """Method from `UserPassesTestMixin`. Tests if user, 
         that made request is object's owner.
         """
-        try:
-            obj = Board.objects.get(title=self.kwargs.get('board_name'))
-        except Board.DoesNotExist:
-            return Http404
-
-        return obj.user == self.request.user
+        return self.board.user_id == self.request.user.pk
     
-    def post(self, request: HttpRequest, pin_pk: int, board_name: str) -> HttpResponse:
-        try:
-            pin = Pin.objects.get(pk=pin_pk)
-            board = Board.objects.get(title=board_name)
-        except (Pin.DoesNotExist, Board.DoesNotExist):
-            return Http404
-        
-        board.pins.remove(pin)
+    def post(self, request: HttpRequest, pin_pk: int, board_pk: int) -> HttpResponse:
+        get_object_or_404(Pin, pk=pin_pk)
+        self.board.pins.remove(pin_pk)
         return redirect(self.get_success_url())
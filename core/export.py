@@ -0,0 +1,222 @@
+import csv
+import logging
+import zipfile
+from datetime import datetime
+from itertools import chain, groupby
+from typing import Any, Iterable, Iterator
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+
+from accounts.models import Follow
+from boards.models import Board
+from pins.models import Pin, Comment
+
+
+# Rows fetched from the database at a time, memory doesn't grow with account size.
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+# Bytes gathered before a piece of the response is sent.
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+PIN_FIELDS = ['id', 'title', 'description', 'board_id', 'file', 'media_kind', 'mime_type',
+              'file_size', 'width', 'height', 'date_created']
+BOARD_FIELDS = ['id', 'title', 'description', 'is_private', 'cover']
+COMMENT_FIELDS = ['id', 'pin_id', 'text', 'date_created']
+
+User = get_user_model()
+Membership = Board.pins.through
+logger = logging.getLogger(__name__)
+
+
+def iter_pins(user: User) -> Iterator[dict[str, Any]]:
+    return Pin.objects.filter(user=user).order_by('pk').values(*PIN_FIELDS).iterator(EXPORT_CHUNK_SIZE)
+
+
+def iter_boards(user: User) -> Iterator[dict[str, Any]]:
+    """
+    Boards with ids of their pins. Membership is read in one pass ordered
+    like boards and merged in, instead of a query per board.
+    """
+    boards = Board.objects.filter(user=user).order_by('pk').values(*BOARD_FIELDS).iterator(EXPORT_CHUNK_SIZE)
+    memberships = groupby(
+        iter_board_pins(user),
+        key=lambda membership: membership['board_id'],
+    )
+
+    board_pk, pins = next(memberships, (None, ()))
+    for board in boards:
+        # Boards without pins have no memberships, skip them in the merge.
+        while board_pk is not None and board_pk < board['id']:
+            board_pk, pins = next(memberships, (None, ()))
+
+        board['pins'] = [membership['pin_id'] for membership in pins] if board_pk == board['id'] else []
+        yield board
+
+
+def iter_board_pins(user: User) -> Iterator[dict[str, Any]]:
+    return (
+        Membership.objects.filter(board__user=user)
+        .order_by('board_id', 'pin_id')
+        .values('board_id', 'pin_id')
+        .iterator(EXPORT_CHUNK_SIZE)
+    )
+
+
+def iter_comments(user: User) -> Iterator[dict[str, Any]]:
+    return Comment.objects.filter(user=user).order_by('pk').values(*COMMENT_FIELDS).iterator(EXPORT_CHUNK_SIZE)
+
+
+def iter_follows(user: User) -> Iterator[dict[str, Any]]:
+    following = Follow.objects.filter(follower=user).order_by('pk').values_list('following__username', flat=True)
+    for username in following.iterator(EXPORT_CHUNK_SIZE):
+        yield {'direction': 'following', 'username': username}
+
+    followers = Follow.objects.filter(following=user).order_by('pk').values_list('follower__username', flat=True)
+    for username in followers.iterator(EXPORT_CHUNK_SIZE):
+        yield {'direction': 'follower', 'username': username}
+
+
+# Tables of an export, in NDJSON every row is tagged with its table name.
+TABLES = {
+    'pins': (PIN_FIELDS, iter_pins),
+    'boards': (BOARD_FIELDS + ['pins'], iter_boards),
+    'board_pins': (['board_id', 'pin_id'], iter_board_pins),
+    'comments': (COMMENT_FIELDS, iter_comments),
+    'follows': (['direction', 'username'], iter_follows),
+}
+# `board_pins` duplicates `boards.pins`, it's there for CSV.
+NDJSON_TABLES = ['pins', 'boards', 'comments', 'follows']
+
+
+def buffered(pieces: Iterable[str]) -> Iterator[bytes]:
+    """Join small pieces into larger response chunks."""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield ''.join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode()
+
+
+def export_ndjson(user: User) -> Iterator[bytes]:
+    """Every object of the user as a line of `{"type": <table>, ...fields}`."""
+    encoder = DjangoJSONEncoder()
+    return buffered(
+        encoder.encode({'type': table, **row}) + '\n'
+        for table in NDJSON_TABLES
+        for row in TABLES[table][1](user)
+    )
+
+
+class Echo:
+    """File-like object which returns what is written, for `csv.writer`."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_csv(user: User, table: str) -> Iterator[bytes]:
+    """One table of the export, with a header row."""
+    fields, rows = TABLES[table]
+    writer = csv.writer(Echo())
+
+    def lines() -> Iterator[str]:
+        yield writer.writerow(fields)
+        for row in rows(user):
+            yield writer.writerow([format_csv_value(row[field]) for field in fields])
+    return buffered(lines())
+
+
+def format_csv_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return ' '.join(map(str, value))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ZipStream:
+    """
+    Write-only, non-seekable file for `zipfile`, its content is taken
+    out with `pop()` and sent as the archive is being written.
+    """
+
+    def __init__(self) -> None:
+        self.chunks = []
+        self.offset = 0
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        self.offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.offset
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def export_zip(user: User) -> Iterator[bytes]:
+    """
+    Zip archive of `data.ndjson` and the user's media files under `media/`.
+    Files are copied from storage piece by piece straight into the response,
+    no temporary copy of the archive or of the files is made.
+    """
+    return (chunk for chunk in write_zip(user, ZipStream()) if chunk)
+
+
+def write_zip(user: User, stream: ZipStream) -> Iterator[bytes]:
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open('data.ndjson', 'w', force_zip64=True) as destination:
+            for chunk in export_ndjson(user):
+                destination.write(chunk)
+                yield stream.pop()
+
+        for name in iter_media_names(user):
+            # Images and videos are compressed already.
+            info = zipfile.ZipInfo(f"media/{name}", date_time=datetime.now().timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED
+
+            try:
+                source = default_storage.open(name, 'rb')
+            except OSError:
+                logger.warning("Media file %s of user %s is missing, skipped in export.", name, user.pk)
+                continue
+
+            with source, archive.open(info, 'w', force_zip64=True) as destination:
+                while chunk := source.read(EXPORT_BUFFER_SIZE):
+                    destination.write(chunk)
+                    yield stream.pop()
+
+    # Central directory, written on close.
+    yield stream.pop()
+
+
+def iter_media_names(user: User) -> Iterator[str]:
+    """
+    Files of user's pins and board covers, each once: pins and covers with
+    the same content share one file, see `blobs.storage`.
+    """
+    default_cover = Board._meta.get_field('cover').get_default()
+    names = chain(
+        Pin.objects.filter(user=user).order_by('pk').values_list('file', flat=True).iterator(EXPORT_CHUNK_SIZE),
+        Board.objects.filter(user=user).exclude(cover=default_cover).exclude(cover='')
+        .order_by('pk').values_list('cover', flat=True).iterator(EXPORT_CHUNK_SIZE),
+    )
+
+    written = set()
+    for name in names:
+        if name not in written:
+            written.add(name)
+            yield name
@@ -0,0 +1,70 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Model, Q, QuerySet
+
+from pins.models import Pin
+
+
+FEED_PAGE_SIZE = getattr(settings, 'FEED_PAGE_SIZE', 30)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a feed cursor can't be decoded."""
+
+
+def encode_cursor(obj: Model) -> str:
+    """Make an opaque cursor out of the last pin (or comment) on a page."""
+    raw = f"{obj.date_created.isoformat()}|{obj.pk}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Turn a cursor back into the `(date_created, id)` keyset position."""
+    try:
+        created, pk = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created), int(pk)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def get_page_queryset(queryset: QuerySet, cursor: str | None, page_size: int) -> QuerySet:
+    """
+    Pins after the cursor, newest first, with one extra row to find out
+    if there is a next page. Raises `InvalidCursor`.
+    """
+    queryset = queryset.order_by('-date_created', '-id')
+
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(date_created__lt=created) | Q(date_created=created, id__lt=pk)
+        )
+    return queryset[:page_size + 1]
+
+
+def split_page(objs: list[Model], page_size: int) -> tuple[list[Model], str | None]:
+    """Drop the extra row fetched by `get_page_queryset`, making the next cursor of it."""
+    if len(objs) <= page_size:
+        return objs, None
+
+    objs = objs[:page_size]
+    return objs, encode_cursor(objs[-1])
+
+
+def get_feed_page(queryset: QuerySet, cursor: str | None = None,
+                  page_size: int = FEED_PAGE_SIZE) -> tuple[list[Pin], str | None]:
+    """
+    Return one page of pins, newest first, and a cursor for the next page.
+
+    Pages are located by keyset on `(date_created, id)` instead of OFFSET,
+    so every page costs the same no matter how deep the client scrolls.
+    """
+    return split_page(list(get_page_queryset(queryset, cursor, page_size)), page_size)
+
+
+async def aget_feed_page(queryset: QuerySet, cursor: str | None = None,
+                         page_size: int = FEED_PAGE_SIZE) -> tuple[list[Pin], str | None]:
+    """Async version of `get_feed_page`."""
+    return split_page([pin async for pin in get_page_queryset(queryset, cursor, page_size)], page_size)
@@ -0,0 +1,237 @@
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from time import perf_counter
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django_redis.client import DefaultClient
+
+
+logger = logging.getLogger(__name__)
+
+# Metrics of the request and `track()` blocks being run in this context, outermost first.
+_current: ContextVar[tuple['RequestMetrics', ...]] = ContextVar('request_metrics', default=())
+_missing = object()
+
+# Placeholder lists of different length are one query shape.
+IN_LIST_RE = re.compile(r'\((?:%s, )+%s\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+class BudgetExceeded(AssertionError):
+    """Raised instead of logging when `REQUEST_BUDGET_ACTION` is 'raise', to fail tests."""
+
+
+def fingerprint(sql: str) -> str:
+    """Query shape without parameters, so repeated N+1 queries compare equal."""
+    return WHITESPACE_RE.sub(' ', IN_LIST_RE.sub('(...)', sql)).strip()
+
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        self.queries = 0
+        self.sql_time = 0.0
+        self.fingerprints = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.total_time = 0.0
+        self._start = perf_counter()
+
+    @property
+    def duplicates(self) -> int:
+        """Queries which repeat a shape already run in this request."""
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def finish(self) -> None:
+        self.total_time = (perf_counter() - self._start) * 1000
+
+    def __call__(self, execute, sql, params, many, context) -> Any:
+        """Wrapper for `connection.execute_wrapper`, times every query."""
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += (perf_counter() - start) * 1000
+            self.queries += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def server_timing(self) -> str:
+        return ', '.join([
+            f'db;dur={self.sql_time:.1f};desc="{self.queries} queries, {self.duplicates} duplicate"',
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'app;dur={self.total_time - self.sql_time:.1f}',
+            f'total;dur={self.total_time:.1f}',
+        ])
+
+
+def record_query(execute, sql, params, many, context) -> Any:
+    """
+    Execute wrapper installed on every connection, timing queries for the
+    metrics of the current context. Async ORM calls run in other threads,
+    with their own connections, but in a copy of the calling context.
+    """
+    for metrics in _current.get():
+        execute = partial(metrics, execute)
+    return execute(sql, params, many, context)
+
+
+def install_query_recorder(connection: BaseDatabaseWrapper, **kwargs) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# Connections opened from now on, in any thread.
+connection_created.connect(install_query_recorder, dispatch_uid='instrumentation_query_recorder')
+
+
+@contextmanager
+def track() -> Iterator[RequestMetrics]:
+    """
+    Record queries and cache lookups made inside the block, on every database,
+    including async ORM calls awaited in it.
+    Used by `InstrumentationMiddleware`, handy in tests and the shell too.
+    """
+    metrics = RequestMetrics()
+    # Connections of this thread may have been opened before.
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+    token = _current.set((*_current.get(), metrics))
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+        metrics.finish()
+
+
+def record_cache_lookup(hits: int, misses: int) -> None:
+    for metrics in _current.get():
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+class InstrumentedRedisClient(DefaultClient):
+    """
+    django-redis client counting hits and misses of the current request.
+    Set as `CLIENT_CLASS` of the cache.
+    """
+
+    def get(self, key: Any, default: Any = None, version: int | None = None, client: Any = None) -> Any:
+        value = super().get(key, default=_missing, version=version, client=client)
+        if value is _missing:
+            record_cache_lookup(0, 1)
+            return default
+
+        record_cache_lookup(1, 0)
+        return value
+
+    def get_many(self, keys: Any, version: int | None = None, client: Any = None) -> dict:
+        keys = list(keys)
+        values = super().get_many(keys, version=version, client=client)
+        record_cache_lookup(len(values), len(keys) - len(values))
+        return values
+
+
+class Aggregates:
+    """
+    Totals per URL name, kept in process memory. Every worker process
+    has its own, so the metrics endpoint reports the one that served it.
+    """
+    # Kept per view to point at the N+1 culprit.
+    top_duplicates = 5
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def add(self, view_name: str, metrics: RequestMetrics, over_budget: bool) -> None:
+        with self.lock:
+            view = self.views.setdefault(view_name, {
+                'requests': 0, 'over_budget': 0, 'queries': 0, 'duplicate_queries': 0,
+                'sql_time': 0.0, 'total_time': 0.0, 'max_time': 0.0,
+                'cache_hits': 0, 'cache_misses': 0, 'duplicates': Counter(),
+            })
+            view['requests'] += 1
+            view['over_budget'] += over_budget
+            view['queries'] += metrics.queries
+            view['duplicate_queries'] += metrics.duplicates
+            view['sql_time'] += metrics.sql_time
+            view['total_time'] += metrics.total_time
+            view['max_time'] = max(view['max_time'], metrics.total_time)
+            view['cache_hits'] += metrics.cache_hits
+            view['cache_misses'] += metrics.cache_misses
+            view['duplicates'].update({
+                sql: count - 1 for sql, count in metrics.fingerprints.items() if count > 1
+            })
+
+    def snapshot(self) -> dict[str, dict]:
+        """Averages per view, ready to be serialized."""
+        with self.lock:
+            result = {}
+            for view_name, view in self.views.items():
+                requests = view['requests']
+                result[view_name] = {
+                    'requests': requests,
+                    'over_budget': view['over_budget'],
+                    'avg_queries': round(view['queries'] / requests, 2),
+                    'avg_duplicate_queries': round(view['duplicate_queries'] / requests, 2),
+                    'avg_sql_time': round(view['sql_time'] / requests, 2),
+                    'avg_time': round(view['total_time'] / requests, 2),
+                    'max_time': round(view['max_time'], 2),
+                    'cache_hits': view['cache_hits'],
+                    'cache_misses': view['cache_misses'],
+                    'top_duplicates': view['duplicates'].most_common(self.top_duplicates),
+                }
+            return result
+
+    def reset(self) -> None:
+        with self.lock:
+            self.views.clear()
+
+
+aggregates = Aggregates()
+
+
+def get_budget(view_name: str) -> dict[str, float]:
+    """
+    Limits of a view from `REQUEST_BUDGETS`, merged over the '*' default.
+    Keys are 'queries', 'duplicates', 'sql_time' and 'total_time' (ms).
+    Read on every request so `override_settings` works in tests.
+    """
+    budgets = getattr(settings, 'REQUEST_BUDGETS', {})
+    return {**budgets.get('*', {}), **budgets.get(view_name, {})}
+
+
+def check_budget(view_name: str, metrics: RequestMetrics) -> list[str]:
+    """Return descriptions of the view's exceeded limits."""
+    measured = {
+        'queries': metrics.queries,
+        'duplicates': metrics.duplicates,
+        'sql_time': metrics.sql_time,
+        'total_time': metrics.total_time,
+    }
+    return [
+        f"{name} {measured[name]:g} > {limit:g}"
+        for name, limit in get_budget(view_name).items()
+        if name in measured and measured[name] > limit
+    ]
+
+
+def report_over_budget(view_name: str, metrics: RequestMetrics, exceeded: list[str]) -> None:
+    """Log exceeded limits, or raise them if `REQUEST_BUDGET_ACTION` is 'raise'."""
+    message = f"View {view_name} is over budget: {', '.join(exceeded)}."
+    if metrics.duplicates:
+        sql, count = metrics.fingerprints.most_common(1)[0]
+        message += f" Most repeated query ({count}x): {sql}"
+
+    if getattr(settings, 'REQUEST_BUDGET_ACTION', 'log') == 'raise':
+        raise BudgetExceeded(message)
+    logger.warning(message)
@@ -0,0 +1,72 @@
+import json
+import tracemalloc
+import uuid
+from typing import Callable
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from boards.models import Board
+from core.export import export_csv, export_ndjson
+from pins.models import Pin, Comment
+from restapi.serializers import PinSerializer
+
+
+class Rollback(Exception):
+    """Raised to throw away generated data."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure peak memory of streaming exports against serializing everything at once, "
+        "on generated accounts of growing size. Generated data is rolled back."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                            help="Number of pins and comments of generated accounts.")
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write(f"{'pins':>8} {'ndjson':>12} {'csv':>12} {'serializer':>12}")
+
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    user = self.generate(size)
+                    ndjson = self.peak(lambda: sum(len(chunk) for chunk in export_ndjson(user)))
+                    csv = self.peak(lambda: sum(len(chunk) for chunk in export_csv(user, 'pins')))
+                    naive = self.peak(lambda: len(json.dumps(
+                        PinSerializer(Pin.objects.filter(user=user), many=True).data,
+                    )))
+                    raise Rollback
+            except Rollback:
+                pass
+
+            self.stdout.write(f"{size:>8} {self.kib(ndjson):>12} {self.kib(csv):>12} {self.kib(naive):>12}")
+
+    def generate(self, size: int):
+        """User with `size` pins in one board and `size` comments."""
+        user = get_user_model().objects.create(username=f"bench-{uuid.uuid4().hex[:12]}", email='')
+        board = Board.objects.create(user=user, title=user.username)
+
+        pins = Pin.objects.bulk_create(
+            Pin(user=user, board=board, file=f"pins/bench-{i}.jpg", title=f"Pin {i}",
+                description="Benchmark pin " * 5, media_kind='image', mime_type='image/jpeg')
+            for i in range(size)
+        )
+        board.pins.add(*pins)
+        Comment.objects.bulk_create(Comment(pin=pin, user=user, text="Nice pin!") for pin in pins)
+        return user
+
+    def peak(self, func: Callable[[], int]) -> int:
+        """Peak memory allocated while running `func`."""
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def kib(self, size: int) -> str:
+        return f"{size / 1024:,.0f} KiB"
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandParser
+from PIL import UnidentifiedImageError
+
+from boards.models import Board
+from pins.models import Pin
+
+
+class Command(BaseCommand):
+    help = "Generate resized renditions for existing image pins and board covers."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Regenerate renditions that already exist.",
+        )
+        parser.add_argument('--skip-pins', action='store_true')
+        parser.add_argument('--skip-boards', action='store_true')
+        parser.add_argument('--chunk-size', type=int, default=200)
+
+    def handle(self, *args, **options) -> None:
+        if not options['skip_pins']:
+            pins = Pin.objects.filter(media_kind='image').only('pk', 'file', 'media_kind')
+            if not options['all']:
+                pins = pins.filter(renditions={})
+            self.generate(pins, 'update_renditions', options['chunk_size'])
+
+        if not options['skip_boards']:
+            boards = Board.objects.only('pk', 'cover')
+            if not options['all']:
+                boards = boards.filter(cover_renditions={})
+            self.generate(boards, 'update_cover_renditions', options['chunk_size'])
+
+    def generate(self, queryset, method: str, chunk_size: int) -> None:
+        done, failed = 0, 0
+
+        for obj in queryset.order_by('pk').iterator(chunk_size=chunk_size):
+            try:
+                getattr(obj, method)()
+                done += 1
+            except (OSError, UnidentifiedImageError) as e:
+                failed += 1
+                self.stderr.write(f"{queryset.model.__name__} {obj.pk}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{queryset.model.__name__}: {done} processed, {failed} failed."
+        ))
@@ -0,0 +1,52 @@
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from .instrumentation import RequestMetrics, aggregates, check_budget, report_over_budget, track
+
+
+class InstrumentationMiddleware:
+    """
+    Measure queries, SQL time, cache lookups and total time of every request.
+    Adds a `Server-Timing` header, collects totals per URL name and checks
+    them against `REQUEST_BUDGETS`.
+
+    Works in both modes, so async views served under ASGI aren't pushed
+    into a thread by it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with track() as metrics:
+            response = self.get_response(request)
+        return self.process_metrics(request, response, metrics)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        with track() as metrics:
+            response = await self.get_response(request)
+        return self.process_metrics(request, response, metrics)
+
+    def process_metrics(self, request: HttpRequest, response: HttpResponse, metrics: RequestMetrics) -> HttpResponse:
+        # Streaming responses are measured up to their first byte only.
+        if getattr(settings, 'SERVER_TIMING', True):
+            response['Server-Timing'] = metrics.server_timing()
+
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        exceeded = check_budget(view_name, metrics)
+        aggregates.add(view_name, metrics, bool(exceeded))
+
+        if exceeded:
+            report_over_budget(view_name, metrics, exceeded)
+        return response
@@ -0,0 +1,96 @@
+import base64
+import os
+from io import BytesIO
+from typing import Any
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models.fields.files import FieldFile
+from PIL import Image, ImageFilter, ImageOps, features
+
+
+RENDITION_WIDTHS = getattr(settings, 'RENDITION_WIDTHS', (236, 474, 736))
+RENDITION_QUALITY = getattr(settings, 'RENDITION_QUALITY', 80)
+PLACEHOLDER_WIDTH = 16
+
+# Browsers pick the first `<source>` they support, so order matters.
+FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+}
+
+
+def get_formats() -> list[str]:
+    """Formats this Pillow build is able to encode."""
+    return [fmt for fmt in FORMATS if fmt != 'webp' or features.check('webp')]
+
+
+def get_rendition_name(name: str, width: int, fmt: str) -> str:
+    """`pins/photo.png` -> `pins/photo_renditions/236.webp`"""
+    base, _ = os.path.splitext(name)
+    return f"{base}_renditions/{width}.{FORMATS[fmt][1]}"
+
+
+def make_placeholder(image: Image.Image) -> str:
+    """Tiny blurred JPEG, inlined as a data URI, shown while loading."""
+    height = max(round(image.height * PLACEHOLDER_WIDTH / image.width), 1)
+    tiny = image.resize((PLACEHOLDER_WIDTH, height)).filter(ImageFilter.GaussianBlur(1))
+
+    buffer = BytesIO()
+    tiny.save(buffer, 'JPEG', quality=40)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def generate_renditions(file: FieldFile) -> dict[str, Any]:
+    """
+    Make width-bucketed derivatives of an image and a blur placeholder.
+    Derivatives are stored next to the original, returned value is meant
+    to be saved into a `JSONField`:
+
+        {"placeholder": "data:...", "webp": [[236, "pins/x_renditions/236.webp"], ...], ...}
+
+    Images are never upscaled, an original narrower than the smallest
+    bucket gets a single rendition of its own width.
+    """
+    with file.open('rb'):
+        with Image.open(file) as original:
+            image = ImageOps.exif_transpose(original).convert('RGB')
+
+    widths = [width for width in RENDITION_WIDTHS if width < image.width] or [image.width]
+    renditions = {'placeholder': make_placeholder(image)}
+
+    for width in widths:
+        height = max(round(image.height * width / image.width), 1)
+        resized = image.resize((width, height), Image.LANCZOS)
+
+        for fmt in get_formats():
+            buffer = BytesIO()
+            resized.save(buffer, FORMATS[fmt][0], quality=RENDITION_QUALITY)
+
+            # Regenerating must overwrite, not get a suffixed name.
+            name = get_rendition_name(file.name, width, fmt)
+            default_storage.delete(name)
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+
+            renditions.setdefault(fmt, []).append([width, name])
+
+    return renditions
+
+
+def get_srcset(renditions: dict[str, Any], fmt: str) -> str:
+    """Value for `srcset` attribute, e.g. `/media/.../236.webp 236w, ...`"""
+    return ", ".join(
+        f"{default_storage.url(name)} {width}w" for width, name in renditions.get(fmt, [])
+    )
+
+
+def get_rendition_urls(renditions: dict[str, Any]) -> dict[str, Any]:
+    """API representation of stored renditions."""
+    data = {'placeholder': renditions.get('placeholder')}
+    for fmt in FORMATS:
+        data[fmt] = [
+            {'width': width, 'url': default_storage.url(name)}
+            for width, name in renditions.get(fmt, [])
+        ]
+    return data
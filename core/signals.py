@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import Follow
+from jobs.queue import enqueue
+from pins.ingest import pins_created
+from pins.models import Pin
+
+
+@receiver(post_save, sender=Pin)
+def pin_created(sender, instance: Pin, created: bool, **kwargs) -> None:
+    """Push new pin into followers' timelines, out of the request."""
+    if created:
+        enqueue('core.fan_out_pin', pin_pk=instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance: Follow, created: bool, **kwargs) -> None:
+    if created:
+        enqueue('core.add_author_to_timeline', user_pk=instance.follower_id, author_pk=instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance: Follow, **kwargs) -> None:
+    enqueue('core.remove_author_from_timeline', user_pk=instance.follower_id, author_pk=instance.following_id)
+
+
+@receiver(pins_created, sender=Pin)
+def pins_bulk_created(sender, pins: list[Pin], **kwargs) -> None:
+    """One fan-out job for a whole batch of imported pins."""
+    enqueue('core.fan_out_pins', pin_pks=[pin.pk for pin in pins])
@@ -0,0 +1,22 @@
+from jobs.queue import task
+from . import timeline
+
+
+@task('core.fan_out_pin')
+def fan_out_pin(pin_pk: int) -> None:
+    timeline.fan_out_pin(pin_pk)
+
+
+@task('core.fan_out_pins')
+def fan_out_pins(pin_pks: list[int]) -> None:
+    timeline.fan_out_pins(pin_pks)
+
+
+@task('core.add_author_to_timeline')
+def add_author_to_timeline(user_pk: int, author_pk: int) -> None:
+    timeline.add_author_to_timeline(user_pk, author_pk)
+
+
+@task('core.remove_author_from_timeline')
+def remove_author_from_timeline(user_pk: int, author_pk: int) -> None:
+    timeline.remove_author_from_timeline(user_pk, author_pk)
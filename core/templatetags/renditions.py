@@ -0,0 +1,59 @@
+from typing import Any
+
+from django import template
+from django.db.models.fields.files import FieldFile
+
+from core.renditions import get_formats, get_srcset
+
+
+register = template.Library()
+
+
+@register.inclusion_tag("picture.html")
+def picture(file: FieldFile, renditions: dict[str, Any], sizes: str = "236px", **attrs) -> dict[str, Any]:
+    """
+    Render an image with responsive renditions, falling back to the
+    original file. Extra keyword arguments become `<img>` attributes:
+
+        {% picture pin.file pin.renditions sizes="200px" height="300" width="200" %}
+    """
+    renditions = renditions or {}
+    placeholder = renditions.get('placeholder')
+    style = attrs.pop('style', '')
+
+    # Blurred placeholder stays visible until the image is loaded.
+    if placeholder:
+        style = f"{style} background: url('{placeholder}') center / cover no-repeat;".strip()
+
+    sources = [
+        {'type': f"image/{fmt}", 'srcset': get_srcset(renditions, fmt)}
+        for fmt in get_formats() if renditions.get(fmt)
+    ]
+
+    return {
+        'src': file.url,
+        'sources': sources,
+        'sizes': sizes,
+        'placeholder': placeholder,
+        'style': style,
+        'attrs': attrs,
+    }
+
+
+@register.inclusion_tag("video.html")
+def video(pin, **attrs) -> dict[str, Any]:
+    """
+    Render a video pin as its poster frame. The short preview clip, or the
+    original until a preview is made (see `pins.video`), is only loaded
+    and played while the video is on screen, by `static/video.js`:
+
+        {% video pin class="video" %}
+    """
+    if pin.width and pin.height:
+        attrs = {'width': pin.width, 'height': pin.height, **attrs}
+
+    return {
+        'src': pin.preview.url if pin.preview else pin.file.url,
+        'poster': pin.poster.url if pin.poster else '',
+        'attrs': attrs,
+    }
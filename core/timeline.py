@@ -0,0 +1,192 @@
+from collections import defaultdict
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+
+from accounts.models import Follow
+from pins.models import Pin
+from .feed import FEED_PAGE_SIZE, InvalidCursor
+
+
+# Pins kept per follower, older ones are trimmed on push.
+TIMELINE_LENGTH = getattr(settings, 'TIMELINE_LENGTH', 800)
+# Pins of authors with more followers are not pushed, but pulled on read.
+FANOUT_FOLLOWERS_LIMIT = getattr(settings, 'FANOUT_FOLLOWERS_LIMIT', 5000)
+TIMELINE_TTL = getattr(settings, 'TIMELINE_TTL', 60 * 60 * 24 * 30)
+
+User = get_user_model()
+
+
+def timeline_key(user_pk: int) -> str:
+    return f"timeline:{user_pk}"
+
+
+def timeline_built_key(user_pk: int) -> str:
+    """
+    Marks timelines filled by `rebuild_timeline`. Fan-out pushes into
+    every follower's timeline, so existence alone doesn't mean it's complete.
+    """
+    return f"timeline_built:{user_pk}"
+
+
+class RedisTimelineStore:
+    """
+    Timelines as Redis sorted sets of pin ids, scored by the id itself,
+    so the newest pins come first and an id can be used as a cursor.
+    """
+
+    def __init__(self) -> None:
+        from django_redis import get_redis_connection
+        self.redis = get_redis_connection('default')
+
+    def key(self, user_pk: int) -> str:
+        # Keep the same prefix and version as the rest of the cache.
+        return cache.make_key(timeline_key(user_pk))
+
+    def push(self, user_pks: Iterable[int], pin_pks: list[int]) -> None:
+        if not pin_pks:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for user_pk in user_pks:
+            key = self.key(user_pk)
+            pipe.zadd(key, {pk: pk for pk in pin_pks})
+            pipe.zremrangebyrank(key, 0, -TIMELINE_LENGTH - 1)
+            pipe.expire(key, TIMELINE_TTL)
+        pipe.execute()
+
+    def remove(self, user_pk: int, pin_pks: list[int]) -> None:
+        if pin_pks:
+            self.redis.zrem(self.key(user_pk), *pin_pks)
+
+    def range(self, user_pk: int, before: int | None, count: int) -> list[int]:
+        max_score = f"({before}" if before else '+inf'
+        pks = self.redis.zrevrangebyscore(self.key(user_pk), max_score, '-inf', start=0, num=count)
+        return [int(pk) for pk in pks]
+
+
+class CacheTimelineStore:
+    """
+    Fallback for caches without sorted sets (local memory in tests).
+    Not atomic, good enough for a single process.
+    """
+
+    def push(self, user_pks: Iterable[int], pin_pks: list[int]) -> None:
+        for user_pk in user_pks:
+            pks = set(cache.get(timeline_key(user_pk), [])) | set(pin_pks)
+            cache.set(timeline_key(user_pk), sorted(pks, reverse=True)[:TIMELINE_LENGTH], TIMELINE_TTL)
+
+    def remove(self, user_pk: int, pin_pks: list[int]) -> None:
+        pks = cache.get(timeline_key(user_pk))
+        if pks is not None:
+            removed = set(pin_pks)
+            cache.set(timeline_key(user_pk), [pk for pk in pks if pk not in removed], TIMELINE_TTL)
+
+    def range(self, user_pk: int, before: int | None, count: int) -> list[int]:
+        pks = cache.get(timeline_key(user_pk), [])
+        return [pk for pk in pks if before is None or pk < before][:count]
+
+
+def get_store() -> RedisTimelineStore | CacheTimelineStore:
+    if settings.CACHES['default']['BACKEND'].startswith('django_redis'):
+        return RedisTimelineStore()
+    return CacheTimelineStore()
+
+
+def get_pulled_authors(user_pk: int) -> list[int]:
+    """Followed authors whose pins are not pushed into timelines."""
+    return list(
+        Follow.objects
+        .filter(follower_id=user_pk, following__followers_count__gt=FANOUT_FOLLOWERS_LIMIT)
+        .values_list('following_id', flat=True)
+    )
+
+
+def rebuild_timeline(user_pk: int) -> None:
+    """Fill an empty or expired timeline with the latest pins of followed authors."""
+    authors = Follow.objects.filter(
+        follower_id=user_pk, following__followers_count__lte=FANOUT_FOLLOWERS_LIMIT,
+    ).values('following_id')
+    pin_pks = list(
+        Pin.objects.filter(user_id__in=authors).order_by('-pk').values_list('pk', flat=True)[:TIMELINE_LENGTH]
+    )
+    get_store().push([user_pk], pin_pks)
+    cache.set(timeline_built_key(user_pk), True, TIMELINE_TTL)
+
+
+def fan_out_pin(pin_pk: int) -> None:
+    """Push a new pin into timelines of its author's followers."""
+    fan_out_pins([pin_pk])
+
+
+def fan_out_pins(pin_pks: list[int]) -> None:
+    """Push new pins into timelines of their authors' followers, one pass per author."""
+    authors = defaultdict(list)
+    pins = Pin.objects.filter(pk__in=pin_pks).values_list('pk', 'user_id', 'user__followers_count')
+    for pin_pk, author_pk, followers_count in pins:
+        if followers_count <= FANOUT_FOLLOWERS_LIMIT:
+            authors[author_pk].append(pin_pk)
+
+    store = get_store()
+    for author_pk, author_pin_pks in authors.items():
+        followers = (
+            Follow.objects.filter(following_id=author_pk)
+            .values_list('follower_id', flat=True)
+            .iterator(chunk_size=1000)
+        )
+
+        batch = []
+        for follower_pk in followers:
+            batch.append(follower_pk)
+            if len(batch) == 1000:
+                store.push(batch, author_pin_pks)
+                batch = []
+        store.push(batch, author_pin_pks)
+
+
+def add_author_to_timeline(user_pk: int, author_pk: int) -> None:
+    """Backfill recent pins of a newly followed author."""
+    if User.objects.filter(pk=author_pk, followers_count__gt=FANOUT_FOLLOWERS_LIMIT).exists():
+        return
+
+    pin_pks = Pin.objects.filter(user_id=author_pk).order_by('-pk').values_list('pk', flat=True)
+    get_store().push([user_pk], list(pin_pks[:TIMELINE_LENGTH]))
+
+
+def remove_author_from_timeline(user_pk: int, author_pk: int) -> None:
+    """Remove pins of an unfollowed author."""
+    pin_pks = Pin.objects.filter(user_id=author_pk).order_by('-pk').values_list('pk', flat=True)
+    get_store().remove(user_pk, list(pin_pks[:TIMELINE_LENGTH]))
+
+
+def get_following_page(user_pk: int, cursor: str | None = None,
+                       page_size: int = FEED_PAGE_SIZE) -> tuple[list[Pin], str | None]:
+    """
+    Return one page of pins from followed authors, newest first, and
+    a cursor for the next page. Pushed timeline is merged with pins
+    pulled from high fan-out authors.
+    """
+    try:
+        before = int(cursor) if cursor else None
+    except ValueError as e:
+        raise InvalidCursor(cursor) from e
+
+    if not cache.get(timeline_built_key(user_pk)):
+        rebuild_timeline(user_pk)
+
+    pin_pks = set(get_store().range(user_pk, before, page_size + 1))
+
+    pulled_authors = get_pulled_authors(user_pk)
+    if pulled_authors:
+        pulled = Pin.objects.filter(user_id__in=pulled_authors, is_public=True)
+        if before:
+            pulled = pulled.filter(pk__lt=before)
+        pin_pks.update(pulled.order_by('-pk').values_list('pk', flat=True)[:page_size + 1])
+
+    page_pks = sorted(pin_pks, reverse=True)[:page_size + 1]
+    next_cursor = str(page_pks[page_size - 1]) if len(page_pks) > page_size else None
+
+    # Deleted and private pins are skipped, they are not removed from timelines.
+    pins = Pin.objects.filter(is_public=True).in_bulk(page_pks[:page_size])
+    return [pins[pk] for pk in page_pks[:page_size] if pk in pins], next_cursor
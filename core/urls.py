@@ -2,5 +2,7 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
-    path("", views.Home.as_view(), name="home")
+    path("", views.Home.as_view(), name="home"),
+    path("feed/", views.FeedPage.as_view(), name="feed_page"),
+    path("metrics/", views.Metrics.as_view(), name="metrics"),
 ]
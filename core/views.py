@@ -1,9 +1,18 @@
+import os
 from typing import Any
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.urls import reverse_lazy
-from django.views.generic import TemplateView
+from urllib.parse import urlencode
+
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db.models.query import QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.template.loader import render_to_string
+from django.urls import reverse_lazy, reverse
+from django.views.generic import TemplateView, View
 
 from pins.models import Pin
+from .feed import InvalidCursor, get_feed_page
+from .instrumentation import aggregates
+from .timeline import get_following_page
 
 
 class Home(LoginRequiredMixin, TemplateView):
@@ -13,5 +22,98 @@ class Home(LoginRequiredMixin, TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context.setdefault('pins', Pin.objects.all())
+
+        # Render only the first screen, the rest is pulled by the grid.
+        pins, next_page_url = get_page(self.request)
+
+        context.setdefault('pins', pins)
+        context.setdefault('next_page_url', next_page_url)
+        context.setdefault('tab', self.request.GET.get('tab', 'all'))
         return context
+
+
+class FeedPage(LoginRequiredMixin, View):
+    """
+    Next page of the home feed. Returns an HTML fragment to be appended
+    into the masonry grid, or JSON if `?format=json` is given.
+    """
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        try:
+            pins, next_page_url = get_page(request, request.GET.get('cursor'))
+        except InvalidCursor:
+            return HttpResponseBadRequest("Invalid cursor.")
+
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'results': [
+                    {
+                        'id': pin.pk,
+                        'url': reverse('pin_detail', args=[pin.pk]),
+                        'file': pin.file.url,
+                        'type': pin.get_type(),
+                        'width': pin.width,
+                        'height': pin.height,
+                    } for pin in pins
+                ],
+                'next': next_page_url,
+            })
+
+        response = HttpResponse(render_to_string("feed_items.html", {'pins': pins}, request))
+        if next_page_url:
+            response['X-Next-Page'] = next_page_url
+        return response
+
+
+class Metrics(LoginRequiredMixin, UserPassesTestMixin, View):
+    """
+    Request metrics per URL name collected by `InstrumentationMiddleware`
+    in this process. Staff only, `?reset=1` starts over.
+    """
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def test_func(self) -> bool:
+        """Method from `UserPassesTestMixin`. Tests if user is staff."""
+        return self.request.user.is_staff
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        views = aggregates.snapshot()
+        if request.GET.get('reset'):
+            aggregates.reset()
+        return JsonResponse({'pid': os.getpid(), 'views': views})
+
+
+def get_feed_queryset(media_kind: str | None = None) -> QuerySet:
+    """All public pins, or only images/videos if `media_kind` is given."""
+    queryset = Pin.objects.filter(is_public=True)
+    if media_kind:
+        queryset = queryset.filter(media_kind=media_kind)
+    return queryset
+
+
+def get_page(request: HttpRequest, cursor: str | None = None) -> tuple[list[Pin], str | None]:
+    """
+    Page of the feed selected by `?tab=` (all pins or followed authors only)
+    and `?type=` query parameters, and the URL of the next one.
+    """
+    tab = request.GET.get('tab')
+    media_kind = request.GET.get('type')
+
+    if tab == 'following':
+        pins, next_cursor = get_following_page(request.user.pk, cursor)
+    else:
+        pins, next_cursor = get_feed_page(get_feed_queryset(media_kind), cursor)
+
+    return pins, get_next_page_url(next_cursor, tab=tab, type=media_kind)
+
+
+def get_next_page_url(cursor: str | None, **params) -> str | None:
+    if cursor is None:
+        return None
+
+    query = {'cursor': cursor}
+    query.update({name: value for name, value in params.items() if value})
+    return f"{reverse('feed_page')}?{urlencode(query)}"
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from . import models
+
+
+@admin.register(models.Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'run_at', 'updated_at']
+    list_filter = ['status', 'name']
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from jobs.queue import claim_jobs, execute, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued jobs. Keeps polling the queue until stopped, unless --once is given."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--once', action='store_true', help="Exit when the queue is empty.")
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument('--sleep', type=float, default=1.0, help="Seconds to wait when idle.")
+
+    def handle(self, *args, **options) -> None:
+        self.stdout.write("Waiting for jobs...")
+
+        while True:
+            close_old_connections()
+            requeue_stale_jobs()
+            jobs = claim_jobs(options['batch_size'])
+
+            for job in jobs:
+                ok = execute(job)
+                self.stdout.write(f"{job}: {'done' if ok else 'failed'}")
+
+            if not jobs:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
@@ -0,0 +1,130 @@
+import logging
+import traceback
+from datetime import timedelta
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+
+# 'database' stores jobs for `run_jobs` workers,
+# 'immediate' runs them in-process once the transaction commits.
+JOB_QUEUE_BACKEND = getattr(settings, 'JOB_QUEUE_BACKEND', 'database')
+JOB_MAX_ATTEMPTS = getattr(settings, 'JOB_MAX_ATTEMPTS', 5)
+JOB_RETRY_BACKOFF = getattr(settings, 'JOB_RETRY_BACKOFF', 30)
+JOB_TIMEOUT = getattr(settings, 'JOB_TIMEOUT', 10 * 60)
+
+logger = logging.getLogger(__name__)
+
+_tasks: dict[str, Callable[..., Any]] = {}
+
+
+class UnknownTask(LookupError):
+    """Raised when a job refers to a task that wasn't registered."""
+
+
+def task(name: str) -> Callable:
+    """
+    Register a function as a task which can be queued by `name`.
+    Payload is passed as keyword arguments, so it must be JSON-serializable.
+    """
+    def decorator(func: Callable) -> Callable:
+        _tasks[name] = func
+        return func
+    return decorator
+
+
+def get_task(name: str) -> Callable[..., Any]:
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise UnknownTask(name)
+
+
+def enqueue(name: str, *, delay: int = 0, max_attempts: int = JOB_MAX_ATTEMPTS,
+            **payload) -> Job | None:
+    """
+    Queue a task to be run out of the request.
+
+    With the database backend the job row is written in the current
+    transaction, so it becomes visible to workers only if it commits.
+    """
+    get_task(name)
+
+    if JOB_QUEUE_BACKEND == 'immediate':
+        transaction.on_commit(lambda: run_immediately(name, payload))
+        return None
+
+    return Job.objects.create(
+        name=name,
+        payload=payload,
+        max_attempts=max_attempts,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def run_immediately(name: str, payload: dict[str, Any]) -> None:
+    """Local fallback backend, used in tests and development."""
+    try:
+        get_task(name)(**payload)
+    except Exception:
+        logger.exception("Task %s failed.", name)
+
+
+def requeue_stale_jobs() -> int:
+    """Put back jobs of workers which died in the middle of running them."""
+    deadline = timezone.now() - timedelta(seconds=JOB_TIMEOUT)
+    return Job.objects.filter(status='running', updated_at__lt=deadline).update(status='queued')
+
+
+def claim_jobs(limit: int) -> list[Job]:
+    """
+    Lock and mark as running a batch of due jobs. Rows locked by other
+    workers are skipped, so several workers can poll the same table.
+    """
+    with transaction.atomic():
+        jobs = list(
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='queued', run_at__lte=timezone.now())
+            .order_by('run_at')[:limit]
+        )
+        Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status='running', attempts=F('attempts') + 1, updated_at=timezone.now(),
+        )
+
+    for job in jobs:
+        job.status = 'running'
+        job.attempts += 1
+    return jobs
+
+
+def execute(job: Job) -> bool:
+    """
+    Run claimed job. Failed jobs are retried with exponential backoff
+    and dead-lettered after `max_attempts`.
+    """
+    try:
+        get_task(job.name)(**job.payload)
+    except Exception as e:
+        job.last_error = traceback.format_exc()
+
+        # Unknown task won't become known by retrying.
+        if job.attempts >= job.max_attempts or isinstance(e, UnknownTask):
+            job.status = 'dead'
+            logger.error("Job %s is dead after %s attempts.", job, job.attempts)
+        else:
+            job.status = 'queued'
+            job.run_at = timezone.now() + timedelta(seconds=JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1))
+            logger.warning("Job %s failed, retrying at %s.", job, job.run_at)
+
+        job.save(update_fields=['status', 'run_at', 'last_error', 'updated_at'])
+        return False
+
+    job.status = 'done'
+    job.save(update_fields=['status', 'updated_at'])
+    return True
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class PinsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pins'
+
+    def ready(self) -> None:
+        from . import signals
+        return super().ready()
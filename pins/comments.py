@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db.models import Q, QuerySet
+
+from core.feed import decode_cursor, split_page
+from .models import Comment
+
+
+COMMENTS_PAGE_SIZE = getattr(settings, 'COMMENTS_PAGE_SIZE', 20)
+
+
+def get_comments_queryset(pin_pk: int, cursor: str | None, page_size: int) -> QuerySet:
+    """
+    Pin's comments after the cursor, oldest first, with authors and their
+    profiles joined in, and one extra row to find out if there is a next page.
+    """
+    queryset = (
+        Comment.objects.filter(pin_id=pin_pk)
+        .select_related('user__profile')
+        .order_by('date_created', 'id')
+    )
+
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(date_created__gt=created) | Q(date_created=created, id__gt=pk)
+        )
+    return queryset[:page_size + 1]
+
+
+def get_comments_page(pin_pk: int, cursor: str | None = None,
+                      page_size: int = COMMENTS_PAGE_SIZE) -> tuple[list[Comment], str | None]:
+    """
+    Return one page of pin's comments, oldest first, and a cursor for the
+    next page. Raises `InvalidCursor`.
+
+    Pages are located by keyset on `(date_created, id)`, served by
+    `comment_thread_idx`, so a page costs the same on any thread length.
+    """
+    return split_page(list(get_comments_queryset(pin_pk, cursor, page_size)), page_size)
+
+
+async def aget_comments_page(pin_pk: int, cursor: str | None = None,
+                             page_size: int = COMMENTS_PAGE_SIZE) -> tuple[list[Comment], str | None]:
+    """Async version of `get_comments_page`."""
+    comments = [comment async for comment in get_comments_queryset(pin_pk, cursor, page_size)]
+    return split_page(comments, page_size)
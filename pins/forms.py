@@ -1,6 +1,10 @@
+import re
+
+from django.core.exceptions import ValidationError
 from django.forms import ModelForm
 
-from .models import Pin, Comment
+from .models import Pin, Comment, PinUpload
+from .uploads import UPLOAD_MAX_SIZE
 from boards.models import Board
 
 
@@ -64,4 +68,27 @@ class CommentForm(ModelForm):
         super(CommentForm, self).__init__(*args, **kwargs)
         self.fields['text'].widget.attrs['placeholder'] = 'Add comment'
         for visible in self.visible_fields():
-            visible.field.widget.attrs['class'] = 'form-control rounded-pill border'
\ No newline at end of file
+            visible.field.widget.attrs['class'] = 'form-control rounded-pill border'
+
+
+class StartUploadForm(ModelForm):
+    """Pin fields and the declared file of a chunked upload, see `pins.uploads`."""
+    class Meta:
+        model = PinUpload
+        fields = ['board', 'title', 'description', 'filename', 'size', 'checksum']
+
+    def __init__(self, user, *args, **kwargs):
+        super(StartUploadForm, self).__init__(*args, **kwargs)
+        self.fields['board'].queryset = Board.objects.filter(user=user)
+
+    def clean_size(self) -> int:
+        size = self.cleaned_data['size']
+        if not 0 < size <= UPLOAD_MAX_SIZE:
+            raise ValidationError(f"File should be up to {UPLOAD_MAX_SIZE} bytes.")
+        return size
+
+    def clean_checksum(self) -> str:
+        checksum = self.cleaned_data['checksum'].lower()
+        if checksum and not re.fullmatch(r'[0-9a-f]{64}', checksum):
+            raise ValidationError("Checksum should be a hex SHA-256.")
+        return checksum
@@ -0,0 +1,142 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import transaction
+from django.dispatch import Signal
+from PIL import UnidentifiedImageError
+
+from boards.models import Board
+from core.renditions import generate_renditions
+from .media import detect_media_info
+from .models import Pin
+
+
+INGEST_WORKERS = getattr(settings, 'INGEST_WORKERS', 8)
+INGEST_CHUNK_SIZE = getattr(settings, 'INGEST_CHUNK_SIZE', 100)
+INGEST_MAX_FILE_SIZE = getattr(settings, 'INGEST_MAX_FILE_SIZE', 50 * 1024 * 1024)
+
+User = get_user_model()
+
+# Sent once per batch with inserted `pins`, `bulk_create` doesn't send `post_save`.
+pins_created = Signal()
+
+
+class IngestError(ValueError):
+    """Raised for an item which can't become a pin, message is reported back."""
+
+
+class IngestItem:
+    """
+    One pin to be imported. `ref` identifies it in results and checkpoints,
+    `open` returns its content as a `File`, it's called in a worker thread.
+    `error` rejects an item which couldn't be read from the input.
+    """
+
+    def __init__(self, ref: str, open: Callable[[], File] | None = None, title: str = '',
+                 description: str = '', board: int | str | None = None, error: str = '') -> None:
+        self.ref = ref
+        self.open = open
+        self.title = title
+        self.description = description
+        self.board = board
+        self.error = error
+
+
+def get_user_boards(user: User) -> dict[int | str, Board]:
+    """
+    User's boards by id, slug and title, items may refer to any of them.
+    Titles aren't unique, the oldest board with a title wins.
+    """
+    boards = {}
+    for board in Board.objects.filter(user=user).order_by('-pk'):
+        boards[board.pk] = boards[str(board.pk)] = boards[board.slug] = boards[board.title] = board
+    return boards
+
+
+def prepare_pin(item: IngestItem, user: User, board: Board) -> Pin:
+    """
+    Validate and store item's file, detect its media info and make renditions.
+    Runs in worker threads, so it must not touch the database.
+    """
+    with item.open() as file:
+        if file.size > INGEST_MAX_FILE_SIZE:
+            raise IngestError(f"File is larger than {INGEST_MAX_FILE_SIZE} bytes.")
+
+        info = detect_media_info(file)
+        if not info['media_kind']:
+            raise IngestError("Only images and videos can be pinned.")
+
+        pin = Pin(
+            user=user, board=board, **info,
+            title=(item.title or os.path.splitext(os.path.basename(file.name))[0])[:250],
+            description=item.description,
+        )
+        pin.file.save(os.path.basename(file.name), file, save=False)
+
+    try:
+        if pin.media_kind == 'image':
+            pin.renditions = generate_renditions(pin.file)
+    except (OSError, UnidentifiedImageError) as e:
+        pin.file.delete(save=False)
+        raise IngestError(f"Image can't be read: {e}")
+    return pin
+
+
+def ingest_pins(user: User, items: Iterable[IngestItem], default_board: int | str | None = None,
+                workers: int = INGEST_WORKERS, chunk_size: int = INGEST_CHUNK_SIZE) -> Iterator[list[dict[str, Any]]]:
+    """
+    Create pins of `user` from `items`, chunk by chunk. Files of a chunk are
+    processed by a thread pool, rows are inserted with one `bulk_create`.
+    Yields results of every chunk once it's committed:
+
+        [{"ref": "a.jpg", "status": "created", "pin": 12}, {"ref": "b.txt", "status": "error", "error": "..."}]
+    """
+    boards = get_user_boards(user)
+    items = iter(items)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while chunk := list(islice(items, chunk_size)):
+            results, futures, prepared = [None] * len(chunk), [], []
+
+            for index, item in enumerate(chunk):
+                board = boards.get(item.board if item.board is not None else default_board)
+                if item.error:
+                    results[index] = {'ref': item.ref, 'status': 'error', 'error': item.error}
+                elif board is None:
+                    results[index] = {'ref': item.ref, 'status': 'error', 'error': "Board was not found."}
+                else:
+                    futures.append((index, executor.submit(prepare_pin, item, user, board)))
+
+            for index, future in futures:
+                try:
+                    prepared.append((index, future.result()))
+                except (IngestError, OSError) as e:
+                    results[index] = {'ref': chunk[index].ref, 'status': 'error', 'error': str(e)}
+
+            save_pins([pin for index, pin in prepared])
+            for index, pin in prepared:
+                results[index] = {'ref': chunk[index].ref, 'status': 'created', 'pin': pin.pk}
+
+            yield results
+
+
+def save_pins(pins: list[Pin]) -> None:
+    """
+    Insert prepared pins at once. `bulk_create` skips `Pin.save` and signals,
+    so `pins_created` is sent for the whole batch instead, its receivers
+    update search, visibility, timelines and caches once per batch.
+    Stored files are removed if the insert fails.
+    """
+    try:
+        with transaction.atomic():
+            Pin.objects.bulk_create(pins)
+            pins_created.send(sender=Pin, pins=pins)
+    except Exception:
+        for pin in pins:
+            pin.file.delete(save=False)
+        raise
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from pins.media import detect_media_info
+from pins.models import Pin
+
+
+MEDIA_FIELDS = ['media_kind', 'mime_type', 'file_size', 'width', 'height']
+
+
+class Command(BaseCommand):
+    help = "Detect and store media kind, mime type, size and dimensions of existing pins."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Re-detect every pin, not only the ones without media kind.",
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options) -> None:
+        queryset = Pin.objects.only('pk', 'file', *MEDIA_FIELDS).order_by('pk')
+        if not options['all']:
+            queryset = queryset.filter(media_kind='')
+
+        batch, updated, failed = [], 0, 0
+
+        for pin in queryset.iterator(chunk_size=options['batch_size']):
+            try:
+                with pin.file.open('rb') as file:
+                    info = detect_media_info(file)
+            except OSError as e:
+                failed += 1
+                self.stderr.write(f"Pin {pin.pk}: {e}")
+                continue
+
+            for field, value in info.items():
+                setattr(pin, field, value)
+            batch.append(pin)
+
+            if len(batch) >= options['batch_size']:
+                updated += Pin.objects.bulk_update(batch, MEDIA_FIELDS)
+                batch = []
+
+        if batch:
+            updated += Pin.objects.bulk_update(batch, MEDIA_FIELDS)
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} pins, {failed} failed."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from pins.uploads import delete_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete chunked pin uploads which expired before being finalized, with their temporary files."
+
+    def handle(self, *args, **options) -> None:
+        deleted = delete_expired_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired uploads."))
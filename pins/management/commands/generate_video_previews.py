@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from pins import video
+from pins.models import Pin
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract poster frames and preview clips of existing video pins with ffmpeg. "
+        "New video pins get them in background jobs."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Regenerate pins which have a poster already, e.g. after a change of preview settings.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not video.is_available():
+            raise CommandError("ffmpeg and ffprobe should be installed.")
+
+        pins = Pin.objects.filter(media_kind='video')
+        if not options['all']:
+            pins = pins.filter(poster='')
+        else:
+            # Nothing to reuse from, every pin is processed again.
+            pins.update(poster='')
+
+        count = 0
+        for pin_pk in pins.order_by('pk').values_list('pk', flat=True).iterator():
+            video.update_video_preview(pin_pk)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{count} video pins processed."))
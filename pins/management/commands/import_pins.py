@@ -0,0 +1,102 @@
+import json
+import os
+from typing import Iterator
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from pins.ingest import INGEST_CHUNK_SIZE, INGEST_WORKERS, IngestItem, ingest_pins
+
+
+class Command(BaseCommand):
+    help = (
+        "Import pins of a user from a directory of files, or from an NDJSON manifest "
+        "with one {\"file\", \"title\", \"description\", \"board\"} object per line. "
+        "Imported files are recorded in a checkpoint, so an interrupted import can be resumed."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('path', help="Directory with files or a manifest file.")
+        parser.add_argument('--user', required=True, help="Username of pins' owner.")
+        parser.add_argument('--board', help="Board id, slug or title for items which don't specify one.")
+        parser.add_argument(
+            '--checkpoint',
+            help="File with refs of imported items, `.import_pins.checkpoint` next to the path by default.",
+        )
+        parser.add_argument('--workers', type=int, default=INGEST_WORKERS)
+        parser.add_argument('--chunk-size', type=int, default=INGEST_CHUNK_SIZE)
+
+    def handle(self, *args, **options) -> None:
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist.")
+
+        path = os.path.abspath(options['path'])
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist.")
+
+        root = path if os.path.isdir(path) else os.path.dirname(path)
+        checkpoint = options['checkpoint'] or os.path.join(root, '.import_pins.checkpoint')
+        done = self.read_checkpoint(checkpoint)
+
+        items = self.read_directory(path) if os.path.isdir(path) else self.read_manifest(path)
+        items = (item for item in items if item.ref not in done)
+
+        created = failed = 0
+        with open(checkpoint, 'a') as checkpoint_file:
+            for results in ingest_pins(user, items, options['board'], options['workers'], options['chunk_size']):
+                for result in results:
+                    if result['status'] == 'created':
+                        created += 1
+                        checkpoint_file.write(result['ref'] + '\n')
+                    else:
+                        failed += 1
+                        self.stderr.write(f"{result['ref']}: {result['error']}")
+
+                # Chunk is committed, make sure it won't be imported twice.
+                checkpoint_file.flush()
+                self.stdout.write(f"{created} imported, {failed} failed...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} pins, {failed} failed, {len(done)} skipped as already imported."
+        ))
+
+    def read_checkpoint(self, path: str) -> set[str]:
+        if not os.path.exists(path):
+            return set()
+        with open(path) as file:
+            return {line.rstrip('\n') for line in file if line.strip()}
+
+    def read_directory(self, root: str) -> Iterator[IngestItem]:
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.startswith('.'):
+                    continue
+                path = os.path.join(directory, filename)
+                yield IngestItem(os.path.relpath(path, root), self.opener(path))
+
+    def read_manifest(self, manifest: str) -> Iterator[IngestItem]:
+        root = os.path.dirname(manifest)
+
+        with open(manifest) as file:
+            for number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    ref = entry['file']
+                except (ValueError, KeyError, TypeError):
+                    raise CommandError(f"{manifest}:{number} should be an object with a `file` key.")
+
+                yield IngestItem(
+                    ref, self.opener(os.path.join(root, ref)),
+                    title=entry.get('title', ''),
+                    description=entry.get('description', ''),
+                    board=entry.get('board'),
+                )
+
+    def opener(self, path: str):
+        return lambda: File(open(path, 'rb'), name=os.path.basename(path))
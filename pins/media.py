@@ -0,0 +1,75 @@
+from mimetypes import guess_type
+from typing import Any
+
+from django.core.files import File
+from PIL import Image, UnidentifiedImageError
+
+
+# (offset, magic bytes, mime type) of the formats we accept as pins.
+SIGNATURES = [
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'BM', 'image/bmp'),
+    (8, b'WEBP', 'image/webp'),
+    # ISO-BMFF files share `ftyp`, the major brand after it tells images from videos.
+    (4, b'ftypheic', 'image/heic'),
+    (4, b'ftypheix', 'image/heic'),
+    (4, b'ftypmif1', 'image/heif'),
+    (4, b'ftypavif', 'image/avif'),
+    (4, b'ftypqt', 'video/quicktime'),
+    (4, b'ftyp', 'video/mp4'),
+    (0, b'\x1a\x45\xdf\xa3', 'video/webm'),
+    (8, b'AVI ', 'video/x-msvideo'),
+    (0, b'OggS', 'video/ogg'),
+]
+HEADER_SIZE = 32
+
+
+def sniff_mime_type(header: bytes) -> str | None:
+    """Detect mime type by the leading bytes of a file."""
+    for offset, magic, mime_type in SIGNATURES:
+        if header[offset:offset + len(magic)] == magic:
+            return mime_type
+    return None
+
+
+def get_media_kind(mime_type: str | None) -> str:
+    """Return 'image', 'video' or an empty string for other types."""
+    kind = (mime_type or '').split('/')[0]
+    return kind if kind in ('image', 'video') else ''
+
+
+def detect_media_info(file: File) -> dict[str, Any]:
+    """
+    Sniff the content of an uploaded or stored file once, returning
+    values for `Pin` media fields: kind, mime type, size and dimensions.
+    Only the header is read, the file is rewound afterwards.
+    """
+    file.seek(0)
+    mime_type = sniff_mime_type(file.read(HEADER_SIZE))
+    file.seek(0)
+
+    # Fall back to the extension for formats we have no signature for.
+    if mime_type is None:
+        mime_type = guess_type(file.name or '', strict=True)[0]
+
+    info = {
+        'media_kind': get_media_kind(mime_type),
+        'mime_type': mime_type or '',
+        'file_size': file.size,
+        'width': None,
+        'height': None,
+    }
+
+    if info['media_kind'] == 'image':
+        try:
+            # Pillow reads only the header until pixel data is requested.
+            with Image.open(file) as image:
+                info['width'], info['height'] = image.size
+        except (UnidentifiedImageError, OSError):
+            pass
+        file.seek(0)
+
+    return info
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0002_remove_pin_link'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pin',
+            index=models.Index(fields=['-date_created', '-id'], name='pin_feed_idx'),
+        ),
+    ]
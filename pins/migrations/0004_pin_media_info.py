@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0003_pin_feed_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pin',
+            name='file_size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pin',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='pin',
+            name='media_kind',
+            field=models.CharField(blank=True, choices=[('image', 'Image'), ('video', 'Video')], max_length=5),
+        ),
+        migrations.AddField(
+            model_name='pin',
+            name='mime_type',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='pin',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='pin',
+            index=models.Index(fields=['media_kind', '-date_created', '-id'], name='pin_kind_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 12:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0004_pin_media_info'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pin',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-17 12:09
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# GIN index can't be declared in `Meta.indexes` without breaking
+# migrations on SQLite, which is used in tests.
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS pin_search_idx ON pins_pin USING gin (search_vector)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS pin_search_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0005_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pin',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0006_pin_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pin',
+            index=models.Index(fields=['user', '-date_created', '-id'], name='pin_user_feed_idx'),
+        ),
+    ]
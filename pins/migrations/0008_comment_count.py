@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-17 12:23
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    Pin = apps.get_model('pins', 'Pin')
+    Comment = apps.get_model('pins', 'Comment')
+
+    Pin.objects.update(comment_count=Coalesce(Subquery(
+        Comment.objects.filter(pin=OuterRef('pk'))
+        .values('pin').annotate(total=Count('id')).values('total')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0007_pin_user_feed_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pin',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['pin', 'date_created', 'id'], name='comment_thread_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2 on 2026-10-17 12:29
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+def compute_visibility(apps, schema_editor):
+    Pin = apps.get_model('pins', 'Pin')
+    Board = apps.get_model('boards', 'Board')
+    Membership = Board.pins.through
+
+    Pin.objects.exclude(
+        Exists(Board.objects.filter(pk=OuterRef('board_id'), is_private=False))
+        | Exists(Membership.objects.filter(pin_id=OuterRef('pk'), board__is_private=False))
+    ).update(is_public=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0006_board_mosaic'),
+        ('pins', '0008_comment_count'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='pin',
+            name='pin_feed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='pin',
+            name='pin_kind_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='pin',
+            name='is_public',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(compute_visibility, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='pin',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-date_created', '-id'], name='pin_public_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pin',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['media_kind', '-date_created', '-id'], name='pin_public_kind_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-17 12:33
+
+import blobs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0009_pin_is_public'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pin',
+            name='file',
+            field=models.FileField(storage=blobs.storage.get_blob_storage, upload_to='pins'),
+        ),
+        migrations.AddIndex(
+            model_name='pin',
+            index=models.Index(fields=['file'], name='pin_file_idx'),
+        ),
+    ]
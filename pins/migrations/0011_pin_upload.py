@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-17 12:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0007_blob_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('pins', '0010_blob_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PinUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=250)),
+                ('description', models.TextField()),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('checksum', models.CharField(blank=True, max_length=64)),
+                ('offset', models.PositiveBigIntegerField(default=0, editable=False)),
+                ('expires_at', models.DateTimeField(db_index=True, editable=False)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pin_uploads', to='boards.board')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pin_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-17 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pins', '0011_pin_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pin',
+            name='duration',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pin',
+            name='poster',
+            field=models.ImageField(blank=True, editable=False, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='pin',
+            name='preview',
+            field=models.FileField(blank=True, editable=False, upload_to=''),
+        ),
+    ]
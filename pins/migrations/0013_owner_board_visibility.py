@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-17 18:05
+
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+
+def compute_visibility(apps, schema_editor):
+    """Pins were made public by public boards of other users too, count owner's boards only."""
+    Pin = apps.get_model('pins', 'Pin')
+    Board = apps.get_model('boards', 'Board')
+    Membership = Board.pins.through
+
+    visible = (
+        Exists(Board.objects.filter(pk=OuterRef('board_id'), user_id=OuterRef('user_id'), is_private=False))
+        | Exists(Membership.objects.filter(
+            pin_id=OuterRef('pk'), board__user_id=OuterRef('user_id'), board__is_private=False,
+        ))
+    )
+    Pin.objects.filter(is_public=True).exclude(visible).update(is_public=False)
+    Pin.objects.filter(is_public=False).filter(visible).update(is_public=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards', '0007_blob_storage'),
+        ('pins', '0012_video_preview'),
+    ]
+
+    operations = [
+        migrations.RunPython(compute_visibility, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,27 @@
+import logging
+import uuid
+
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
 from mimetypes import guess_type
+from PIL import UnidentifiedImageError
 
+from blobs.storage import get_blob_storage
 from boards.models import Board
+from core.renditions import generate_renditions
+from .media import detect_media_info
 
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+MEDIA_KIND_CHOICES = [
+    ('image', 'Image'),
+    ('video', 'Video'),
+]
+
 
 class Pin(models.Model):
     user = models.ForeignKey(
@@ -15,17 +30,88 @@ class Pin(models.Model):
     board = models.ForeignKey(
         Board, on_delete=models.CASCADE, related_name='boards'
     )
-    file = models.FileField(upload_to='pins')
+    file = models.FileField(upload_to='pins', storage=get_blob_storage)
     title = models.CharField(max_length=250)
     # link = models.CharField(max_length=250)
     description = models.TextField()
     date_created = models.DateTimeField(auto_now_add=True)
 
+    # Detected once from file content on upload, see `pins.media`.
+    media_kind = models.CharField(max_length=5, choices=MEDIA_KIND_CHOICES, blank=True)
+    mime_type = models.CharField(max_length=100, blank=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    # Resized copies and blur placeholder, see `core.renditions`.
+    renditions = models.JSONField(default=dict, blank=True)
+    # Poster frame and short preview clip of videos, made in a job, see `pins.video`.
+    poster = models.ImageField(blank=True, editable=False)
+    preview = models.FileField(blank=True, editable=False)
+    duration = models.FloatField(null=True, blank=True, editable=False)
+    # Kept up to date on save, see `search.index`.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Denormalized, kept up to date by signals, see `pins.signals`.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # False when all boards of the pin are private, see `pins.visibility`.
+    is_public = models.BooleanField(default=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # User's own pins in the API, paginated by a cursor.
+            models.Index(fields=['user', '-date_created', '-id'], name='pin_user_feed_idx'),
+            # Keyset indexes of the public feed and API, with and without
+            # a media kind filter. Private pins are never listed there.
+            models.Index(fields=['-date_created', '-id'], condition=models.Q(is_public=True),
+                         name='pin_public_feed_idx'),
+            models.Index(fields=['media_kind', '-date_created', '-id'], condition=models.Q(is_public=True),
+                         name='pin_public_kind_feed_idx'),
+            # Pins sharing a blob, see `blobs.storage`.
+            models.Index(fields=['file'], name='pin_file_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs) -> None:
+        # Newly uploaded file hasn't been written to storage yet.
+        is_new_file = self.file and not self.file._committed
+        if is_new_file:
+            self.update_media_info()
+
+        super().save(*args, **kwargs)
+
+        if is_new_file:
+            self.update_renditions()
+
+    def update_media_info(self) -> None:
+        """Fill media fields by sniffing the file content."""
+        for field, value in detect_media_info(self.file).items():
+            setattr(self, field, value)
+
+    def update_renditions(self) -> None:
+        """Generate resized copies of an image pin."""
+        if self.media_kind != 'image':
+            return
+
+        # Same content uploaded before already has renditions, see `blobs.storage`.
+        renditions = (Pin.objects.filter(file=self.file.name).exclude(pk=self.pk)
+                      .exclude(renditions={}).values_list('renditions', flat=True).first())
+        if not renditions:
+            try:
+                renditions = generate_renditions(self.file)
+            except (OSError, UnidentifiedImageError) as e:
+                # Looks like an image but doesn't decode, the original is shown as is.
+                logger.warning("Can't make renditions of pin %s: %s", self.pk, e)
+                return
+        self.renditions = renditions
+        Pin.objects.filter(pk=self.pk).update(renditions=self.renditions)
+
     def get_type(self):
-        file_type = guess_type(self.file.url, strict=True)[0]
+        if self.media_kind:
+            return self.media_kind
+
+        # Pins that weren't backfilled yet, see `backfill_media_info` command.
+        file_type = guess_type(self.file.name, strict=True)[0] or ''
         # file_type might be ('video/mp4', None) or ('image/jpeg..etc', None)
         if 'video' in file_type:
             return 'video'
@@ -39,6 +125,33 @@ class Comment(models.Model):
     text = models.CharField(max_length=250)
     date_created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keyset index for pages of a pin's comments, see `pins.comments`.
+            models.Index(fields=['pin', 'date_created', 'id'], name='comment_thread_idx'),
+        ]
+
     def __str__(self):
         return f'{self.user} says {self.text}'
 
+
+class PinUpload(models.Model):
+    """
+    Pin file being uploaded in chunks, see `pins.uploads`. Content is appended
+    to a temporary file, the pin is created once all of it has arrived.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='pin_uploads')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='pin_uploads')
+    title = models.CharField(max_length=250)
+    description = models.TextField()
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    # Optional hex SHA-256 of the whole file, checked before the pin is created.
+    checksum = models.CharField(max_length=64, blank=True)
+    # Bytes received so far, the next chunk must start here.
+    offset = models.PositiveBigIntegerField(default=0, editable=False)
+    expires_at = models.DateTimeField(db_index=True, editable=False)
+
+    def __str__(self):
+        return f'{self.filename} ({self.offset}/{self.size})'
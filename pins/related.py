@@ -0,0 +1,75 @@
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from boards.models import Board
+from .models import Pin
+
+
+RELATED_PINS_LIMIT = getattr(settings, 'RELATED_PINS_LIMIT', 120)
+RELATED_PINS_PAGE_SIZE = getattr(settings, 'RELATED_PINS_PAGE_SIZE', 18)
+RELATED_PINS_TTL = getattr(settings, 'RELATED_PINS_TTL', 60 * 60)
+
+# `Board.pins` through table, holds (board_id, pin_id) rows.
+Membership = Board.pins.through
+
+
+def related_pins_key(pin_pk: int) -> str:
+    return f"related_pins:{pin_pk}"
+
+
+def get_related_pin_ids(pin_pk: int) -> list[int]:
+    """
+    Return ids of pins sharing at least one board with given pin,
+    most shared boards first. Ranking is done by a single grouped query
+    over the through table and the result is cached per pin.
+    """
+    key = related_pins_key(pin_pk)
+    pin_ids = cache.get(key)
+
+    if pin_ids is None:
+        boards = Membership.objects.filter(pin_id=pin_pk).values('board_id')
+        ranked = (
+            Membership.objects
+            .filter(board_id__in=boards)
+            .exclude(pin_id=pin_pk)
+            .values('pin_id')
+            .annotate(shared=Count('board_id'))
+            .order_by('-shared', '-pin_id')
+        )
+        pin_ids = [row['pin_id'] for row in ranked[:RELATED_PINS_LIMIT]]
+        cache.set(key, pin_ids, RELATED_PINS_TTL)
+
+    return pin_ids
+
+
+def get_related_pins(pin_pk: int, page: int = 1,
+                     page_size: int = RELATED_PINS_PAGE_SIZE) -> tuple[list[Pin], bool]:
+    """
+    Return one page of related pins, and whether there is a next page.
+    """
+    pin_ids = get_related_pin_ids(pin_pk)
+    start = (page - 1) * page_size
+    page_ids = pin_ids[start:start + page_size]
+
+    # Keep the ranking order, skip pins removed or made private since the list was cached.
+    pins = Pin.objects.filter(is_public=True).in_bulk(page_ids)
+    return [pins[pk] for pk in page_ids if pk in pins], len(pin_ids) > start + page_size
+
+
+def invalidate_related_pins(board_pks: Iterable[int] = (), pin_pks: Iterable[int] = ()) -> None:
+    """
+    Drop cached related pins of every pin in given boards, and of given pins.
+    Called whenever board membership changes.
+    """
+    pin_pks = set(pin_pks)
+    board_pks = list(board_pks)
+
+    if board_pks:
+        pin_pks.update(
+            Membership.objects.filter(board_id__in=board_pks).values_list('pin_id', flat=True)
+        )
+
+    cache.delete_many([related_pins_key(pk) for pk in pin_pks])
@@ -0,0 +1,98 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from boards.models import Board
+from jobs.queue import enqueue
+from .ingest import pins_created
+from .models import Pin, Comment
+from .related import Membership, invalidate_related_pins
+from .visibility import update_board_visibility, update_pins_visibility
+
+
+@receiver(m2m_changed, sender=Board.pins.through)
+def board_membership_changed(sender, instance: Board | Pin, action: str,
+                             reverse: bool, pk_set: set | None, **kwargs) -> None:
+    """Invalidate related pins of everything sharing a board with changed pins."""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        # `board.pins` was changed, `pk_set` holds pin ids.
+        invalidate_related_pins(board_pks=[instance.pk], pin_pks=pk_set or ())
+    else:
+        # `pin.pins` was changed, `pk_set` holds board ids.
+        board_pks = pk_set
+        if action == 'pre_clear':
+            board_pks = Membership.objects.filter(pin_id=instance.pk).values_list('board_id', flat=True)
+        invalidate_related_pins(board_pks=board_pks, pin_pks=[instance.pk])
+
+
+@receiver(pre_delete, sender=Board)
+def board_deleted(sender, instance: Board, **kwargs) -> None:
+    """Membership rows are removed by cascade, which doesn't send `m2m_changed`."""
+    invalidate_related_pins(board_pks=[instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance: Comment, created: bool, **kwargs) -> None:
+    """Increment denormalized comment counter of the pin."""
+    if created:
+        Pin.objects.filter(pk=instance.pin_id).update(comment_count=F('comment_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance: Comment, **kwargs) -> None:
+    """Decrement the counter. Also sent for comments removed by cascade."""
+    Pin.objects.filter(pk=instance.pin_id, comment_count__gt=0).update(comment_count=F('comment_count') - 1)
+
+
+@receiver(m2m_changed, sender=Board.pins.through)
+def membership_visibility_changed(sender, instance: Board | Pin, action: str,
+                                  reverse: bool, pk_set: set | None, **kwargs) -> None:
+    """Pin's visibility depends on privacy of boards it's saved into, see `pins.visibility`."""
+    if action == 'pre_clear' and not reverse:
+        instance._cleared_pin_pks = list(
+            Membership.objects.filter(board_id=instance.pk).values_list('pin_id', flat=True)
+        )
+    elif action in ('post_add', 'post_remove'):
+        update_pins_visibility([instance.pk] if reverse else pk_set)
+    elif action == 'post_clear':
+        update_pins_visibility([instance.pk] if reverse else getattr(instance, '_cleared_pin_pks', []))
+
+
+@receiver(post_save, sender=Board)
+def board_privacy_changed(sender, instance: Board, created: bool, update_fields=None, **kwargs) -> None:
+    # New board has no pins yet.
+    if created or (update_fields is not None and 'is_private' not in update_fields):
+        return
+    update_board_visibility(instance.pk)
+
+
+@receiver(pre_delete, sender=Board)
+def board_visibility_deleted(sender, instance: Board, **kwargs) -> None:
+    """Pins saved into a deleted board may be left in private boards only."""
+    pin_pks = list(Membership.objects.filter(board_id=instance.pk).values_list('pin_id', flat=True))
+    transaction.on_commit(lambda: update_pins_visibility(pin_pks))
+
+
+@receiver(post_save, sender=Pin)
+def pin_board_changed(sender, instance: Pin, created: bool, update_fields=None, **kwargs) -> None:
+    if created or update_fields is None or 'board' in update_fields:
+        update_pins_visibility([instance.pk])
+
+
+@receiver(post_save, sender=Pin)
+def video_pin_created(sender, instance: Pin, created: bool, **kwargs) -> None:
+    """Poster and preview are extracted out of the request."""
+    if created and instance.media_kind == 'video':
+        enqueue('pins.update_video_preview', pin_pk=instance.pk)
+
+
+@receiver(pins_created, sender=Pin)
+def pins_bulk_created(sender, pins: list[Pin], **kwargs) -> None:
+    update_pins_visibility([pin.pk for pin in pins])
+    for pin in pins:
+        if pin.media_kind == 'video':
+            enqueue('pins.update_video_preview', pin_pk=pin.pk)
@@ -0,0 +1,7 @@
+from jobs.queue import task
+from . import video
+
+
+@task('pins.update_video_preview')
+def update_video_preview(pin_pk: int) -> None:
+    video.update_video_preview(pin_pk)
@@ -0,0 +1,197 @@
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+from typing import BinaryIO
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Pin, PinUpload
+
+
+# Temporary files of unfinished uploads. Kept out of MEDIA_ROOT, which is served publicly.
+UPLOAD_DIR = getattr(settings, 'UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'uploads'))
+UPLOAD_CHUNK_SIZE = getattr(settings, 'UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)
+UPLOAD_MAX_SIZE = getattr(settings, 'UPLOAD_MAX_SIZE', 2 * 1024 * 1024 * 1024)
+# Seconds an upload may stay idle before `clean_uploads` removes it.
+UPLOAD_EXPIRY = getattr(settings, 'UPLOAD_EXPIRY', 24 * 60 * 60)
+
+READ_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    """Raised for a chunk or upload which can't be accepted, message is reported back."""
+
+
+class OffsetMismatch(UploadError):
+    """Chunk doesn't start where the received content ends, client should resume from `offset`."""
+
+    def __init__(self, offset: int) -> None:
+        super().__init__(f"Upload continues at offset {offset}.")
+        self.offset = offset
+
+
+def get_upload_path(upload: PinUpload) -> str:
+    return os.path.join(UPLOAD_DIR, f"{upload.pk}.part")
+
+
+def get_expiry():
+    return timezone.now() + timedelta(seconds=UPLOAD_EXPIRY)
+
+
+def start_upload(upload: PinUpload) -> PinUpload:
+    """Save a validated upload and create its empty temporary file."""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    upload.expires_at = get_expiry()
+    upload.save()
+    open(get_upload_path(upload), 'wb').close()
+    return upload
+
+
+def lock_upload(upload_pk, user) -> PinUpload:
+    """
+    User's unexpired upload, locked until the transaction ends so chunks
+    and finalization of one upload never run at once.
+    """
+    upload = PinUpload.objects.select_for_update().filter(
+        pk=upload_pk, user=user, expires_at__gt=timezone.now()
+    ).first()
+    if upload is None:
+        raise PinUpload.DoesNotExist
+    return upload
+
+
+def copy_chunk(stream: BinaryIO, file: BinaryIO, length: int) -> str:
+    """Copy `length` bytes piece by piece, return their hex SHA-256."""
+    digest = hashlib.sha256()
+    remaining = length
+    while remaining:
+        data = stream.read(min(READ_SIZE, remaining))
+        if not data:
+            raise UploadError("Chunk is shorter than its Content-Length.")
+        digest.update(data)
+        file.write(data)
+        remaining -= len(data)
+    return digest.hexdigest()
+
+
+def append_chunk(upload_pk, user, offset: int, stream: BinaryIO, length: int, checksum: str = '') -> PinUpload:
+    """
+    Append a chunk read from `stream` to the upload's temporary file.
+
+    The chunk must start at the current offset, concurrent or repeated
+    chunks get `OffsetMismatch`. A chunk that's cut short or doesn't match
+    `checksum` (hex SHA-256) is discarded whole, the offset stays put.
+
+    The chunk is received into a file of its own first, the upload is
+    locked only to append it, so a slow client holds no transaction.
+    """
+    if length > UPLOAD_CHUNK_SIZE:
+        raise UploadError(f"Chunks should be at most {UPLOAD_CHUNK_SIZE} bytes.")
+
+    # Fail early, before reading the chunk, rechecked under the lock.
+    upload = PinUpload.objects.filter(pk=upload_pk, user=user, expires_at__gt=timezone.now()).first()
+    if upload is None:
+        raise PinUpload.DoesNotExist
+    check_chunk(upload, offset, length)
+
+    with tempfile.TemporaryFile(dir=UPLOAD_DIR) as chunk:
+        digest = copy_chunk(stream, chunk, length)
+        if checksum and checksum.lower() != digest:
+            raise UploadError("Chunk checksum doesn't match.")
+        chunk.seek(0)
+
+        with transaction.atomic():
+            upload = lock_upload(upload_pk, user)
+            check_chunk(upload, offset, length)
+
+            with open(get_upload_path(upload), 'r+b') as file:
+                # Leftovers of a chunk which failed mid-way are dropped.
+                file.truncate(offset)
+                file.seek(offset)
+                try:
+                    copy_chunk(chunk, file, length)
+                except BaseException:
+                    file.truncate(offset)
+                    raise
+
+            upload.offset = offset + length
+            upload.expires_at = get_expiry()
+            upload.save(update_fields=['offset', 'expires_at'])
+    return upload
+
+
+def check_chunk(upload: PinUpload, offset: int, length: int) -> None:
+    if offset != upload.offset:
+        raise OffsetMismatch(upload.offset)
+    if offset + length > upload.size:
+        raise UploadError("Chunk goes past the declared size.")
+
+
+def get_file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for data in iter(lambda: file.read(READ_SIZE), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def finish_upload(upload_pk, user) -> Pin:
+    """
+    Turn a complete upload into a pin. The temporary file is streamed
+    into storage, then removed with the upload.
+    """
+    with transaction.atomic():
+        upload = lock_upload(upload_pk, user)
+        if upload.offset != upload.size:
+            raise OffsetMismatch(upload.offset)
+
+        path = get_upload_path(upload)
+        if upload.checksum and upload.checksum.lower() != get_file_checksum(path):
+            raise UploadError("File checksum doesn't match.")
+
+        with open(path, 'rb') as content:
+            pin = Pin(user=upload.user, board=upload.board, title=upload.title,
+                      description=upload.description, file=File(content, name=upload.filename))
+            pin.update_media_info()
+            if not pin.media_kind:
+                raise UploadError("Only images and videos can be pinned.")
+            pin.save()
+
+        delete_upload(upload)
+    return pin
+
+
+def delete_upload(upload: PinUpload) -> None:
+    path = get_upload_path(upload)
+    upload.delete()
+    # Content must survive until it's certain the pin was committed.
+    transaction.on_commit(lambda: remove_file(path))
+
+
+def remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def delete_expired_uploads() -> int:
+    """
+    Remove uploads nobody continued in time with their temporary files,
+    and temporary files left without an upload. Returns the number of uploads.
+    """
+    expired = list(PinUpload.objects.filter(expires_at__lte=timezone.now()))
+    for upload in expired:
+        delete_upload(upload)
+
+    if os.path.isdir(UPLOAD_DIR):
+        cutoff = timezone.now().timestamp() - UPLOAD_EXPIRY
+        active = {f"{pk}.part" for pk in PinUpload.objects.values_list('pk', flat=True)}
+        for entry in os.scandir(UPLOAD_DIR):
+            if entry.name not in active and entry.stat().st_mtime < cutoff:
+                remove_file(entry.path)
+    return len(expired)
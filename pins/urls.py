@@ -10,10 +10,15 @@ CACHE_TTL = getattr(settings, 'CACHE_TTL', DEFAULT_TIMEOUT)
 
 urlpatterns = [
     path("create/", views.CreatePinView.as_view(), name="create_pin"),
+    path("uploads/", views.StartUploadView.as_view(), name="start_pin_upload"),
+    path("uploads/<uuid:pk>", views.UploadView.as_view(), name="pin_upload"),
+    path("uploads/<uuid:pk>/finalize", views.FinishUploadView.as_view(), name="finish_pin_upload"),
     path('<str:username>/created/', views.CreatedPins.as_view(), name='created_pins'),
     path("edit/<int:pk>", views.EditPinView.as_view(), name="edit_pin"),
     path("delete/<int:pk>", views.DeletePinView.as_view(), name="delete_pin"),
     path("<int:pk>", cache_page(CACHE_TTL)(views.DetailPinView.as_view()), name="pin_detail"),
+    path("<int:pk>/related", views.RelatedPinsView.as_view(), name="related_pins"),
+    path("<int:pk>/comments", views.CommentsView.as_view(), name="pin_comments"),
     path("comment/<int:pk>", views.CreateCommentView.as_view(), name="add_comment"),
     path("comment_remove/<int:pk>", views.DeleteCommentView.as_view(), name="delete_comment"),
 ]
\ No newline at end of file
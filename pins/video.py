@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Any
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from .models import Pin
+
+
+# Local tools making posters and previews. Without them video pins keep
+# showing the original file, deferred until it's on screen.
+FFMPEG = getattr(settings, 'FFMPEG', None) or shutil.which('ffmpeg')
+FFPROBE = getattr(settings, 'FFPROBE', None) or shutil.which('ffprobe')
+FFMPEG_TIMEOUT = getattr(settings, 'FFMPEG_TIMEOUT', 5 * 60)
+
+VIDEO_POSTER_WIDTH = getattr(settings, 'VIDEO_POSTER_WIDTH', 640)
+VIDEO_PREVIEW_WIDTH = getattr(settings, 'VIDEO_PREVIEW_WIDTH', 320)
+VIDEO_PREVIEW_SECONDS = getattr(settings, 'VIDEO_PREVIEW_SECONDS', 3)
+VIDEO_PREVIEW_BITRATE = getattr(settings, 'VIDEO_PREVIEW_BITRATE', '250k')
+
+VIDEO_FIELDS = ['poster', 'preview', 'duration', 'width', 'height']
+
+logger = logging.getLogger(__name__)
+
+
+def is_available() -> bool:
+    return bool(FFMPEG and FFPROBE)
+
+
+def get_preview_name(name: str, filename: str) -> str:
+    """`pins/clip.mp4` -> `pins/clip_renditions/poster.jpg`, next to image renditions."""
+    base, _ = os.path.splitext(name)
+    return f"{base}_renditions/{filename}"
+
+
+def get_even_width(width: int) -> str:
+    """Scale filter width: at most `width`, never upscaled, even for H.264."""
+    return f"trunc(min({width},iw)/2)*2"
+
+
+def run(*args: str) -> str:
+    return subprocess.run(args, check=True, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT).stdout
+
+
+def probe(path: str) -> dict[str, Any]:
+    """Dimensions of the first video stream and duration in seconds."""
+    output = json.loads(run(
+        FFPROBE, '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height:format=duration', '-of', 'json', path,
+    ))
+    stream = (output.get('streams') or [{}])[0]
+    duration = output.get('format', {}).get('duration')
+    return {
+        'width': stream.get('width'),
+        'height': stream.get('height'),
+        'duration': float(duration) if duration not in (None, 'N/A') else None,
+    }
+
+
+def extract_poster(path: str, output: str, at: float) -> None:
+    run(FFMPEG, '-v', 'error', '-y', '-ss', f'{at:.3f}', '-i', path, '-frames:v', '1',
+        '-vf', f"scale={get_even_width(VIDEO_POSTER_WIDTH)}:-2", '-q:v', '4', output)
+
+
+def make_preview(path: str, output: str) -> None:
+    """Short silent clip with a low bitrate, small enough to autoplay in the grid."""
+    run(FFMPEG, '-v', 'error', '-y', '-i', path, '-t', str(VIDEO_PREVIEW_SECONDS), '-an',
+        '-vf', f"scale={get_even_width(VIDEO_PREVIEW_WIDTH)}:-2",
+        '-c:v', 'libx264', '-preset', 'veryfast', '-b:v', VIDEO_PREVIEW_BITRATE,
+        '-maxrate', VIDEO_PREVIEW_BITRATE, '-bufsize', VIDEO_PREVIEW_BITRATE,
+        '-pix_fmt', 'yuv420p', '-movflags', '+faststart', output)
+
+
+def store(path: str, name: str) -> str:
+    # Regenerating must overwrite, not get a suffixed name.
+    default_storage.delete(name)
+    with open(path, 'rb') as content:
+        return default_storage.save(name, File(content))
+
+
+def update_video_preview(pin_pk: int) -> None:
+    """
+    Extract a poster frame and a preview clip of a video pin and store them
+    with the video's dimensions and duration. Pins sharing the file with
+    an already processed pin reuse its results.
+    """
+    pin = Pin.objects.filter(pk=pin_pk, media_kind='video').only('pk', 'file', *VIDEO_FIELDS).first()
+    if pin is None:
+        return
+
+    done = (Pin.objects.filter(file=pin.file.name).exclude(pk=pin.pk).exclude(poster='')
+            .values(*VIDEO_FIELDS).first())
+    if done:
+        for field, value in done.items():
+            setattr(pin, field, value)
+        pin.save(update_fields=VIDEO_FIELDS)
+        return
+
+    if not is_available():
+        logger.warning("ffmpeg isn't installed, video pin %s has no poster.", pin.pk)
+        return
+
+    source = pin.file.path
+    info = probe(source)
+    with tempfile.TemporaryDirectory() as tmp:
+        poster, preview = os.path.join(tmp, 'poster.jpg'), os.path.join(tmp, 'preview.mp4')
+        # A bit into the video, first frames are often black.
+        extract_poster(source, poster, min(1.0, (info['duration'] or 0) / 2))
+        make_preview(source, preview)
+
+        pin.poster = store(poster, get_preview_name(pin.file.name, 'poster.jpg'))
+        pin.preview = store(preview, get_preview_name(pin.file.name, 'preview.mp4'))
+
+    pin.width, pin.height, pin.duration = info['width'], info['height'], info['duration']
+    pin.save(update_fields=VIDEO_FIELDS)
@@ -1,16 +1,26 @@
 from typing import Any, Dict
+from uuid import UUID
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import HttpResponse, Http404, HttpRequest
-from django.shortcuts import redirect
+from django.db.models import QuerySet
+from django.http import HttpResponse, HttpResponseBadRequest, Http404, HttpRequest, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy, reverse
-from django.views.generic import CreateView, UpdateView, DeleteView, DetailView
+from django.utils import timezone
+from django.views.generic import CreateView, UpdateView, DeleteView, DetailView, View
 
-from .forms import CreatePinForm, EditPinForm, SaveToBoard, CommentForm
-from .models import Pin, Comment
+from .comments import get_comments_page
+from .forms import CreatePinForm, EditPinForm, SaveToBoard, CommentForm, StartUploadForm
+from .models import Pin, Comment, PinUpload
+from .related import get_related_pins
+from .visibility import get_visible_pins
+from .uploads import (UPLOAD_CHUNK_SIZE, OffsetMismatch, UploadError, append_chunk, delete_upload,
+                      finish_upload, start_upload)
 from boards.forms import CreateBoardForm
-from boards.models import Board
+from accounts.follows import is_following
 from accounts.models import Profile
+from core.feed import InvalidCursor
 
 
 User = get_user_model()
@@ -37,6 +47,100 @@ class CreatePinView(LoginRequiredMixin, CreateView):
         form.instance.user = self.request.user
         return super().form_valid(form)
     
+class StartUploadView(LoginRequiredMixin, View):
+    """
+    Start a chunked upload, for pin files too large for one request.
+
+    POST pin fields with the file's `filename`, `size` and optional
+    `checksum` (hex SHA-256). Then PUT consecutive chunks to the returned
+    `url` with an `Upload-Offset` header and optional `Upload-Checksum:
+    sha256 <hex>`, and POST to `finalize_url` to create the pin. After
+    a failure, GET the `url` to learn the offset to resume from.
+    """
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def post(self, request: HttpRequest) -> HttpResponse:
+        form = StartUploadForm(request.user, request.POST)
+        if not form.is_valid():
+            return JsonResponse({"message": "Invalid upload.", "errors": form.errors}, status=400)
+
+        form.instance.user = request.user
+        return JsonResponse(get_upload_state(start_upload(form.instance)), status=201)
+
+
+class UploadView(LoginRequiredMixin, View):
+    """State of a chunked upload, appending its chunks and cancelling it."""
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def get(self, request: HttpRequest, pk: UUID) -> HttpResponse:
+        upload = get_object_or_404(PinUpload, pk=pk, user=request.user, expires_at__gt=timezone.now())
+        response = JsonResponse(get_upload_state(upload))
+        response['Upload-Offset'] = upload.offset
+        return response
+
+    def put(self, request: HttpRequest, pk: UUID) -> HttpResponse:
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return JsonResponse({"message": "Upload-Offset and Content-Length headers are required."}, status=400)
+
+        algorithm, _, checksum = request.headers.get('Upload-Checksum', '').partition(' ')
+        if algorithm and algorithm.lower() != 'sha256':
+            return JsonResponse({"message": "Only sha256 checksums are supported."}, status=400)
+
+        try:
+            # The request is read as a stream, the chunk is never held in memory.
+            upload = append_chunk(pk, request.user, offset, request, length, checksum.strip())
+        except PinUpload.DoesNotExist:
+            raise Http404
+        except OffsetMismatch as e:
+            response = JsonResponse({"message": str(e), "offset": e.offset}, status=409)
+            response['Upload-Offset'] = e.offset
+            return response
+        except UploadError as e:
+            return JsonResponse({"message": str(e)}, status=400)
+
+        response = HttpResponse(status=204)
+        response['Upload-Offset'] = upload.offset
+        return response
+
+    def delete(self, request: HttpRequest, pk: UUID) -> HttpResponse:
+        delete_upload(get_object_or_404(PinUpload, pk=pk, user=request.user))
+        return HttpResponse(status=204)
+
+
+class FinishUploadView(LoginRequiredMixin, View):
+    """Create the pin of a complete chunked upload."""
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def post(self, request: HttpRequest, pk: UUID) -> HttpResponse:
+        try:
+            pin = finish_upload(pk, request.user)
+        except PinUpload.DoesNotExist:
+            raise Http404
+        except OffsetMismatch as e:
+            return JsonResponse({"message": str(e), "offset": e.offset}, status=409)
+        except UploadError as e:
+            return JsonResponse({"message": str(e)}, status=400)
+        return JsonResponse({"pin": pin.pk, "url": reverse("pin_detail", args=[pin.pk])}, status=201)
+
+
+def get_upload_state(upload: PinUpload) -> dict[str, Any]:
+    return {
+        "id": str(upload.pk),
+        "offset": upload.offset,
+        "size": upload.size,
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+        "expires_at": upload.expires_at.isoformat(),
+        "url": reverse("pin_upload", args=[upload.pk]),
+        "finalize_url": reverse("finish_pin_upload", args=[upload.pk]),
+    }
+
+
 class EditPinView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     model = Pin
     form_class = EditPinForm
@@ -81,53 +185,85 @@ class DeletePinView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return redirect(self.get_success_url())
  
 class DetailPinView(LoginRequiredMixin, DetailView):
-    model = Pin
     template_name = "detail_pin.html"
     redirect_field_name = "next"
     login_url = reverse_lazy("login")
+
+    def get_queryset(self) -> QuerySet:
+        """Private pins are shown to their owners only."""
+        return get_visible_pins(self.request.user).select_related('user__profile', 'board')
     
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context =  super().get_context_data(**kwargs)
-        pin = self.model.objects.get(pk=self.kwargs['pk'])
-        is_following = self.request.user.followers.filter(following=pin.user).first()
+        pin = self.object
+        following = is_following(self.request.user, pin.user)
+        related_pins, has_next = get_related_pins(pin.pk)
+        comments, comments_cursor = get_comments_page(pin.pk)
 
         new_context = {
             'pin' : pin,
             'save_to_board_form': SaveToBoard(self.request.user, instance=pin),
             'edit_form' : EditPinForm(self.request.user, instance=pin),
             'comment_form' : CommentForm(),
-            'is_following' : is_following,
-            'related_pins' : self.get_related_pins(self.kwargs['pk'])
+            'is_following' : following,
+            'related_pins' : related_pins,
+            'related_next_url' : get_related_page_url(pin.pk, 2) if has_next else None,
+            'comments' : comments,
+            'comments_next_url' : get_comments_page_url(pin.pk, comments_cursor) if comments_cursor else None,
         }
 
         context.update(new_context)
 
         return context
-    
-    def get_related_pins(self, pin_pk: int) -> set:
-        related_pins = []
-        boards = Board.objects.filter().all() 
-
-        # Get all boards that contains the current pin.
-        related_board = [
-            board for board in boards if board.pins.filter(id=pin_pk).first()
-        ] 
-
-        # Get all pins in related boards,
-        # The output may be a nested list of queryset objects.
-        related_pins_lists = [board.pins.all() for board in related_board]
-
-        # Make one list out of nested lists of pins.
-        for i in range(len(related_pins_lists)):
-            for p in related_pins_lists[i]:
-                related_pins.append(p)
-
-        # Remove current pin from related pins.
-        for pin in related_pins:
-            if pin.id == pin_pk:
-                related_pins.remove(pin) 
-        
-        return set(related_pins)
+
+
+class RelatedPinsView(LoginRequiredMixin, View):
+    """Next page of the "More like this" strip, as an HTML fragment."""
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def get(self, request: HttpRequest, pk: int) -> HttpResponse:
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid page.")
+
+        related_pins, has_next = get_related_pins(pk, page)
+        response = HttpResponse(
+            render_to_string("related_pins.html", {'related_pins': related_pins}, request)
+        )
+        if has_next:
+            response['X-Next-Page'] = get_related_page_url(pk, page + 1)
+        return response
+
+
+def get_related_page_url(pin_pk: int, page: int) -> str:
+    return f"{reverse('related_pins', args=[pin_pk])}?page={page}"
+
+
+class CommentsView(LoginRequiredMixin, View):
+    """Next page of pin's comments, as an HTML fragment."""
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def get(self, request: HttpRequest, pk: int) -> HttpResponse:
+        # Comments of other users' private pins are hidden with the pins.
+        get_object_or_404(get_visible_pins(request.user), pk=pk)
+        try:
+            comments, cursor = get_comments_page(pk, request.GET.get('cursor'))
+        except InvalidCursor:
+            return HttpResponseBadRequest("Invalid cursor.")
+
+        response = HttpResponse(
+            render_to_string("comments.html", {'comments': comments}, request)
+        )
+        if cursor:
+            response['X-Next-Page'] = get_comments_page_url(pk, cursor)
+        return response
+
+
+def get_comments_page_url(pin_pk: int, cursor: str) -> str:
+    return f"{reverse('pin_comments', args=[pin_pk])}?cursor={cursor}"
        
 
 class CreatedPins(LoginRequiredMixin, DetailView):
@@ -145,9 +281,11 @@ class CreatedPins(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         user = self.get_object().user
         pins = user.pin_user.all()
+        if user != self.request.user:
+            pins = pins.filter(is_public=True)
 
         new_context = {
-            'is_following': self.request.user.followers.filter(following=user).first(),
+            'is_following': is_following(self.request.user, user),
             'create_board_form': CreateBoardForm(),
             'created_pins': pins,
         }
@@ -169,10 +307,7 @@ class CreateCommentView(LoginRequiredMixin, CreateView):
     def form_valid(self, form: CommentForm) -> HttpResponse:
         comment = form.save(commit=False)
         comment.user = self.request.user
-        try:
-            comment.pin = Pin.objects.get(pk=self.kwargs.get("pk"))
-        except Pin.DoesNotExist:
-            return Http404
+        comment.pin = get_object_or_404(get_visible_pins(self.request.user), pk=self.kwargs.get("pk"))
         comment.save()
         return super().form_valid(form)
     
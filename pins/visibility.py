@@ -0,0 +1,67 @@
+from typing import Iterable
+
+from django.db.models import Exists, F, OuterRef, Q, QuerySet
+from django.dispatch import Signal
+
+from boards.models import Board
+from .models import Pin
+
+
+Membership = Board.pins.through
+
+# Sent with `pin_pks` whose `is_public` flag was flipped, `update()` doesn't send `post_save`.
+visibility_changed = Signal()
+
+
+def get_visibility_expression() -> Exists:
+    """
+    Pin is public unless all its owner's boards holding it are private: the
+    board it was created in and every board the owner saved it into. Boards
+    of other users don't count, saving a pin mustn't publish it.
+    """
+    return (
+        Exists(Board.objects.filter(pk=OuterRef('board_id'), user_id=OuterRef('user_id'), is_private=False))
+        | Exists(Membership.objects.filter(
+            pin_id=OuterRef('pk'), board__user_id=OuterRef('user_id'), board__is_private=False,
+        ))
+    )
+
+
+def get_visible_pins(user) -> QuerySet:
+    """Pins `user` may see and save: public ones and their own."""
+    if user.is_authenticated:
+        return Pin.objects.filter(Q(is_public=True) | Q(user=user))
+    return Pin.objects.filter(is_public=True)
+
+
+def update_visibility(pins: QuerySet) -> list[int]:
+    """
+    Recompute `is_public` of `pins`, write only flags which changed
+    and return ids of those pins.
+    """
+    changed = list(
+        pins.annotate(visible=get_visibility_expression())
+        .exclude(is_public=F('visible'))
+        .values_list('pk', 'visible')
+    )
+
+    for visible in (True, False):
+        pks = [pk for pk, value in changed if value == visible]
+        if pks:
+            Pin.objects.filter(pk__in=pks).update(is_public=visible)
+
+    pin_pks = [pk for pk, visible in changed]
+    if pin_pks:
+        visibility_changed.send(sender=Pin, pin_pks=pin_pks)
+    return pin_pks
+
+
+def update_pins_visibility(pin_pks: Iterable[int]) -> list[int]:
+    return update_visibility(Pin.objects.filter(pk__in=list(pin_pks)))
+
+
+def update_board_visibility(board_pk: int) -> list[int]:
+    """Pins created in the board or saved into it, after its privacy changed."""
+    return update_visibility(Pin.objects.filter(
+        Q(board_id=board_pk) | Q(pk__in=Membership.objects.filter(board_id=board_pk).values('pin_id'))
+    ))
@@ -53,11 +53,15 @@ INSTALLED_APPS = [
     'pins.apps.PinsConfig',
     'restapi.apps.RestapiConfig',
     'apiauth.apps.ApiauthConfig',
+    'jobs.apps.JobsConfig',
+    'search.apps.SearchConfig',
+    'blobs.apps.BlobsConfig',
     'rest_framework',
     'rest_framework.authtoken',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -116,12 +120,49 @@ CACHES = {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": "redis://redis:6379/1/",
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # Default client, which also counts hits and misses for request metrics.
+            "CLIENT_CLASS": "core.instrumentation.InstrumentedRedisClient",
         },
         "KEY_PREFIX": "pinterest",
-    }
+    },
+    # Per-process cache for short-lived hot data, such as API tokens.
+    'local': {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "pinterest-local",
+    },
 }
 CACHE_TTL = 90
+# Bulk pin import, see `pins.ingest`: files processed in parallel and pins inserted at once.
+INGEST_WORKERS = 8
+INGEST_CHUNK_SIZE = 100
+
+# API objects cached by `restapi.cache`, invalidated on change.
+OBJECT_CACHE_TTL = 60 * 60 * 6
+
+# Pins rendered per home feed page.
+FEED_PAGE_SIZE = 30
+
+# "Following" feed: pins kept per user timeline in Redis, and the number of
+# followers above which author's pins are pulled on read instead of pushed.
+TIMELINE_LENGTH = 800
+FANOUT_FOLLOWERS_LIMIT = 5000
+
+# Full-text search results per page and PostgreSQL text search configuration.
+SEARCH_PAGE_SIZE = 30
+SEARCH_CONFIG = 'english'
+
+# Request instrumentation, see `core.middleware`. Budgets are limits per URL name
+# ('*' applies to every view): 'queries', 'duplicates', 'sql_time' and 'total_time' in ms.
+# Exceeded budgets are logged, or raised with 'raise' action to fail tests.
+SERVER_TIMING = True
+REQUEST_BUDGETS = {
+    '*': {'queries': 50, 'duplicates': 10, 'total_time': 1000},
+    'home': {'queries': 10},
+    'feed_page': {'queries': 10},
+    'pin_detail': {'queries': 25},
+    'profile': {'queries': 25},
+}
+REQUEST_BUDGET_ACTION = os.environ.get("REQUEST_BUDGET_ACTION", 'log')
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -169,6 +210,18 @@ STATICFILES_DIRS = [
 MEDIA_ROOT = os.path.join(BASE_DIR, "mediafiles")
 MEDIA_URL = "/media/"
 
+# Pin files and board covers are stored once per content, see `blobs.storage`.
+# Unreferenced blobs are kept for BLOB_GC_GRACE seconds before `gc_blobs` deletes them.
+BLOB_GC_GRACE = 24 * 60 * 60
+# Chunked pin uploads, see `pins.uploads`: temporary files (outside MEDIA_ROOT), limits in bytes
+# and seconds an idle upload is kept before `clean_uploads` deletes it.
+UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+UPLOAD_EXPIRY = 24 * 60 * 60
+# Perceptual hashes of image blobs for near-duplicate lookups, see `blobs.phash`.
+BLOB_PHASH = os.environ.get("BLOB_PHASH", '') == '1'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -178,8 +231,16 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'apiauth.authentication.ExpiringTokenAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS' : 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS' : 'restapi.pagination.CursorPagination',
     'PAGE_SIZE' : 20,
 }
 
 TOKEN_EXPIRED_AFTER_SECONDS = 86400
+TOKEN_CACHE_TTL = 60
+TOKEN_LOCAL_CACHE_TTL = 5
+
+# Background jobs, run by `python manage.py run_jobs`.
+# Set to 'immediate' to run them in-process instead (tests, development).
+JOB_QUEUE_BACKEND = os.environ.get("JOB_QUEUE_BACKEND", 'database')
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BACKOFF = 30
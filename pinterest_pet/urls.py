@@ -26,6 +26,7 @@ urlpatterns = [
     path('accounts/', include('accounts.urls')),
     path('pin/', include("pins.urls")),
     path('board/', include("boards.urls")),
+    path('search/', include("search.urls")),
     path('api/', include(router.urls)),
     path('api/', include("restapi.urls")),
 
@@ -0,0 +1,194 @@
+from typing import Any
+
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import QuerySet
+from django.http import Http404, HttpRequest, HttpResponseBase, JsonResponse
+from django.views import View
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from accounts.models import Profile
+from apiauth.authentication import aauthenticate
+from core.feed import InvalidCursor, aget_feed_page
+from pins.comments import aget_comments_page
+from pins.models import Pin
+from pins.visibility import get_visible_pins
+from .cache import aget_cached_entry, cached_json_response, get_variant, link_page
+from .pagination import CursorPagination
+from .planning import plan_queryset
+from .serializers import CommentSerializer, PinSerializer, ProfileSerializer
+
+
+class AsyncReadView(View):
+    """
+    Read-only JSON endpoint for ASGI workers. Database and cache calls are
+    awaited, so a request waiting on them or on a slow client holds no
+    worker thread.
+
+    DRF views can't be async, so authentication, paging and errors follow
+    the DRF endpoints by hand. Output and cache entries are the same.
+    """
+    # Anonymous requests get 401, like with `IsAuthenticated`.
+    login_required = True
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        try:
+            user = await aauthenticate(request)
+        except AuthenticationFailed as e:
+            return self.error(str(e.detail), 401)
+
+        # Replaces the lazy session user, which can't be loaded in async code.
+        request.user = user or AnonymousUser()
+        if self.login_required and user is None:
+            return self.error("Authentication credentials were not provided.", 401)
+
+        try:
+            return await self.read(request, *args, **kwargs)
+        except Http404:
+            return self.error("Not found.", 404)
+        except InvalidCursor:
+            return JsonResponse({"message": "Invalid cursor."}, status=400)
+
+    async def read(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        raise NotImplementedError
+
+    def error(self, detail: str, status: int) -> JsonResponse:
+        response = JsonResponse({"detail": detail}, status=status)
+        if status == 401:
+            response['WWW-Authenticate'] = 'Token'
+        return response
+
+    def get_context(self, request: HttpRequest) -> dict[str, Any]:
+        return {'request': request}
+
+    def get_page_size(self, request: HttpRequest) -> int:
+        """`?page_size=`, limited like `CursorPagination`."""
+        try:
+            page_size = int(request.GET['page_size'])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+        return max(1, min(page_size, CursorPagination.max_page_size))
+
+    def get_next_url(self, request: HttpRequest, cursor: str | None) -> str | None:
+        return replace_query_param(request.build_absolute_uri(), 'cursor', cursor) if cursor else None
+
+
+def get_public_pins(request: HttpRequest) -> QuerySet:
+    """Public pins, filtered by `?type=image|video` like `AllPinsViewset.get_queryset`."""
+    queryset = Pin.objects.filter(is_public=True)
+    media_kind = request.GET.get('type')
+    if media_kind:
+        queryset = queryset.filter(media_kind=media_kind)
+    return queryset
+
+
+class PinListView(AsyncReadView):
+    """
+    Async `AllPinsViewset.list`: public pins, newest first, filtered by
+    `?type=image|video`. Paginated by `?cursor=`, taken from the `next` link.
+    """
+    login_required = False
+
+    async def read(self, request: HttpRequest) -> HttpResponseBase:
+        queryset = get_public_pins(request)
+
+        # Cursors are made of the last pin's keyset.
+        queryset = plan_queryset(queryset, PinSerializer(context=self.get_context(request)), ('date_created',))
+        pins, cursor = await aget_feed_page(queryset, request.GET.get('cursor'), self.get_page_size(request))
+
+        return JsonResponse({
+            "next": self.get_next_url(request, cursor),
+            "results": PinSerializer(pins, many=True, context=self.get_context(request)).data,
+        })
+
+
+class PinDetailView(AsyncReadView):
+    """Async `AllPinsViewset.retrieve`, served from the object cache."""
+    login_required = False
+
+    async def read(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        # Cached entries aren't filtered by `?type=`, so the pin is looked up first.
+        queryset = get_public_pins(request)
+        if not await queryset.filter(pk=pk).aexists():
+            raise Http404
+
+        async def build() -> dict:
+            pin = await plan_queryset(queryset, PinSerializer(context=self.get_context(request))).filter(pk=pk).afirst()
+            if pin is None:
+                raise Http404
+            return PinSerializer(pin, context=self.get_context(request)).data
+
+        entry = await aget_cached_entry('pin', pk, get_variant(request, PinSerializer.__name__, 'public'), build)
+        return cached_json_response(request, entry)
+
+
+class ProfileListView(AsyncReadView):
+    """Async `ProfileViewset.list`, by id. Paginated by `?cursor=`, taken from the `next` link."""
+
+    async def read(self, request: HttpRequest) -> HttpResponseBase:
+        queryset = plan_queryset(Profile.objects.order_by('pk'), ProfileSerializer(context=self.get_context(request)))
+
+        cursor = request.GET.get('cursor')
+        if cursor:
+            if not cursor.isdigit():
+                raise InvalidCursor(cursor)
+            queryset = queryset.filter(pk__gt=int(cursor))
+
+        # One extra row tells if there is a next page.
+        page_size = self.get_page_size(request)
+        profiles = [profile async for profile in queryset[:page_size + 1]]
+        next_cursor = str(profiles[page_size - 1].pk) if len(profiles) > page_size else None
+
+        return JsonResponse({
+            "next": self.get_next_url(request, next_cursor),
+            "results": ProfileSerializer(profiles[:page_size], many=True, context=self.get_context(request)).data,
+        })
+
+
+class ProfileDetailView(AsyncReadView):
+    """Async `ProfileViewset.retrieve`, served from the object cache."""
+
+    async def read(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        async def build() -> dict:
+            queryset = plan_queryset(Profile.objects.all(), ProfileSerializer(context=self.get_context(request)))
+            profile = await queryset.filter(pk=pk).afirst()
+            if profile is None:
+                raise Http404
+            return ProfileSerializer(profile, context=self.get_context(request)).data
+
+        entry = await aget_cached_entry('profile', pk, get_variant(request, ProfileSerializer.__name__, 'public'), build)
+        return cached_json_response(request, entry)
+
+
+class CommentListView(AsyncReadView):
+    """
+    Async `CommentPin.get`: pin's comments, oldest first, with their total
+    `count`. Paginated by `?cursor=`, taken from the `next` link.
+    """
+
+    async def read(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        # Checked before the cache, entries are shared by all users who may see the pin.
+        if not await get_visible_pins(request.user).filter(pk=pk).aexists():
+            raise Http404
+
+        cursor = request.GET.get('cursor')
+
+        async def build() -> dict:
+            pin = await Pin.objects.filter(pk=pk).values('comment_count').afirst()
+            if pin is None:
+                raise Http404
+            comments, next_cursor = await aget_comments_page(pk, cursor)
+            return {
+                "count": pin['comment_count'],
+                "next_cursor": next_cursor,
+                "results": CommentSerializer(comments, many=True, context=self.get_context(request)).data,
+            }
+
+        entry = await aget_cached_entry(
+            'pin-comments', pk,
+            f"{get_variant(request, CommentSerializer.__name__, 'public')}:cursor-{cursor or ''}",
+            build,
+        )
+        next_url = self.get_next_url(request, entry['data']['next_cursor'])
+        return cached_json_response(request, link_page(entry, next_url))
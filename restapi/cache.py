@@ -0,0 +1,191 @@
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import Http404, HttpRequest, HttpResponseBase, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .serializers import get_requested_fields
+
+
+# Entries are invalidated on change, so they can live long.
+OBJECT_CACHE_TTL = getattr(settings, 'OBJECT_CACHE_TTL', 60 * 60 * 6)
+
+
+def version_key(namespace: str, pk: Any) -> str:
+    return f"object:{namespace}:{pk}:version"
+
+
+def get_version(namespace: str, pk: Any) -> int:
+    key = version_key(namespace, pk)
+    version = cache.get(key)
+
+    if version is None:
+        # Start from the current time, not 1, so an evicted version
+        # never brings back entries cached before the eviction.
+        cache.add(key, time.time_ns() // 1000, None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(namespace: str, pk: Any) -> int:
+    """Async version of `get_version`."""
+    key = version_key(namespace, pk)
+    version = await cache.aget(key)
+
+    if version is None:
+        await cache.aadd(key, time.time_ns() // 1000, None)
+        version = await cache.aget(key)
+    return version
+
+
+def make_entry(data: Any) -> dict[str, Any]:
+    return {
+        'data': data,
+        'etag': hashlib.md5(json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder).encode()).hexdigest(),
+        'modified': int(time.time()),
+    }
+
+
+def get_cached_entry(namespace: str, pk: Any, variant: str, build: Callable[[], Any]) -> dict[str, Any]:
+    """
+    Return data cached for the current version of an object, or build and
+    cache it. `variant` tells apart representations of the same object.
+    Entry also holds data's fingerprint and build time, to answer
+    conditional requests.
+    """
+    key = f"object:{namespace}:{pk}:{get_version(namespace, pk)}:{variant}"
+    entry = cache.get(key)
+
+    if entry is None:
+        entry = make_entry(build())
+        cache.set(key, entry, OBJECT_CACHE_TTL)
+    return entry
+
+
+async def aget_cached_entry(namespace: str, pk: Any, variant: str,
+                            build: Callable[[], Awaitable[Any]]) -> dict[str, Any]:
+    """Async version of `get_cached_entry`, sharing its entries."""
+    key = f"object:{namespace}:{pk}:{await aget_version(namespace, pk)}:{variant}"
+    entry = await cache.aget(key)
+
+    if entry is None:
+        entry = make_entry(await build())
+        await cache.aset(key, entry, OBJECT_CACHE_TTL)
+    return entry
+
+
+def get_variant(request: Request, name: str, scope: str) -> str:
+    """
+    Public entries are shared by every user allowed to see them,
+    per-user ones are kept apart by user id. Sparse fieldsets
+    (`?fields=`) are cached separately too.
+    """
+    # Serialized file URLs are absolute, they depend on the host.
+    variant = f"{name}:{request.get_host()}"
+    if scope == 'user':
+        variant += f":user-{request.user.pk}"
+
+    fields = get_requested_fields(request)
+    if fields is not None:
+        variant += f":fields-{','.join(sorted(fields))}"
+    return variant
+
+
+def link_page(entry: dict[str, Any], next_url: str | None) -> dict[str, Any]:
+    """
+    Entry of a cached page with its `next_cursor` turned into a `next` link.
+    Links depend on the requested URL, so they are built per request and
+    a page cached by one endpoint doesn't point clients to another.
+    """
+    page = dict(entry['data'])
+    page.pop('next_cursor')
+    return {**entry, 'data': {"count": page.pop('count'), "next": next_url, **page}}
+
+
+def cached_response(request: Request, entry: dict[str, Any]) -> HttpResponseBase:
+    """
+    Response with cached data, or 304 if client's copy matches
+    `If-None-Match`/`If-Modified-Since`.
+    """
+    return add_validators(request, Response(entry['data']), entry)
+
+
+def cached_json_response(request: HttpRequest, entry: dict[str, Any]) -> HttpResponseBase:
+    """`cached_response` for plain Django views, which have no DRF renderers."""
+    return add_validators(request, JsonResponse(entry['data'], safe=False), entry)
+
+
+def add_validators(request: HttpRequest, response: HttpResponseBase, entry: dict[str, Any]) -> HttpResponseBase:
+    """Set validators and cache headers of an entry, answering 304 when they match."""
+    response['ETag'] = quote_etag(entry['etag'])
+    response['Last-Modified'] = http_date(entry['modified'])
+
+    # Responses depend on credentials, must never be shared by proxies
+    # and should be revalidated with the validators above.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization', 'Cookie'])
+
+    return get_conditional_response(
+        request, etag=response['ETag'], last_modified=entry['modified'], response=response,
+    )
+
+
+def invalidate(namespace: str, pks: Iterable[Any]) -> None:
+    """
+    Bump versions of objects, so their cached data is never read again.
+    Done after commit, otherwise a concurrent request could cache
+    the old rows under the new version.
+    """
+    pks = list(pks)
+
+    def bump() -> None:
+        for pk in pks:
+            try:
+                cache.incr(version_key(namespace, pk))
+            except ValueError:
+                # No version yet, so nothing was cached either.
+                pass
+
+    transaction.on_commit(bump)
+
+
+class CachedRetrieveMixin:
+    """
+    Serve `retrieve` of a viewset from the object cache, with `ETag` and
+    `Last-Modified` validators. Entries are invalidated by signals,
+    see `restapi.signals`.
+
+    Permissions are checked before `retrieve` is called. With 'public'
+    `cache_scope` an object is cached once for every user, use 'user'
+    when the queryset or representation depends on request user.
+    Entries aren't kept per query parameter, so the object is looked up
+    in the filtered queryset before an entry is served.
+    """
+    cache_namespace: str
+    cache_scope = 'public'
+
+    def retrieve(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            exists = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: pk}).exists()
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup, like in `get_object_or_404` of DRF.
+            exists = False
+        if not exists:
+            raise Http404
+        entry = get_cached_entry(
+            self.cache_namespace, pk,
+            get_variant(request, self.get_serializer_class().__name__, self.cache_scope),
+            lambda: self.get_serializer(self.get_object()).data,
+        )
+        return cached_response(request, entry)
@@ -0,0 +1,102 @@
+import http.client
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from rest_framework.authtoken.models import Token
+
+from accounts.models import Profile
+from pins.models import Pin
+
+
+# Read endpoints served by both paths, as (WSGI path, async path).
+ENDPOINTS = {
+    'pins list': ('/api/pins/', '/api/async/pins/'),
+    'pin detail': ('/api/pins/{pin}/', '/api/async/pins/{pin}/'),
+    'profiles list': ('/api/profile/', '/api/async/profile/'),
+    'profile detail': ('/api/profile/{profile}/', '/api/async/profile/{profile}/'),
+    'comments': ('/api/comment-pin/{pin}/', '/api/async/comment-pin/{pin}/'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the read endpoints of the DRF (WSGI) API against their async (ASGI) "
+        "versions on running servers, reporting throughput and latency percentiles."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--wsgi-url', default='http://localhost:1337',
+                            help="Server of the DRF endpoints.")
+        parser.add_argument('--asgi-url', default='http://localhost:1337',
+                            help="Server of `/api/async/` endpoints, nginx routes both by default.")
+        parser.add_argument('--user', required=True, help="Username whose API token authenticates requests.")
+        parser.add_argument('--requests', type=int, default=1000, help="Requests per endpoint and path.")
+        parser.add_argument('--concurrency', type=int, default=50, help="Clients sending requests at once.")
+        parser.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+
+    def handle(self, *args, **options) -> None:
+        user = get_user_model().objects.filter(username=options['user']).first()
+        if user is None:
+            raise CommandError(f"User {options['user']} doesn't exist.")
+        token = Token.objects.get_or_create(user=user)[0].key
+
+        pin = Pin.objects.filter(is_public=True).order_by('-comment_count').values_list('pk', flat=True).first()
+        profile = Profile.objects.values_list('pk', flat=True).first()
+        if pin is None or profile is None:
+            raise CommandError("There should be a public pin and a profile to request.")
+
+        self.stdout.write(
+            f"{options['requests']} requests per endpoint, {options['concurrency']} concurrent clients.\n"
+            f"{'endpoint':<16}{'path':<7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}"
+        )
+        for name in options['endpoints']:
+            for label, base, path in [('wsgi', options['wsgi_url'], ENDPOINTS[name][0]),
+                                      ('async', options['asgi_url'], ENDPOINTS[name][1])]:
+                url = base.rstrip('/') + path.format(pin=pin, profile=profile)
+                rate, timings, errors = self.load(url, token, options['requests'], options['concurrency'])
+                self.stdout.write(
+                    f"{name:<16}{label:<7}{rate:>9.1f}{self.percentile(timings, 50):>9.1f}"
+                    f"{self.percentile(timings, 95):>9.1f}{self.percentile(timings, 99):>9.1f}{errors:>8}"
+                )
+
+    def load(self, url: str, token: str, requests: int, concurrency: int) -> tuple[float, list[float], int]:
+        """
+        Send `requests` GETs from `concurrency` threads, each keeping its own
+        connection alive. Returns requests per second, latencies in ms and
+        the number of failed requests.
+        """
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else '')
+        headers = {'Authorization': f"Token {token}"}
+        local = threading.local()
+
+        def request(_) -> float | None:
+            if not hasattr(local, 'connection'):
+                local.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            start = perf_counter()
+            try:
+                local.connection.request('GET', path, headers=headers)
+                response = local.connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                local.connection.close()
+                del local.connection
+                return None
+            return (perf_counter() - start) * 1000 if response.status == 200 else None
+
+        start = perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            results = list(executor.map(request, range(requests)))
+        elapsed = perf_counter() - start
+
+        timings = sorted(result for result in results if result is not None)
+        return len(timings) / elapsed, timings, len(results) - len(timings)
+
+    def percentile(self, timings: list[float], percent: int) -> float:
+        if not timings:
+            return 0.0
+        return timings[min(len(timings) - 1, len(timings) * percent // 100)]
@@ -0,0 +1,77 @@
+import json
+from collections import OrderedDict
+
+from django.db import connections
+from django.db.models.query import QuerySet
+from rest_framework import pagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Row count from PostgreSQL statistics instead of `COUNT(*)`: table's
+    `reltuples` when the queryset isn't filtered, planner's estimate otherwise.
+    Other databases count exactly.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            estimate = cursor.fetchone()[0]
+            # -1 means the table was never analyzed.
+            if estimate >= 0:
+                return estimate
+
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CursorPagination(pagination.CursorPagination):
+    """
+    Keyset pagination, every page costs the same however deep it is.
+    Total count is left out, unless asked for by `?count=exact`
+    or the cheaper `?count=approx`.
+
+    `ordering` must match an index, see `Meta.indexes` of the models.
+    """
+    ordering = '-id'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list | None:
+        mode = request.query_params.get(self.count_query_param)
+
+        self.count = None
+        if mode == 'exact':
+            self.count = queryset.count()
+        elif mode == 'approx':
+            self.count = estimate_count(queryset)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: list) -> Response:
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = OrderedDict([('count', self.count), *response.data.items()])
+        return response
+
+
+class PinCursorPagination(CursorPagination):
+    ordering = ('-date_created', '-id')
+
+
+class ProfileCursorPagination(CursorPagination):
+    ordering = 'id'
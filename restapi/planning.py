@@ -0,0 +1,114 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.db.models.query import QuerySet
+from rest_framework import permissions, serializers
+from rest_framework.request import Request
+
+
+def get_related_columns(field: serializers.Field) -> list[str] | None:
+    """
+    Columns of the related model a relational field reads,
+    `None` if it may read the whole related object.
+    """
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # Served from the foreign key column, see `use_pk_only_optimization`.
+        return []
+    if isinstance(field, serializers.SlugRelatedField):
+        return [field.slug_field.replace('.', '__')]
+    return None
+
+
+def plan_queryset(queryset: QuerySet, serializer: serializers.Serializer, extra: tuple[str, ...] = ()) -> QuerySet:
+    """
+    Load what `serializer` outputs in a constant number of queries:
+    forward relations are joined with `select_related`, many-to-many
+    and reverse ones are prefetched, and columns nobody reads are
+    deferred with `only()`.
+
+    Fields which aren't model fields (methods, properties) declare columns
+    they read in `Meta.field_dependencies`, otherwise nothing is deferred.
+    Serializers may narrow prefetched relations by defining
+    `get_related_queryset(name, queryset)`.
+    `extra` columns are loaded too, e.g. ones read by pagination.
+    """
+    model = queryset.model
+    dependencies = getattr(serializer.Meta, 'field_dependencies', {})
+
+    only, select_related, prefetch_related = {model._meta.pk.name, *extra}, set(), []
+    defer_columns = True
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in dependencies:
+            only.update(dependencies[name])
+            continue
+
+        try:
+            source = field.source_attrs[0] if field.source != '*' else None
+            model_field = model._meta.pk if source == 'pk' else source and model._meta.get_field(source)
+        except FieldDoesNotExist:
+            model_field = None
+
+        if model_field is None:
+            defer_columns = False
+
+        elif model_field.many_to_many or model_field.one_to_many:
+            child = field.child_relation if isinstance(field, serializers.ManyRelatedField) else field
+            columns = get_related_columns(child)
+            related = model_field.related_model._default_manager.all()
+            if hasattr(serializer, 'get_related_queryset'):
+                related = serializer.get_related_queryset(model_field.name, related)
+            if columns is not None:
+                related = related.only(model_field.related_model._meta.pk.name, *columns)
+            prefetch_related.append(Prefetch(model_field.name, queryset=related))
+
+        elif model_field.concrete and model_field.is_relation:
+            only.add(model_field.name)
+            columns = get_related_columns(field)
+            if columns is None:
+                select_related.add(model_field.name)
+            elif columns:
+                select_related.add(model_field.name)
+                only.update(f"{model_field.name}__{column}" for column in columns)
+
+        elif model_field.concrete:
+            only.add(model_field.name)
+
+        else:
+            # Reverse one-to-one, may read anything.
+            select_related.add(model_field.name)
+            defer_columns = False
+
+    # Relations joined by the queryset already mustn't be deferred.
+    if queryset.query.select_related is True:
+        defer_columns = False
+    elif queryset.query.select_related:
+        only.update(queryset.query.select_related)
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
+    if defer_columns:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+class PlannedQuerysetMixin:
+    """
+    Plan viewset's queryset from its serializer's fields, see `plan_queryset`.
+    Only reads are planned, writes get whole objects.
+    """
+    request: Request
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        if self.request.method not in permissions.SAFE_METHODS:
+            return queryset
+
+        # Cursor of the next page is read from the last object.
+        ordering = getattr(self.paginator, 'ordering', ())
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return plan_queryset(queryset, self.get_serializer(), tuple(field.lstrip('-') for field in ordering))
@@ -1,21 +1,61 @@
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import QuerySet
 from rest_framework import serializers
 
 from boards.models import Board
+from core.renditions import get_rendition_urls
 from accounts.models import Profile
 from pins.models import Pin, Comment
+from pins.visibility import get_visible_pins
 
 
-class PinSerializer(serializers.ModelSerializer):
+def get_requested_fields(request) -> set[str] | None:
+    """Field names from `?fields=pk,title`, `None` when all are wanted."""
+    # Plain Django requests of async views have no `query_params`.
+    params = getattr(request, 'query_params', None) or getattr(request, 'GET', {})
+    fields = params.get('fields', '') if request else ''
+    fields = {name.strip() for name in fields.split(',') if name.strip()}
+    return fields or None
+
+
+class SparseFieldsMixin:
+    """
+    Output only fields listed in `?fields=` of the request in serializer's
+    context, unknown names are ignored. Fields left out aren't computed,
+    so e.g. `?fields=pk,title` skips building rendition URLs.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        requested = get_requested_fields(self.context.get('request'))
+        if requested is not None:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+
+class PinSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Used for serializing pin data.
     """
+    renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Pin
-        fields = ['pk', 'user', 'title', 'description', 'file', 'get_type']
+        fields = ['pk', 'user', 'title', 'description', 'file', 'get_type',
+                  'media_kind', 'mime_type', 'file_size', 'width', 'height', 'renditions', 'poster', 'preview',
+                  'duration', 'comment_count', 'is_public']
+        # Columns read by fields which aren't model fields, see `restapi.planning`.
+        field_dependencies = {
+            'get_type': ['media_kind', 'file'],
+            'renditions': ['renditions'],
+        }
+
+    def get_renditions(self, obj: Pin) -> dict:
+        return get_rendition_urls(obj.renditions)
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Used for serializing profile output data.
     """
@@ -36,15 +76,29 @@ class ProfileEditSerializer(serializers.ModelSerializer):
         fields = ['first_name', 'last_name', 'profile_status', 'description', 'sex']
 
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Used for serializing board output data.
     """
     user = serializers.SlugRelatedField(slug_field="username", read_only=True, allow_null=True)
+    cover_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Board
-        fields = '__all__'
+        exclude = ['search_vector']
+        field_dependencies = {
+            'cover_renditions': ['cover_renditions'],
+        }
+
+    def get_cover_renditions(self, obj: Board) -> dict:
+        return get_rendition_urls(obj.cover_renditions)
+
+    def get_related_queryset(self, name: str, queryset: QuerySet) -> QuerySet:
+        """Other users' pins which became private aren't listed, see `restapi.planning`."""
+        if name != 'pins':
+            return queryset
+        request = self.context.get('request')
+        return get_visible_pins(request.user if request else AnonymousUser())
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -54,10 +108,10 @@ class BoardCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Board
-        fields = ['title', 'user', 'description', 'is_private', 'cover', 'id']
+        fields = ['title', 'slug', 'user', 'description', 'is_private', 'cover', 'id']
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Used for serializing comment output data.
     """
@@ -0,0 +1,69 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from accounts.models import Profile
+from boards.models import Board
+from pins.ingest import pins_created
+from pins.models import Pin, Comment
+from pins.visibility import visibility_changed
+from .cache import invalidate
+
+Membership = Board.pins.through
+
+
+@receiver(post_save, sender=Pin)
+@receiver(post_delete, sender=Pin)
+def pin_changed(sender, instance: Pin, **kwargs) -> None:
+    invalidate('pin', [instance.pk])
+
+
+@receiver(visibility_changed, sender=Pin)
+def pin_visibility_changed(sender, pin_pks: list[int], **kwargs) -> None:
+    invalidate('pin', pin_pks)
+    # Serialized boards list only pins the user may see.
+    invalidate('board', Membership.objects.filter(pin_id__in=pin_pks).values_list('board_id', flat=True).distinct())
+
+
+@receiver(pre_delete, sender=Pin)
+def pin_deleted(sender, instance: Pin, **kwargs) -> None:
+    """Serialized boards list their pins, cascade doesn't send `m2m_changed`."""
+    invalidate('board', Membership.objects.filter(pin_id=instance.pk).values_list('board_id', flat=True))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance: Comment, **kwargs) -> None:
+    invalidate('pin-comments', [instance.pin_id])
+    # Serialized pins hold the comment count.
+    invalidate('pin', [instance.pin_id])
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def profile_changed(sender, instance: Profile, **kwargs) -> None:
+    invalidate('profile', [instance.pk])
+
+
+@receiver(post_save, sender=Board)
+@receiver(post_delete, sender=Board)
+def board_changed(sender, instance: Board, **kwargs) -> None:
+    invalidate('board', [instance.pk])
+
+
+@receiver(m2m_changed, sender=Membership)
+def board_membership_changed(sender, instance: Board | Pin, action: str,
+                             reverse: bool, pk_set: set | None, **kwargs) -> None:
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        invalidate('board', [instance.pk])
+    elif action == 'pre_clear':
+        invalidate('board', Membership.objects.filter(pin_id=instance.pk).values_list('board_id', flat=True))
+    else:
+        invalidate('board', pk_set)
+
+
+@receiver(pins_created, sender=Pin)
+def pins_bulk_created(sender, pins: list[Pin], **kwargs) -> None:
+    invalidate('pin', [pin.pk for pin in pins])
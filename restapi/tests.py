@@ -1,3 +1,62 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from boards.models import Board
+from pins.models import Pin
+
+
+class QueryCountTests(APITestCase):
+    """
+    Querysets of list endpoints are planned from serializer fields, see
+    `restapi.planning`. Their query counts mustn't grow with page size.
+    """
+    page_sizes = [5, 20, 50]
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """
+        User owning `2 * size` pins in a public board, and `size` other users
+        with a board holding two of those pins each, for the largest page size.
+        """
+        User = get_user_model()
+        cls.owner = User.objects.create(username='owner', email='owner@example.com')
+        owner_board = Board.objects.create(user=cls.owner, title='Pins')
+
+        for i in range(max(cls.page_sizes)):
+            user = User.objects.create(username=f"user-{i}", email=f"user-{i}@example.com")
+            board = Board.objects.create(user=user, title=f"Board {i}")
+            pins = Pin.objects.bulk_create(
+                Pin(user=cls.owner, board=owner_board, file=f"pins/{i}-{j}.jpg", title=f"Pin {j}",
+                    description='', media_kind='image', mime_type='image/jpeg')
+                for j in range(2)
+            )
+            board.pins.add(*pins)
+
+    def setUp(self) -> None:
+        self.client.force_authenticate(self.owner)
+
+    def assertConstantQueries(self, name: str) -> None:
+        counts = []
+        for size in self.page_sizes:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse(name), {'page_size': size})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), size)
+            counts.append(len(queries))
+
+        self.assertEqual(len(set(counts)), 1, f"Query count of {name} grows with page size: {counts}.")
+
+    def test_all_pins_list(self) -> None:
+        self.assertConstantQueries('api-all-pins-list')
+
+    def test_pins_list(self) -> None:
+        self.assertConstantQueries('api-pins-list')
+
+    def test_boards_list(self) -> None:
+        self.assertConstantQueries('api-boards-list')
+
+    def test_profiles_list(self) -> None:
+        self.assertConstantQueries('profiles-list')
@@ -1,20 +1,32 @@
 from django.urls import path
 from rest_framework import routers
 
-from restapi import views
+from restapi import async_views, views
 
 router = routers.DefaultRouter()
 
 router.register(r'my_pins', views.MyPinViewSet, basename='api-pins')
 router.register(r'pins', views.AllPinsViewset, basename='api-all-pins')
+router.register(r'following_pins', views.FollowingPinsViewset, basename='api-following-pins')
 router.register(r'profile', views.ProfileViewset, basename='profiles')
 router.register(r'boards', views.BoardViewset, basename='api-boards')
 
 urlpatterns = [
-    path("pin_in_board/<int:pin_pk>/<str:board_name>/", views.PinToBoard.as_view(), name="pin_in_board"),
+    path("export/", views.ExportEndpoint.as_view(), name="export_api"),
+    path("import_pins/", views.ImportPins.as_view(), name="import_pins"),
+    path("pin_in_board/bulk/", views.BulkPinToBoard.as_view(), name="bulk_pin_in_board"),
+    path("pin_in_board/<int:pin_pk>/<int:board_pk>/", views.PinToBoard.as_view(), name="pin_in_board"),
+    path("search/", views.SearchEndpoint.as_view(), name="search_api"),
     path("follow/", views.FollowEndpoint.as_view(), name="follow_api"),
     path("comment-by-user/", views.CommentByUser.as_view(), name="comment-by-user-api"),
     path("comment-by-user/<int:pk>/", views.CommentByUser.as_view(), name="comment-by-user-api"),
-    path("comment-pin/<int:pk>/", views.CommentPin.as_view(), name="comment-pin-api")
+    path("comment-pin/<int:pk>/", views.CommentPin.as_view(), name="comment-pin-api"),
+
+    # Async read path, served by ASGI workers, see `restapi.async_views`.
+    path("async/pins/", async_views.PinListView.as_view(), name="async-pins-list"),
+    path("async/pins/<int:pk>/", async_views.PinDetailView.as_view(), name="async-pins-detail"),
+    path("async/profile/", async_views.ProfileListView.as_view(), name="async-profiles-list"),
+    path("async/profile/<int:pk>/", async_views.ProfileDetailView.as_view(), name="async-profiles-detail"),
+    path("async/comment-pin/<int:pk>/", async_views.CommentListView.as_view(), name="async-comment-pin-api"),
 ]
 
@@ -1,16 +1,24 @@
+import base64
+import binascii
+import json
+from typing import Iterator
+
 from django.contrib.auth import get_user_model
-from django.conf import settings
-from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.files.base import ContentFile
+from django.db.models import Q
 from django.db.models.query import QuerySet
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponseBase, StreamingHttpResponse
 
 from rest_framework import viewsets, permissions, views
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
+from .cache import CachedRetrieveMixin, cached_response, get_cached_entry, get_variant, link_page
+from .pagination import CursorPagination, PinCursorPagination, ProfileCursorPagination
 from .permissions import IsOwnerOrReadOnly
+from .planning import PlannedQuerysetMixin, plan_queryset
 from .serializers import (PinSerializer, 
                           ProfileSerializer, 
                           ProfileEditSerializer, 
@@ -19,24 +27,35 @@ from .serializers import (PinSerializer,
                           CommentSerializer,
                           CommentEditSerializer,
                           )
-from accounts.models import Profile, Follow
+from accounts.follows import follow, unfollow, following_among
+from accounts.models import Profile
+from pins.comments import get_comments_page
+from pins.ingest import IngestError, IngestItem, ingest_pins
 from pins.models import Pin, Comment
+from pins.visibility import get_visible_pins
+from boards.membership import ACTIONS, BULK_MEMBERSHIP_LIMIT, bulk_update_membership
 from boards.models import Board
+from core.export import TABLES, export_csv, export_ndjson, export_zip
+from core.feed import InvalidCursor
+from core.timeline import get_following_page
+from search.index import SEARCH_FIELDS, get_searchable_queryset, search
 
-# Set up time-to-live for cache.
-CACHE_TTL = getattr(settings, 'CACHE_TTL', DEFAULT_TIMEOUT)
- 
 
-class MyPinViewSet(viewsets.ModelViewSet):
+class MyPinViewSet(PlannedQuerysetMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
     """
     Retreive, list or delete user's pins.
     """
+    queryset = Pin.objects.all()
     serializer_class = PinSerializer
+    pagination_class = PinCursorPagination
+    cache_namespace = 'pin'
+    # Queryset is limited to request user's pins.
+    cache_scope = 'user'
     permitted_actions = ['list', 'retrieve', 'destroy']
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self) -> QuerySet:
-        return Pin.objects.filter(user=self.request.user)
+        return super().get_queryset().filter(user=self.request.user)
     
     def get_permissions(self) -> list:
         """
@@ -50,48 +69,223 @@ class MyPinViewSet(viewsets.ModelViewSet):
 
         return [permission() for permission in permission_classes]
     
-    @method_decorator(cache_page(CACHE_TTL))
-    def retrieve(self, request, *args, **kwargs) -> Response:
-        return super().retrieve(request, *args, **kwargs)
-    
 
-class AllPinsViewset(viewsets.ReadOnlyModelViewSet):
+class AllPinsViewset(PlannedQuerysetMixin, CachedRetrieveMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Retreive data about all the public pins. Read-only.
+    """
+    # Doesn't depend on request user, so the public cache scope is fine.
+    queryset = Pin.objects.filter(is_public=True).order_by("-date_created")
+    serializer_class = PinSerializer
+    cache_namespace = 'pin'
+    pagination_class = PinCursorPagination
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Filter pins by media kind if `?type=image` or `?type=video` is given.
+        """
+        queryset = super().get_queryset()
+        media_kind = self.request.query_params.get('type')
+
+        if media_kind:
+            queryset = queryset.filter(media_kind=media_kind)
+        return queryset
+
+class FollowingPinsViewset(viewsets.GenericViewSet):
     """
-    Retreive data about all the pins. Read-only.
+    Pins of users followed by request user, newest first. Read-only.
+    Paginated by `?cursor=`, taken from the `next` link.
     """
-    queryset = Pin.objects.all().order_by("-date_created")
     serializer_class = PinSerializer
-    pagination_class = PageNumberPagination
-    max_page_size = 100
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        try:
+            pins, next_cursor = get_following_page(request.user.pk, request.query_params.get('cursor'))
+        except InvalidCursor:
+            return Response({"message": "Invalid cursor."}, 400)
+
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+
+        return Response({
+            "next": next_url,
+            "results": self.get_serializer(pins, many=True).data,
+        })
+
+
+class SearchEndpoint(views.APIView):
+    """
+    Pins or boards (`?kind=boards`) matching `?q=`, the most relevant first.
+    Paginated by `?cursor=`, taken from the `next` link.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_classes = {
+        'pins': PinSerializer,
+        'boards': BoardSerializer,
+    }
+
+    def get(self, request: Request, format=None) -> Response:
+        query = request.query_params.get('q', '').strip()
+        kind = request.query_params.get('kind', 'pins')
+
+        if kind not in SEARCH_FIELDS:
+            return Response({"message": "Kind should be one of: %s." % ', '.join(SEARCH_FIELDS)}, 400)
+        if not query:
+            return Response({"next": None, "results": []})
+
+        serializer = self.serializer_classes[kind](many=True, context={'request': request})
+        queryset = plan_queryset(get_searchable_queryset(kind, request.user), serializer.child)
+
+        try:
+            results, next_cursor = search(kind, query, queryset, request.query_params.get('cursor'))
+        except InvalidCursor:
+            return Response({"message": "Invalid cursor."}, 400)
+
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+
+        return Response({
+            "next": next_url,
+            "results": self.serializer_classes[kind](results, many=True, context={'request': request}).data,
+        })
+
+
+class ImportPins(views.APIView):
+    """
+    Create many pins at once. Accepts either:
+
+    - `multipart/form-data` with files under `files`, a default `board`
+      (id, slug or title) and optional `meta`, a JSON list of
+      `{"title", "description", "board"}` objects in the order of files;
+    - `application/x-ndjson`, one `{"filename", "content" (base64),
+      "title", "description", "board"}` object per line, read as it arrives.
+
+    Streams back one NDJSON result per item as soon as its chunk is saved.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request: Request, format=None) -> HttpResponseBase:
+        if request.content_type.startswith('application/x-ndjson'):
+            items, board = self.read_ndjson(request), None
+        else:
+            try:
+                meta = json.loads(request.data.get('meta') or '[]')
+            except ValueError:
+                return Response({"message": "Meta should be a JSON list."}, 400)
+            if not isinstance(meta, list) or not all(isinstance(entry, dict) for entry in meta):
+                return Response({"message": "Meta should be a JSON list."}, 400)
+
+            files = request.FILES.getlist('files')
+            if not files:
+                return Response({"message": "Provide files to import."}, 400)
+            items, board = self.read_files(files, meta), request.data.get('board')
+
+        lines = (
+            json.dumps(result) + '\n'
+            for results in ingest_pins(request.user, items, board)
+            for result in results
+        )
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+    def read_files(self, files: list, meta: list[dict]) -> Iterator[IngestItem]:
+        for index, file in enumerate(files):
+            entry = meta[index] if index < len(meta) else {}
+            yield IngestItem(
+                file.name, lambda file=file: file,
+                title=entry.get('title', ''),
+                description=entry.get('description', ''),
+                board=entry.get('board'),
+            )
+
+    def read_ndjson(self, request: Request) -> Iterator[IngestItem]:
+        for number, line in enumerate(request.stream, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                filename, content = entry['filename'], entry['content']
+            except (ValueError, KeyError, TypeError):
+                yield IngestItem(f"line {number}", error="Line should be an object with `filename` and `content`.")
+                continue
+
+            yield IngestItem(
+                filename, lambda content=content, filename=filename: self.decode(content, filename),
+                title=entry.get('title', ''),
+                description=entry.get('description', ''),
+                board=entry.get('board'),
+            )
+
+    def decode(self, content: str, filename: str) -> ContentFile:
+        try:
+            return ContentFile(base64.b64decode(content, validate=True), name=filename)
+        except (binascii.Error, TypeError):
+            raise IngestError("Content should be base64-encoded.")
+
+
+class ExportEndpoint(views.APIView):
+    """
+    Download request user's pins, boards, comments and follows.
+    `?output=ndjson` (default) gives every table in one file,
+    `?output=csv&table=<name>` one table, `?output=zip` NDJSON
+    with media files. Response is streamed as it's read.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request: Request, format=None) -> HttpResponseBase:
+        output = request.query_params.get('output', 'ndjson')
+        username = request.user.username
+
+        if output == 'ndjson':
+            response = StreamingHttpResponse(export_ndjson(request.user), content_type='application/x-ndjson')
+            filename = f"{username}.ndjson"
+        elif output == 'csv':
+            table = request.query_params.get('table', 'pins')
+            if table not in TABLES:
+                return Response({"message": "Table should be one of: %s." % ', '.join(TABLES)}, 400)
+            response = StreamingHttpResponse(export_csv(request.user, table), content_type='text/csv')
+            filename = f"{username}-{table}.csv"
+        elif output == 'zip':
+            response = StreamingHttpResponse(export_zip(request.user), content_type='application/zip')
+            filename = f"{username}.zip"
+        else:
+            return Response({"message": "Output should be one of: ndjson, csv, zip."}, 400)
+
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
-    @method_decorator(cache_page(CACHE_TTL))
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
 
 class PinToBoard(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self) -> QuerySet:
-        queryset = Pin.objects.all()
-        return queryset
+        """Pins user may save, other users' private pins are hidden."""
+        return get_visible_pins(self.request.user)
+
+    def get_objects(self, pin_pk: int, board_pk: int, queryset: QuerySet | None = None) -> tuple[Pin, Board]:
+        """Pin and board of the route, 404 if either doesn't exist."""
+        queryset = self.get_queryset() if queryset is None else queryset
+        return get_object_or_404(queryset, pk=pin_pk), get_object_or_404(Board, pk=board_pk)
         
-    def get(self, request: Request, pin_pk: int, board_name: str, format=None) -> Response:
+    def get(self, request: Request, pin_pk: int, board_pk: int, format=None) -> Response:
         """
         Add this pin into chosen board.
         If pin is already in the board, return "Already in board" message.
         """
-        pin = Pin.objects.get(pk=pin_pk)
-        board = Board.objects.get(title=board_name)
+        pin, board = self.get_objects(pin_pk, board_pk)
 
         # Check if user owns given board.
-        if board.user != request.user:
+        if board.user_id != request.user.pk:
             data = {"message": "You are not allowed to save into this board."}
             return Response(data=data,status=403,)
 
-        if pin not in board.pins.all():
+        if not board.pins.filter(pk=pin.pk).exists():
             board.pins.add(pin)
             response = {
                 "pin": PinSerializer(pin).data,
+                "board": board.pk,
                 "board_title": board.title,
                 "message": "Pin successfully added to the board.",
             }
@@ -101,24 +295,25 @@ class PinToBoard(views.APIView):
             }
         return Response(response)
     
-    def delete(self, request: Request, pin_pk: int, board_name: str, format=None) -> Response:
+    def delete(self, request: Request, pin_pk: int, board_pk: int, format=None) -> Response:
         """
         Remove this pin from given board.
         If pin is not in the board, return 
         "Pin is not found in given board" message.
         """
-        pin = Pin.objects.get(pk=pin_pk)
-        board = Board.objects.get(title=board_name)
+        # Pins which became private may still be removed from user's boards.
+        pin, board = self.get_objects(pin_pk, board_pk, Pin.objects.all())
 
         # Check if user owns given board.
-        if board.user != request.user:
+        if board.user_id != request.user.pk:
             data = {"message": "You are not allowed to change this board."}
             return Response(data=data,status=403,)
 
-        if pin in board.pins.all():
+        if board.pins.filter(pk=pin.pk).exists():
             board.pins.remove(pin)
             response = {
                 "pin": PinSerializer(pin).data,
+                "board": board.pk,
                 "board_title": board.title,
                 "message": "Pin successfully removed from the board.",
             }
@@ -129,13 +324,61 @@ class PinToBoard(views.APIView):
         return Response(response)
     
 
-class ProfileViewset(viewsets.ModelViewSet):
+class BulkPinToBoard(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request: Request, format=None) -> Response:
+        """
+        Add or remove many pins at once, or move them between boards.
+        Expects `{"action": "add" | "remove" | "move", "board": <id>,
+        "from_board": <id, for move only>, "pins": [<id>, ...]}`.
+        Returns a status for every pin.
+        """
+        action = request.data.get('action')
+        pin_pks = request.data.get('pins')
+
+        if action not in ACTIONS:
+            return Response({"message": "Action should be one of: %s." % ', '.join(ACTIONS)}, 400)
+        if (not isinstance(pin_pks, list) or not pin_pks
+                or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in pin_pks)):
+            return Response({"message": "Pins should be a non-empty list of ids."}, 400)
+        if len(pin_pks) > BULK_MEMBERSHIP_LIMIT:
+            return Response({"message": "Up to %s pins can be changed at once." % BULK_MEMBERSHIP_LIMIT}, 400)
+        try:
+            board_pk = int(request.data['board'])
+            source_pk = int(request.data['from_board']) if action == 'move' else None
+        except (KeyError, TypeError, ValueError):
+            return Response({"message": "Provide board ids, and `from_board` to move pins."}, 400)
+        if board_pk == source_pk:
+            return Response({"message": "Pins should be moved into another board."}, 400)
+
+        boards = Board.objects.in_bulk({board_pk, source_pk} - {None})
+        board, source = boards.get(board_pk), boards.get(source_pk)
+        if board is None or (action == 'move' and source is None):
+            return Response({"message": "Board was not found."}, 404)
+
+        # Check if user owns given boards.
+        if any(obj.user_id != request.user.pk for obj in boards.values()):
+            return Response({"message": "You are not allowed to change this board."}, 403)
+
+        # Only pins user may see are added, others are reported as not found.
+        pins = Pin.objects.all() if action == 'remove' else get_visible_pins(request.user)
+        results = bulk_update_membership(action, pin_pks, board, source, pins)
+        return Response({
+            "action": action,
+            "board": board.pk,
+            "from_board": source.pk if source else None,
+            "results": results,
+        })
+
+
+class ProfileViewset(PlannedQuerysetMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
     queryset = Profile.objects.all().order_by('pk')
     permitted_actions = ['list', 'retrieve', 'partial_update']
-    pagination_class = PageNumberPagination
+    pagination_class = ProfileCursorPagination
     serializer_class = ProfileSerializer
     edit_serializer = ProfileEditSerializer
-    max_page_size = 100
+    cache_namespace = 'profile'
 
     def get_permissions(self) -> list:
         """
@@ -163,14 +406,22 @@ class ProfileViewset(viewsets.ModelViewSet):
         data = self.serializer_class(instance).data
         data.setdefault("message", "Profile successfully updated!")
         return Response(data)
-    
-    @method_decorator(cache_page(CACHE_TTL))
-    def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
 
 
 class FollowEndpoint(views.APIView):
 
+    def get(self, request: Request, format=None) -> Response:
+        """
+        Check which of given users (`?users=name1,name2`) request user follows.
+        """
+        usernames = [name for name in request.query_params.get('users', '').split(',') if name][:100]
+        users = dict(
+            get_user_model().objects.filter(username__in=usernames).values_list('username', 'pk')
+        )
+        followed_ids = following_among(request.user, users.values())
+
+        return Response({username: pk in followed_ids for username, pk in users.items()})
+
     def post(self, request: Request, format=None) -> Response:
         """
         Follow given user.
@@ -186,10 +437,8 @@ class FollowEndpoint(views.APIView):
             "user": followed.username,
             "new_follower": follower.username,
         }
-        follow_obj = Follow.objects.filter(follower=follower, following=followed)
 
-        if not follow_obj.exists():
-            Follow.objects.create(follower=follower, following=followed)
+        if follow(follower, followed):
             response.setdefault("message", "Now you are following %s." % followed.username)
             status_code = 201   # Created
         else:
@@ -213,10 +462,8 @@ class FollowEndpoint(views.APIView):
             "user": followed.username,
             "new_follower": follower.username,
         }
-        follow_obj = Follow.objects.filter(follower=follower, following=followed)
 
-        if follow_obj.exists():
-            follow_obj.delete()
+        if unfollow(follower, followed):
             response.setdefault("message", "Now you are not following %s." % followed.username)
             status_code = 204   # No content
         else:
@@ -226,12 +473,20 @@ class FollowEndpoint(views.APIView):
         return Response(response, status_code)
 
 
-class BoardViewset(viewsets.ModelViewSet):
+class BoardViewset(PlannedQuerysetMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
     queryset = Board.objects.all().order_by('-id')
     permission_classes = [IsOwnerOrReadOnly]
-    pagination_class = PageNumberPagination
+    pagination_class = CursorPagination
     serializer_class = BoardSerializer
-    max_page_size = 100
+    cache_namespace = 'board'
+    # Private boards are visible to their owners only.
+    cache_scope = 'user'
+
+    def get_queryset(self) -> QuerySet:
+        private = Q(is_private=True)
+        if self.request.user.is_authenticated:
+            private &= ~Q(user=self.request.user)
+        return super().get_queryset().exclude(private)
 
     def create(self, request: Request, format = None, *args, **kwargs) -> Response:
         """
@@ -359,17 +614,43 @@ class CommentPin(views.APIView):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated,]
 
-    def get_queryset(self, pk: int) -> QuerySet:
-        return Pin.objects.get(pk=pk).comments.all()
-    
-    @method_decorator(cache_page(CACHE_TTL))
-    def get(self, request: Request, pk: int, format=None) -> Response:
+    def get(self, request: Request, pk: int, format=None) -> HttpResponseBase:
         """
-        List all the comments under given pin.
+        List comments under given pin, oldest first, with their total `count`.
+        Paginated by `?cursor=`, taken from the `next` link.
         """
-        queryset = self.get_queryset(pk)
-        serializer = self.serializer_class(queryset, many=True)
-        return Response(data=serializer.data)
+        # Checked before the cache, entries are shared by all users who may see the pin.
+        if not get_visible_pins(request.user).filter(pk=pk).exists():
+            raise Http404("Pin with id=%s was not found." % pk)
+
+        cursor = request.query_params.get('cursor')
+        try:
+            entry = get_cached_entry(
+                'pin-comments', pk,
+                f"{get_variant(request, self.serializer_class.__name__, 'public')}:cursor-{cursor or ''}",
+                lambda: self.get_page(request, pk, cursor),
+            )
+        except InvalidCursor:
+            return Response({"message": "Invalid cursor."}, 400)
+
+        next_cursor = entry['data']['next_cursor']
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+        return cached_response(request, link_page(entry, next_url))
+
+    def get_page(self, request: Request, pk: int, cursor: str | None) -> dict:
+        """Page to cache, `next` link is built from `next_cursor` per request."""
+        pin = Pin.objects.filter(pk=pk).values('comment_count').first()
+        if pin is None:
+            raise Http404("Pin with id=%s was not found." % pk)
+
+        comments, next_cursor = get_comments_page(pk, cursor)
+        return {
+            "count": pin['comment_count'],
+            "next_cursor": next_cursor,
+            "results": self.serializer_class(comments, many=True, context={'request': request}).data,
+        }
     
     def post(self, request: Request, pk: int, format=None) -> Response:
         """
@@ -378,10 +659,11 @@ class CommentPin(views.APIView):
 
         # Check if there is Pin with provided pk.
         try:
+            pins = get_visible_pins(request.user)
             if not 'pin' in request.data:
-                pin_pk = Pin.objects.get(pk=pk).pk
+                pin_pk = pins.get(pk=pk).pk
             else:
-                pin_pk = Pin.objects.get(pk=request.data.get('pin')).pk
+                pin_pk = pins.get(pk=request.data.get('pin')).pk
         except Pin.DoesNotExist:
             data = {"message": "Pin with id=%s was not found." % pk}
             return Response(data=data, status=404)
@@ -0,0 +1,193 @@
+import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField, Model, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Cast
+
+from boards.models import Board
+from core.feed import InvalidCursor
+from pins.models import Pin
+from .models import SearchTerm
+
+
+SEARCH_PAGE_SIZE = getattr(settings, 'SEARCH_PAGE_SIZE', 30)
+# Text search configuration of `tsvector` columns.
+SEARCH_CONFIG = getattr(settings, 'SEARCH_CONFIG', 'english')
+
+# Indexed fields of each searchable model with their weights.
+# Author's username is indexed too, with the lowest weight.
+SEARCH_FIELDS = {
+    'pins': (Pin, [('title', 'A'), ('description', 'B')]),
+    'boards': (Board, [('title', 'A'), ('description', 'B')]),
+}
+USERNAME_WEIGHT = 'C'
+
+# Same values as `ts_rank` uses by default, so both backends rank alike.
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+TERM_RE = re.compile(r'\w+')
+
+
+def is_full_text_supported() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def get_kind(model: type[Model]) -> str | None:
+    for kind, (kind_model, fields) in SEARCH_FIELDS.items():
+        if kind_model is model:
+            return kind
+
+
+def tokenize(text: str) -> list[str]:
+    return [term[:100] for term in TERM_RE.findall(text.lower())]
+
+
+def encode_cursor(rank: float, pk: int) -> str:
+    return urlsafe_b64encode(f"{rank!r}|{pk}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        rank, pk = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return float(rank), int(pk)
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def get_search_vector(kind: str) -> SearchVector:
+    """`tsvector` expression of a row, usable in `update()`."""
+    model, fields = SEARCH_FIELDS[kind]
+    username = get_user_model().objects.filter(pk=OuterRef('user_id')).values('username')
+
+    vector = SearchVector(Subquery(username), weight=USERNAME_WEIGHT, config=SEARCH_CONFIG)
+    for field, weight in fields:
+        vector = SearchVector(field, weight=weight, config=SEARCH_CONFIG) + vector
+    return vector
+
+
+def get_postings(kind: str, instance: Model) -> list[SearchTerm]:
+    """Weighted terms of one object, for the fallback index."""
+    model, fields = SEARCH_FIELDS[kind]
+    weights = Counter()
+
+    for field, weight in fields:
+        for term in tokenize(getattr(instance, field)):
+            weights[term] += WEIGHTS[weight]
+    for term in tokenize(instance.user.username):
+        weights[term] += WEIGHTS[USERNAME_WEIGHT]
+
+    return [
+        SearchTerm(kind=kind, term=term, object_id=instance.pk, weight=weight)
+        for term, weight in weights.items()
+    ]
+
+
+def update_document(instance: Model) -> None:
+    """Reindex a saved pin or board."""
+    update_documents(type(instance), [instance])
+
+
+def update_documents(model: type[Model], instances: list[Model]) -> None:
+    """Reindex many saved pins or boards with one write per index table."""
+    kind = get_kind(model)
+    pks = [instance.pk for instance in instances]
+
+    if is_full_text_supported():
+        model.objects.filter(pk__in=pks).update(search_vector=get_search_vector(kind))
+    else:
+        SearchTerm.objects.filter(kind=kind, object_id__in=pks).delete()
+        SearchTerm.objects.bulk_create(
+            posting for instance in instances for posting in get_postings(kind, instance)
+        )
+
+
+def remove_document(instance: Model) -> None:
+    # `tsvector` is removed along with the row.
+    if not is_full_text_supported():
+        SearchTerm.objects.filter(kind=get_kind(type(instance)), object_id=instance.pk).delete()
+
+
+def get_searchable_queryset(kind: str, user) -> QuerySet:
+    """Objects `user` may find: everything except other users' private boards and pins."""
+    model = SEARCH_FIELDS[kind][0]
+    queryset = model.objects.select_related('user')
+
+    private = Q(is_private=True) if model is Board else Q(is_public=False)
+    if user.is_authenticated:
+        private &= ~Q(user=user)
+    return queryset.exclude(private)
+
+
+def search(kind: str, query: str, queryset: QuerySet | None = None, cursor: str | None = None,
+           page_size: int = SEARCH_PAGE_SIZE) -> tuple[list[Model], str | None]:
+    """
+    Return one page of `kind` objects matching `query`, the most relevant
+    first, and a cursor for the next page. Results are limited to `queryset`
+    if given. Pages are located by keyset on `(rank, id)`.
+    """
+    if queryset is None:
+        queryset = SEARCH_FIELDS[kind][0].objects.all()
+    after = decode_cursor(cursor) if cursor else None
+
+    if is_full_text_supported():
+        ranked = search_vectors(queryset, query, after, page_size + 1)
+    else:
+        ranked = search_postings(kind, queryset, query, after, page_size + 1)
+
+    next_cursor = None
+    if len(ranked) > page_size:
+        ranked = ranked[:page_size]
+        next_cursor = encode_cursor(*ranked[-1])
+
+    objects = queryset.in_bulk([pk for rank, pk in ranked])
+    return [objects[pk] for rank, pk in ranked if pk in objects], next_cursor
+
+
+def search_vectors(queryset: QuerySet, query: str, after: tuple[float, int] | None,
+                   limit: int) -> list[tuple[float, int]]:
+    """Match against GIN-indexed `tsvector` columns and rank with `ts_rank`."""
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    # `ts_rank` returns real, compare as double so cursors round-trip exactly.
+    queryset = (
+        queryset
+        .filter(search_vector=search_query)
+        .annotate(rank=Cast(SearchRank(F('search_vector'), search_query), FloatField()))
+        .order_by('-rank', '-pk')
+    )
+
+    if after:
+        rank, pk = after
+        queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, pk__lt=pk))
+
+    return list(queryset.values_list('rank', 'pk')[:limit])
+
+
+def search_postings(kind: str, queryset: QuerySet, query: str, after: tuple[float, int] | None,
+                    limit: int) -> list[tuple[float, int]]:
+    """
+    Match against the `SearchTerm` inverted index. Objects must contain every
+    term of the query, rank is a sum of term weights.
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        return []
+
+    matched = defaultdict(set)
+    ranks = Counter()
+    postings = SearchTerm.objects.filter(kind=kind, term__in=terms).values_list('object_id', 'term', 'weight')
+    for pk, term, weight in postings:
+        matched[pk].add(term)
+        ranks[pk] += weight
+
+    pks = [pk for pk, found in matched.items() if found == terms]
+    visible = set(queryset.filter(pk__in=pks).values_list('pk', flat=True))
+
+    ranked = sorted(((ranks[pk], pk) for pk in visible), reverse=True)
+    if after:
+        ranked = [position for position in ranked if position < after]
+    return ranked[:limit]
@@ -0,0 +1,54 @@
+from time import perf_counter
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db.models import Q
+
+from search.index import SEARCH_FIELDS, SEARCH_PAGE_SIZE, is_full_text_supported, search
+
+
+class Command(BaseCommand):
+    help = "Compare full-text search against naive `icontains` scanning on the current database."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('queries', nargs='+')
+        parser.add_argument('--kind', choices=list(SEARCH_FIELDS), default='pins')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options) -> None:
+        kind, repeat = options['kind'], options['repeat']
+        backend = 'tsvector' if is_full_text_supported() else 'inverted index'
+        self.stdout.write(f"{SEARCH_FIELDS[kind][0].objects.count()} {kind}, {repeat} runs per query.")
+
+        for query in options['queries']:
+            indexed, indexed_ms = self.measure(lambda: search(kind, query)[0], repeat)
+            scanned, scanned_ms = self.measure(lambda: self.icontains(kind, query), repeat)
+
+            self.stdout.write(
+                f"{query!r}: {backend} {indexed_ms:.2f} ms ({len(indexed)} results), "
+                f"icontains {scanned_ms:.2f} ms ({len(scanned)} results)"
+            )
+
+    def icontains(self, kind: str, query: str) -> list:
+        """First page of objects containing every word, newest first, without ranking."""
+        model, fields = SEARCH_FIELDS[kind]
+        queryset = model.objects.all()
+
+        for word in query.split():
+            match = Q(user__username__icontains=word)
+            for field, weight in fields:
+                match |= Q(**{f'{field}__icontains': word})
+            queryset = queryset.filter(match)
+
+        return list(queryset.order_by('-pk')[:SEARCH_PAGE_SIZE])
+
+    def measure(self, func: Callable[[], list], repeat: int) -> tuple[list, float]:
+        """Run `func` `repeat` times, return its result and median time in milliseconds."""
+        timings = []
+        for _ in range(repeat):
+            start = perf_counter()
+            result = func()
+            timings.append((perf_counter() - start) * 1000)
+
+        timings.sort()
+        return result, timings[len(timings) // 2]
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+
+from search.index import SEARCH_FIELDS, get_postings, get_search_vector, is_full_text_supported
+from search.models import SearchTerm
+
+
+class Command(BaseCommand):
+    help = "Rebuild full-text search index of existing pins and boards."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--kind', choices=list(SEARCH_FIELDS), help="Rebuild only pins or boards.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options) -> None:
+        kinds = [options['kind']] if options['kind'] else list(SEARCH_FIELDS)
+
+        for kind in kinds:
+            if is_full_text_supported():
+                count = self.rebuild_vectors(kind, options['batch_size'])
+            else:
+                count = self.rebuild_postings(kind, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"Indexed {count} {kind}."))
+
+    def rebuild_vectors(self, kind: str, batch_size: int) -> int:
+        """Update `tsvector` columns in primary key ranges, one statement per batch."""
+        model = SEARCH_FIELDS[kind][0]
+        pks = list(model.objects.order_by('pk').values_list('pk', flat=True))
+
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            model.objects.filter(pk__gte=batch[0], pk__lte=batch[-1]).update(
+                search_vector=get_search_vector(kind),
+            )
+        return len(pks)
+
+    def rebuild_postings(self, kind: str, batch_size: int) -> int:
+        model = SEARCH_FIELDS[kind][0]
+        count = 0
+
+        with transaction.atomic():
+            SearchTerm.objects.filter(kind=kind).delete()
+
+            postings = []
+            for instance in model.objects.select_related('user').order_by('pk').iterator(chunk_size=batch_size):
+                postings.extend(get_postings(kind, instance))
+                count += 1
+
+                if len(postings) >= batch_size:
+                    SearchTerm.objects.bulk_create(postings)
+                    postings = []
+            SearchTerm.objects.bulk_create(postings)
+
+        return count
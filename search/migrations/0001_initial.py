@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-17 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=10)),
+                ('term', models.CharField(max_length=100)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('weight', models.FloatField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='searchterm',
+            index=models.Index(fields=['kind', 'term'], name='search_term_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchterm',
+            index=models.Index(fields=['kind', 'object_id'], name='search_object_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class SearchTerm(models.Model):
+    """
+    Inverted index entry, used instead of `tsvector` columns on databases
+    without full-text search (SQLite in tests). See `search.index`.
+    """
+    kind = models.CharField(max_length=10)
+    term = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    weight = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'term'], name='search_term_idx'),
+            models.Index(fields=['kind', 'object_id'], name='search_object_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.term} -> {self.kind} #{self.object_id}'
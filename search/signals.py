@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from boards.models import Board
+from pins.ingest import pins_created
+from pins.models import Pin
+from .index import remove_document, update_document, update_documents
+
+
+@receiver(post_save, sender=Pin)
+@receiver(post_save, sender=Board)
+def document_saved(sender, instance: Pin | Board, **kwargs) -> None:
+    update_document(instance)
+
+
+@receiver(post_delete, sender=Pin)
+@receiver(post_delete, sender=Board)
+def document_deleted(sender, instance: Pin | Board, **kwargs) -> None:
+    remove_document(instance)
+
+
+@receiver(pins_created, sender=Pin)
+def documents_created(sender, pins: list[Pin], **kwargs) -> None:
+    update_documents(Pin, pins)
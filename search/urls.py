@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path("", views.Search.as_view(), name="search"),
+    path("page/", views.SearchPage.as_view(), name="search_page"),
+]
@@ -0,0 +1,71 @@
+from typing import Any
+from urllib.parse import urlencode
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
+from django.template.loader import render_to_string
+from django.urls import reverse_lazy, reverse
+from django.views.generic import TemplateView, View
+
+from core.feed import InvalidCursor
+from .index import SEARCH_FIELDS, get_searchable_queryset, search
+
+
+class Search(LoginRequiredMixin, TemplateView):
+    """
+    Search page, pins or boards (`?kind=boards`) matching `?q=`.
+    """
+    template_name = "search.html"
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        results, next_page_url = get_results(self.request)
+
+        context.setdefault('q', self.request.GET.get('q', ''))
+        context.setdefault('kind', get_kind(self.request))
+        context.setdefault('results', results)
+        context.setdefault('next_page_url', next_page_url)
+        return context
+
+
+class SearchPage(LoginRequiredMixin, View):
+    """
+    Next page of search results, as an HTML fragment to be appended to the page.
+    """
+    redirect_field_name = "next"
+    login_url = reverse_lazy("login")
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        try:
+            results, next_page_url = get_results(request, request.GET.get('cursor'))
+        except InvalidCursor:
+            return HttpResponseBadRequest("Invalid cursor.")
+
+        response = HttpResponse(render_to_string("search_results.html", {
+            'kind': get_kind(request),
+            'results': results,
+        }, request))
+        if next_page_url:
+            response['X-Next-Page'] = next_page_url
+        return response
+
+
+def get_kind(request: HttpRequest) -> str:
+    kind = request.GET.get('kind')
+    return kind if kind in SEARCH_FIELDS else 'pins'
+
+
+def get_results(request: HttpRequest, cursor: str | None = None) -> tuple[list, str | None]:
+    query = request.GET.get('q', '').strip()
+    kind = get_kind(request)
+    if not query:
+        return [], None
+
+    results, next_cursor = search(kind, query, get_searchable_queryset(kind, request.user), cursor)
+
+    next_page_url = None
+    if next_cursor:
+        next_page_url = f"{reverse('search_page')}?{urlencode({'q': query, 'kind': kind, 'cursor': next_cursor})}"
+    return results, next_page_url
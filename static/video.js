@@ -0,0 +1,29 @@
+// Video pins show their poster, the clip is loaded and played only while
+// it's on screen and paused when scrolled away, see `video` template tag.
+const videoObserver = new IntersectionObserver((entries) => {
+  for (const entry of entries) {
+    const video = entry.target;
+    if (entry.isIntersecting) {
+      if (!video.getAttribute("src")) video.src = video.dataset.src;
+      video.play().catch(() => {});
+    } else if (video.getAttribute("src")) {
+      video.pause();
+    }
+  }
+}, {rootMargin: "200px"});
+
+function observeVideos(root) {
+  if (root.matches("video[data-src]")) videoObserver.observe(root);
+  root.querySelectorAll("video[data-src]").forEach((video) => videoObserver.observe(video));
+}
+
+observeVideos(document.body);
+
+// Feed and related pins pages are appended as they're loaded.
+new MutationObserver((mutations) => {
+  for (const mutation of mutations) {
+    mutation.addedNodes.forEach((node) => {
+      if (node.nodeType === Node.ELEMENT_NODE) observeVideos(node);
+    });
+  }
+}).observe(document.body, {childList: true, subtree: true});